@@ -0,0 +1,95 @@
+# ===== Import =====
+import os, csv # For writing the timetable files
+import argparse # For command line options
+import random, datetime # For generating the schedules
+
+
+"""
+Writes synthetic timetable CSV files in the layout read by DataHandler.setSchedules.
+    python benchmarks/generateTimetables.py --rows 100000 --files 50 --output timetables
+"""
+
+
+
+# ===== Synthetic Timetable =====
+SESSIONS = {"LEC": "Lecture", "TUT": "Tutorial", "LAB": "Laboratory", "SEM": "Seminar", "WKS": "Workshop"}
+COURSES = ["BSC", "BENG", "BA", "MSC", "MENG", "MBA", "PGDIP", "FND"]
+SUBJECTS = ["Computing", "Data", "Networks", "Software", "Security", "Business", "Finance", "Marketing", "Design",
+            "Mathematics", "Statistics", "Physics", "Electronics", "Law", "Psychology", "Media"]
+LEVELS = ["Introduction to", "Principles of", "Applied", "Advanced", "Topics in", "Project in"]
+FIRST_NAMES = ["Jane", "John", "Amy", "Raj", "Li", "Omar", "Sara", "Tom", "Wei", "Anna", "Ken", "Maria", "Sam", "Noor", "Ivan", "Chloe"]
+LAST_NAMES = ["Smith", "Tan", "Lee", "Khan", "Lim", "Brown", "Garcia", "Ng", "Wong", "Patel", "Jones", "Chen"]
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+class TimetableGenerator:
+    def __init__(self, seed=0, moduleCnt=400, roomCnt=300):
+        # Modules keep the same name, lecturers and cohorts in every file, as in a real timetable export
+        self.__randomizer = random.Random(seed)
+        lecturers = [f"Dr {first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+        self.__rooms = [] # Location, zone and capacity of each room
+        for index in range(roomCnt):
+            building, floor = chr(ord("A") + index % 8), index // 8 % 6
+            capacity = self.__randomizer.choice([20, 30, 40, 60, 90, 120, 250])
+            self.__rooms.append((f"{building}{floor}.{index // 48 + 1:02d}", f"Zone {building}", capacity))
+
+        self.__modules = [] # Code, name, lecturers and cohorts of each module
+        for index in range(moduleCnt):
+            subject = SUBJECTS[index % len(SUBJECTS)]
+            moduleCode = f"{subject[:3].upper()}{100 * (index % 4 + 1) + index // len(SUBJECTS):03d}"
+            moduleName = f"{LEVELS[index % len(LEVELS)]} {subject} {index // len(SUBJECTS) + 1}"
+            cohorts = [(self.__randomizer.choice(COURSES), f"C{self.__randomizer.randrange(1, 40):02d}",
+                        self.__randomizer.choice(["FT", "FT", "FT", "PT"])) for _ in range(self.__randomizer.randrange(1, 5))]
+            self.__modules.append((moduleCode, moduleName, self.__randomizer.sample(lecturers, 2), cohorts))
+
+    def getRow(self, index:int, termStart:datetime.date) -> list:
+        # One schedule in the raw column order: index, name, description, date, day, start, end,
+        # duration, location, size, lecturer and zone
+        randomizer = self.__randomizer
+        moduleCode, moduleName, lecturers, cohorts = randomizer.choice(self.__modules)
+        course, cohort, fullPart = randomizer.choice(cohorts)
+        session = randomizer.choice(list(SESSIONS))
+        location, zone, capacity = randomizer.choice(self.__rooms)
+        activityDate = termStart + datetime.timedelta(days=randomizer.randrange(7 * 12))
+        if activityDate.isoweekday() == 7: # Nothing runs on a Sunday
+            activityDate -= datetime.timedelta(days=1)
+        startMinute = randomizer.randrange(8 * 2, 19 * 2) * 30
+        duration = randomizer.choice([60, 60, 90, 120, 120, 180])
+        endMinute = min(startMinute + duration, 21 * 60)
+
+        return [
+            index, f"{course}_{cohort}_{fullPart}_{moduleCode}_{session}",
+            f"MOD {moduleName} ({SESSIONS[session]})", activityDate.strftime("%d/%m/%Y"), DAYS[activityDate.weekday()],
+            f"{startMinute // 60:02d}:{startMinute % 60:02d}:00", f"{endMinute // 60:02d}:{endMinute % 60:02d}:00",
+            f"{(endMinute - startMinute) // 60:02d}:{(endMinute - startMinute) % 60:02d}", location,
+            randomizer.randrange(max(1, capacity // 4), capacity + 1), randomizer.choice(lecturers), zone
+        ]
+
+    def writeFile(self, filePath:str, rowCnt:int, termStart:datetime.date):
+        with open(filePath, "w", newline="") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["", "Name", "Description", "Date", "Day", "Start", "End", "Duration", "Location", "Size", "Lecturer", "Zone"])
+            writer.writerows(self.getRow(index + 1, termStart) for index in range(rowCnt))
+
+def writeTimetables(folderPath:str, rowCnt:int, fileCnt:int, seed=0) -> list:
+    # Splits the rows over the files as evenly as possible. Each file is the export of one term
+    os.makedirs(folderPath, exist_ok=True)
+    generator = TimetableGenerator(seed)
+    filesList = []
+    for fileIndex in range(fileCnt):
+        filePath = os.path.join(folderPath, f"timetable{fileIndex+1:04d}.csv")
+        termStart = datetime.date(2023 + fileIndex // 3 % 4, [1, 5, 9][fileIndex % 3], 2)
+        generator.writeFile(filePath, rowCnt // fileCnt + (fileIndex < rowCnt % fileCnt), termStart)
+        filesList.append(filePath)
+
+    return filesList
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic timetable CSV files")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="timetables")
+    options = parser.parse_args()
+
+    filesList = writeTimetables(options.output, options.rows, options.files, options.seed)
+    print(f"Wrote {options.rows} schedules to {len(filesList)} files in {options.output}")
@@ -0,0 +1,159 @@
+# ===== Import =====
+import os, sys, json # For the results
+import argparse # For command line options
+import tempfile, shutil # For the generated timetables and the cache
+import time, tracemalloc, gc # For measuring the stages
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from timetableCore import DataHandler, DisplayHandler
+from generateTimetables import writeTimetables
+
+
+"""
+Time and peak memory of each stage of loading the schedules, for growing numbers of schedules.
+    python benchmarks/ingestBenchmark.py --sizes 10000,100000,1000000 --files 50 --json results.json
+    python benchmarks/ingestBenchmark.py --sizes 10000,100000 --compare results.json
+The run fails when a stage is slower than the compared results by more than the tolerance.
+"""
+
+
+
+# ===== Stages =====
+def parseStage(state:dict):
+    # Every file is parsed, without the disk cache
+    dataHandler = DataHandler(state["cacheDirectory"])
+    dataHandler.setFilesPathList(state["filesList"])
+    dataHandler.setSchedules(isCached=False)
+    state["dataHandler"] = dataHandler
+
+def parallelParseStage(state:dict):
+    dataHandler = DataHandler(state["cacheDirectory"])
+    dataHandler.setFilesPathList(state["filesList"])
+    dataHandler.setSchedules(isParallel=True, isCached=False)
+
+def lazyStage(state:dict):
+    # Files are only mapped, no column is decoded
+    dataHandler = DataHandler(state["cacheDirectory"])
+    dataHandler.setFilesPathList(state["filesList"])
+    dataHandler.setSchedules(isLazy=True)
+
+def cacheWriteStage(state:dict):
+    # First launch: every file is parsed and written to an empty disk cache
+    shutil.rmtree(state["cacheDirectory"], ignore_errors=True)
+    dataHandler = DataHandler(state["cacheDirectory"])
+    dataHandler.setFilesPathList(state["filesList"])
+    dataHandler.setSchedules()
+
+def cacheReadStage(state:dict):
+    # Relaunch: every file comes from the disk cache
+    dataHandler = DataHandler(state["cacheDirectory"])
+    dataHandler.setFilesPathList(state["filesList"])
+    dataHandler.setSchedules()
+    state["cachedHandler"] = dataHandler
+
+def resetStage(state:dict):
+    # Reset in the same session: every file is already in memory
+    state["cachedHandler"].setSchedules()
+
+def indexStage(state:dict):
+    dataHandler = state["dataHandler"]
+    state["displayHandler"] = DisplayHandler(dataHandler.getSchedules())
+
+def sortStage(state:dict):
+    state["displayHandler"].sort("module")
+
+STAGES = [("parse", parseStage), ("parse parallel", parallelParseStage), ("lazy map", lazyStage), ("cache write", cacheWriteStage),
+          ("cache read", cacheReadStage), ("reset", resetStage), ("index build", indexStage), ("sort", sortStage)]
+
+
+
+# ===== Measurement =====
+def timeStage(stage, state:dict) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    stage(state)
+    return time.perf_counter() - start
+
+def peakMemory(stage, state:dict) -> int:
+    # Measured on its own run, since tracing slows the stage down
+    gc.collect()
+    tracemalloc.start()
+    stage(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak
+
+def runBenchmark(filesList:list, cacheDirectory:str, isMemory=True, repeatCnt=1) -> list:
+    state = {"filesList": filesList, "cacheDirectory": cacheDirectory}
+    rowCnt = None
+    results = []
+    for stageName, stage in STAGES:
+        seconds = min(timeStage(stage, state) for _ in range(repeatCnt)) # Fastest run is the least disturbed
+        if rowCnt is None:
+            rowCnt = len(state["dataHandler"].getSchedules())
+        peak = peakMemory(stage, state) if isMemory else None
+        results.append({"stage": stageName, "rows": rowCnt, "files": len(filesList), "seconds": seconds,
+                        "rowsPerSecond": rowCnt / seconds if seconds else None, "peakBytes": peak})
+
+    return results
+
+def printResults(results:list, baseline:dict):
+    print(f"{'Rows':>9} {'Stage':<15} {'Seconds':>9} {'Rows/sec':>12} {'Peak MB':>9} {'Change':>8}")
+    for result in results:
+        rowsPerSecond = f"{result['rowsPerSecond']:12,.0f}" if result["rowsPerSecond"] else f"{'-':>12}"
+        peak = f"{result['peakBytes'] / 2**20:9.1f}" if result["peakBytes"] is not None else f"{'-':>9}"
+        previous = baseline.get((result["rows"], result["stage"]))
+        change = f"{(result['seconds'] / previous['seconds'] - 1) * 100:+7.1f}%" if previous else f"{'-':>8}"
+        print(f"{result['rows']:>9} {result['stage']:<15} {result['seconds']:9.3f} {rowsPerSecond} {peak} {change}")
+
+def findRegressions(results:list, baseline:dict, tolerance:float) -> list:
+    # Stages slower than the compared results by more than the tolerance
+    regressions = []
+    for result in results:
+        previous = baseline.get((result["rows"], result["stage"]))
+        if previous and result["seconds"] > previous["seconds"] * (1 + tolerance):
+            regressions.append(result)
+
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure each stage of loading the schedules")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma separated numbers of schedules")
+    parser.add_argument("--files", type=int, default=50, help="Number of files the schedules are split into")
+    parser.add_argument("--data", help="Folder to keep the generated timetables in, so that later runs reuse them")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs of each stage, the fastest is reported")
+    parser.add_argument("--no-memory", dest="isMemory", action="store_false", help="Skip measuring the peak memory")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--compare", help="Results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the compared results")
+    options = parser.parse_args()
+
+    baseline = {}
+    if options.compare:
+        with open(options.compare) as file:
+            baseline = {(result["rows"], result["stage"]): result for result in json.load(file)["results"]}
+
+    workFolder = tempfile.mkdtemp()
+    dataFolder = options.data or os.path.join(workFolder, "data")
+    results = []
+    try:
+        for rowCnt in [int(size) for size in options.sizes.split(",")]:
+            folderPath = os.path.join(dataFolder, f"rows{rowCnt}_files{options.files}")
+            filesList = sorted(os.path.join(folderPath, fileName) for fileName in os.listdir(folderPath)) if os.path.isdir(folderPath) else []
+            if len(filesList) != options.files:
+                print(f"Generating {rowCnt} schedules in {options.files} files...")
+                filesList = writeTimetables(folderPath, rowCnt, options.files)
+            results += runBenchmark(filesList, os.path.join(workFolder, f"cache{rowCnt}"), options.isMemory, options.repeat)
+    finally:
+        shutil.rmtree(workFolder, ignore_errors=True)
+
+    printResults(results, baseline)
+    if options.json:
+        with open(options.json, "w") as file:
+            json.dump({"python": sys.version.split()[0], "cpus": os.cpu_count(), "results": results}, file, indent=2)
+
+    regressions = findRegressions(results, baseline, options.tolerance)
+    for result in regressions:
+        print(f"Regression: {result['stage']} with {result['rows']} schedules")
+    sys.exit(1 if regressions else 0)
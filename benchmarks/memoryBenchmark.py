@@ -0,0 +1,95 @@
+# ===== Import =====
+import os, sys, csv # For reading the synthetic data
+import argparse # For command line options
+import datetime # For parsing the schedules as before
+import tempfile, tracemalloc, gc # For measuring the memory
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from timetableCore import DataHandler, LinkedList
+from generateTimetables import writeTimetables
+
+
+"""
+Memory comparison of the loaded schedules, before and after the values of each column are dictionary encoded.
+    python benchmarks/memoryBenchmark.py --rows 200000 --files 20
+"""
+
+
+
+# ===== Schedules Before Encoding =====
+class LegacySchedule: # Schedule with its own copy of every value, as it was stored before
+    def __init__(self, module, moduleCode, cohort, course, fullPart, session, activityDate, scheduledDay,
+                 startTime, endTime, duration, location, size, lecturer, zone):
+        self.__module = module
+        self.__moduleCode = moduleCode
+        self.__cohort = cohort
+        self.__course = course
+        self.__fullPart = fullPart
+        self.__session = session
+        self.__activityDate = activityDate
+        self.__scheduledDay = scheduledDay
+        self.__startTime = startTime
+        self.__endTime = endTime
+        self.__duration = duration
+        self.__location = location
+        self.__size = size
+        self.__lecturer = lecturer
+        self.__zone = zone
+
+def legacyLoad(filesList:list) -> LinkedList:
+    # Every row is extracted and parsed on its own, as it was before
+    schedules = LinkedList()
+    for filePath in filesList:
+        with open(filePath, "r") as csvfile:
+            for row in csv.reader(csvfile, delimiter=","):
+                if row[0] == '':
+                    continue
+                course, cohort, fullPart, moduleCode, session = row[1].split("_")
+                day, month, year = row[3].split("/")
+                activityDate = datetime.date(int(year), int(month), int(day))
+                startTime = datetime.time(*[int(value) for value in row[5].split(":")])
+                endTime = datetime.time(*[int(value) for value in row[6].split(":")])
+                schedules.append(LegacySchedule(
+                    row[2][4:].split(" (")[0], moduleCode, fullPart + "_" + cohort, course, fullPart, session, activityDate,
+                    activityDate.isoweekday(), startTime, endTime, row[7].lstrip("0"), row[8], int(row[9]), row[10], row[11]
+                ))
+
+    return schedules
+
+def encodedLoad(filesList:list):
+    dataHandler = DataHandler()
+    dataHandler.setFilesPathList(filesList)
+    dataHandler.setSchedules(isCached=False)
+    return dataHandler
+
+
+
+# ===== Measurement =====
+def measure(loadFunction, filesList:list) -> int:
+    # Memory still held by the loaded schedules
+    gc.collect()
+    tracemalloc.start()
+    loaded = loadFunction(filesList)
+    gc.collect()
+    usedMemory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del loaded
+
+    return usedMemory
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the memory of the schedules before and after dictionary encoding")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--files", type=int, default=20)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folderPath:
+        filesList = writeTimetables(folderPath, options.rows, options.files)
+        rowCnt = options.rows
+        before = measure(legacyLoad, filesList)
+        after = measure(encodedLoad, filesList)
+
+    print(f"Schedules: {rowCnt}")
+    print(f"Before encoding: {before / 2**20:8.1f} MB ({before / rowCnt:6.0f} bytes per schedule)")
+    print(f"After encoding:  {after / 2**20:8.1f} MB ({after / rowCnt:6.0f} bytes per schedule)")
+    print(f"Saved: {(1 - after / before) * 100:.1f}%")
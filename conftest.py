@@ -0,0 +1,32 @@
+# ===== Import =====
+import os, sys # For importing the timetable generator
+import pytest # For the shared fixtures
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+from generateTimetables import writeTimetables
+from timetableCore import DataHandler
+
+
+"""
+Fixtures shared by the test modules. Timetables are generated into a temporary folder for each test.
+"""
+
+
+
+# ===== Fixtures =====
+@pytest.fixture
+def timetableFiles(tmp_path) -> list:
+    # Four files of 200 schedules, each the export of one term
+    return writeTimetables(str(tmp_path / "timetables"), 800, 4)
+
+@pytest.fixture
+def cacheDirectory(tmp_path) -> str:
+    return str(tmp_path / "cache")
+
+@pytest.fixture
+def scheduleStore(timetableFiles, cacheDirectory):
+    # Schedules of the generated timetables, parsed into memory
+    dataHandler = DataHandler(cacheDirectory)
+    dataHandler.setFilesPathList(timetableFiles)
+    dataHandler.setSchedules(isCached=False)
+    return dataHandler.getSchedules()
@@ -0,0 +1,124 @@
+# ===== Import =====
+import datetime # For the dates and times of the queries
+import pytest # For the archive fixture
+
+from timetableCore import DisplayHandler, ArchiveDisplayHandler, ScheduleArchive, Query
+from test_query import makeQueries, getValue
+
+
+"""
+ArchiveDisplayHandler against the DisplayHandler on the same timetables. Both give the same results, in the same order.
+"""
+
+
+
+# ===== Fixtures =====
+@pytest.fixture
+def displayHandlers(scheduleStore, timetableFiles, tmp_path):
+    archive = ScheduleArchive(str(tmp_path / "schedules.sqlite"))
+    archive.addFiles(timetableFiles)
+    yield DisplayHandler(scheduleStore), ArchiveDisplayHandler(archive)
+    archive.close()
+
+def applyBoth(displayHandlers, clauses:list):
+    for displayHandler in displayHandlers:
+        query = Query()
+        query.clauses = list(clauses)
+        displayHandler.applyQuery(query)
+
+def getPages(displayHandler) -> list:
+    return displayHandler.getPage(0, displayHandler.getResultCount())
+
+def getClashes(displayHandler, categories=None) -> list:
+    # Clashes by the values of their schedules, as row ids of the archive start from 1
+    schedules = displayHandler.getSchedules()
+    return sorted((category, schedules.getAll(rowId), schedules.getAll(otherRowId))
+                  for category, rowId, otherRowId in displayHandler.findClashes(categories))
+
+
+
+# ===== Results =====
+def testArchiveKeepsEverySchedule(displayHandlers, scheduleStore):
+    memoryHandler, archiveHandler = displayHandlers
+    assert len(archiveHandler.getSchedules()) == len(scheduleStore)
+    assert getPages(archiveHandler) == getPages(memoryHandler)
+
+def testQueriesMatch(displayHandlers, scheduleStore):
+    memoryHandler, archiveHandler = displayHandlers
+    for clauses in makeQueries(scheduleStore):
+        applyBoth(displayHandlers, clauses)
+        assert archiveHandler.getResultCount() == memoryHandler.getResultCount(), clauses
+        assert getPages(archiveHandler) == getPages(memoryHandler), clauses
+
+def testOptionCountsMatch(displayHandlers, scheduleStore):
+    memoryHandler, archiveHandler = displayHandlers
+    applyBoth(displayHandlers, makeQueries(scheduleStore)[0])
+    for category in ["lecturer", "session", "duration"]:
+        for matchMode in ["and", "or", "not"]:
+            assert archiveHandler.getOptionCounts(category, matchMode) == memoryHandler.getOptionCounts(category, matchMode)
+
+@pytest.mark.parametrize("category, isAscending, thenBy", [("lecturer", True, ["startTime"]), ("duration", True, []),
+                                                           ("duration", False, ["module"]), ("size", False, []),
+                                                           ("activityDate", True, ["startTime", "location"])])
+def testSortsMatch(displayHandlers, category, isAscending, thenBy):
+    memoryHandler, archiveHandler = displayHandlers
+    for displayHandler in displayHandlers:
+        displayHandler.sort(category, isAscending, thenBy)
+    assert getPages(archiveHandler) == getPages(memoryHandler)
+    assert archiveHandler.getPage(50, 20) == memoryHandler.getPage(50, 20)
+
+def testUndoMatches(displayHandlers, scheduleStore):
+    memoryHandler, archiveHandler = displayHandlers
+    queries = [Query(), Query()]
+    for clause in makeQueries(scheduleStore)[3]:
+        for displayHandler, query in zip(displayHandlers, queries):
+            query.clauses.append(clause)
+            displayHandler.applyQuery(query)
+    for displayHandler, query in zip(displayHandlers, queries):
+        assert displayHandler.undo(query)
+    assert queries[0].clauses == queries[1].clauses
+    assert getPages(archiveHandler) == getPages(memoryHandler)
+
+
+
+# ===== Reports =====
+def testClashesMatch(displayHandlers, scheduleStore):
+    memoryHandler, archiveHandler = displayHandlers
+    clashes = getClashes(memoryHandler)
+    assert clashes
+    assert getClashes(archiveHandler) == clashes
+    applyBoth(displayHandlers, makeQueries(scheduleStore)[0])
+    assert getClashes(archiveHandler, ["location"]) == getClashes(memoryHandler, ["location"])
+
+def testFreeRoomsMatch(displayHandlers, scheduleStore):
+    memoryHandler, archiveHandler = displayHandlers
+    date = getValue(scheduleStore, "activityDate")
+    for startTime, endTime, minSize in [(datetime.time(9), datetime.time(11), None), (datetime.time(13, 30), datetime.time(14), 20)]:
+        freeRooms = memoryHandler.findFreeRooms(date, startTime, endTime, minSize)
+        assert freeRooms
+        assert archiveHandler.findFreeRooms(date, startTime, endTime, minSize) == freeRooms
+
+def testFreeSlotsMatch(displayHandlers, scheduleStore):
+    memoryHandler, archiveHandler = displayHandlers
+    participants = [("cohort", getValue(scheduleStore, "cohort")), ("lecturer", getValue(scheduleStore, "lecturer")), ("lecturer", "nobody")]
+    arguments = (participants, datetime.date(2023, 1, 2), datetime.date(2023, 3, 31), datetime.time(8), datetime.time(21), 60)
+    assert archiveHandler.findFreeSlots(*arguments) == memoryHandler.findFreeSlots(*arguments)
+
+def testAggregatesMatch(displayHandlers, scheduleStore):
+    memoryHandler, archiveHandler = displayHandlers
+    applyBoth(displayHandlers, makeQueries(scheduleStore)[4])
+    for categories in [["lecturer"], ["zone", "session"], ["duration"]]:
+        assert archiveHandler.aggregate(categories) == memoryHandler.aggregate(categories)
+
+def testOccupancyCubesMatch(displayHandlers, scheduleStore):
+    memoryHandler, archiveHandler = displayHandlers
+    applyBoth(displayHandlers, makeQueries(scheduleStore)[0])
+    for slotMinutes in [60, 30]:
+        memoryCube, archiveCube = memoryHandler.getOccupancyCube(slotMinutes), archiveHandler.getOccupancyCube(slotMinutes)
+        assert archiveCube.locations == memoryCube.locations
+        assert archiveCube.getBookedSlots() == memoryCube.getBookedSlots()
+        assert (archiveCube.minutes == memoryCube.minutes).all()
+        archiveNames, archivePercentages = archiveCube.getPercentages("zone")
+        memoryNames, memoryPercentages = memoryCube.getPercentages("zone")
+        assert archiveNames == memoryNames
+        assert (archivePercentages == memoryPercentages).all()
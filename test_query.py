@@ -0,0 +1,174 @@
+# ===== Import =====
+import datetime # For the range and interval filters
+import pytest # For running each query
+
+from timetableCore import DisplayHandler, Query, BitmapIndex, SortedIndex, IntervalIndex, toBitmap, fromBitmap, timeToSeconds
+
+
+"""
+Filters planned by DisplayHandler.applyQuery, undo and redo of the filters, and the indexes they run on,
+against checking every schedule.
+"""
+
+
+
+# ===== Helpers =====
+def isMatched(values:list, clause:tuple) -> bool:
+    # Whether the schedule given by its values passes the clause, found from its values alone
+    categories = ["module", "moduleCode", "cohort", "course", "fullPart", "session", "activityDate", "scheduledDay",
+                  "startTime", "endTime", "duration", "location", "size", "lecturer", "zone"]
+    if clause[0] == "value":
+        return values[categories.index(clause[1])] == clause[2]
+    elif clause[0] == "range" and clause[1] == "time":
+        return values[8] >= clause[2] and values[9] <= clause[3]
+    elif clause[0] == "range":
+        return clause[2] <= values[categories.index(clause[1])] <= clause[3]
+    start = datetime.datetime.combine(values[6], values[8])
+    end = datetime.datetime.combine(values[6], values[9])
+    if clause[1] == "overlap":
+        return start < clause[3] and end > clause[2]
+    elif clause[1] == "contains":
+        return start <= clause[2] < end
+    return start >= clause[2] and end <= clause[3]
+
+def findRows(schedules, clauses:list) -> set:
+    # Each filter in order: "or" adds the schedules with the value, "not" removes them and the others keep them
+    rows = set(schedules.getRowIds())
+    allValues = {rowId: schedules.getAll(rowId) for rowId in rows}
+    for clause in clauses:
+        matched = {rowId for rowId, values in allValues.items() if isMatched(values, clause)}
+        matchMode = clause[3] if clause[0] == "value" else "and"
+        if matchMode == "or":
+            rows |= matched
+        elif matchMode == "not":
+            rows -= matched
+        else:
+            rows &= matched
+    return rows
+
+def getValue(schedules, category:str, position=0):
+    # A value with schedules, the most common first
+    counts = {}
+    for rowId in schedules.getRowIds():
+        value = schedules.get(rowId, category)
+        counts[value] = counts.get(value, 0) + 1
+    return sorted(counts, key=lambda value: (-counts[value], str(value)))[position]
+
+def makeQueries(schedules) -> list:
+    lecturer, otherLecturer = getValue(schedules, "lecturer"), getValue(schedules, "lecturer", 1)
+    zone, session = getValue(schedules, "zone"), getValue(schedules, "session")
+    moment = datetime.datetime.combine(getValue(schedules, "activityDate"), datetime.time(11, 0))
+    return [
+        [("value", "zone", zone, "and")],
+        [("value", "zone", zone, "and"), ("value", "session", session, "and")],
+        [("value", "zone", zone, "and"), ("value", "session", session, "not")],
+        [("value", "lecturer", lecturer, "and"), ("value", "lecturer", otherLecturer, "or"), ("value", "session", session, "and")],
+        [("range", "activityDate", datetime.date(2023, 2, 1), datetime.date(2023, 3, 1)), ("value", "zone", zone, "and")],
+        [("range", "time", datetime.time(9, 0), datetime.time(13, 0)), ("value", "session", session, "not")],
+        [("interval", "contains", moment, None)],
+        [("interval", "overlap", moment, moment + datetime.timedelta(hours=2)), ("value", "session", session, "not")],
+        [("interval", "enclosed", moment - datetime.timedelta(hours=3), moment + datetime.timedelta(hours=3))],
+    ]
+
+
+
+# ===== Query Planner =====
+def testQueriesMatchEverySchedule(scheduleStore):
+    displayHandler = DisplayHandler(scheduleStore)
+    for clauses in makeQueries(scheduleStore):
+        query = Query()
+        query.clauses = list(clauses)
+        displayHandler.applyQuery(query)
+        assert set(displayHandler.getResult()) == findRows(scheduleStore, clauses), clauses
+
+def testPlanRunsMostSelectiveFilterFirst(scheduleStore):
+    displayHandler = DisplayHandler(scheduleStore)
+    clauses = makeQueries(scheduleStore)[1] + [("range", "activityDate", datetime.date(2023, 1, 1), datetime.date(2023, 1, 10))]
+    steps = displayHandler.planQuery(clauses)
+    estimates = [step[0] for step in steps]
+    assert estimates == sorted(estimates)
+    for clause in clauses: # Estimates come from the indexes, and are the exact number of schedules of each filter
+        assert len(findRows(scheduleStore, [clause])) in estimates
+
+def testQueryKeepsSortOrder(scheduleStore):
+    displayHandler = DisplayHandler(scheduleStore)
+    displayHandler.sort("startTime", False, ["lecturer"])
+    query = Query()
+    query.clauses = list(makeQueries(scheduleStore)[0])
+    displayHandler.applyQuery(query)
+    keys = [(scheduleStore.get(rowId, "startTime"), scheduleStore.get(rowId, "lecturer")) for rowId in displayHandler.getResult()]
+    assert keys == sorted(keys, reverse=True)
+
+
+
+# ===== Undo and Redo =====
+def testUndoAndRedoPutBackResults(scheduleStore):
+    displayHandler = DisplayHandler(scheduleStore)
+    query = Query()
+    assert not displayHandler.canUndo()
+    results = [list(displayHandler.getResult())]
+    for clause in makeQueries(scheduleStore)[3]:
+        query.clauses.append(clause)
+        displayHandler.applyQuery(query)
+        results.append(list(displayHandler.getResult()))
+
+    for index in range(len(results) - 2, -1, -1):
+        assert displayHandler.undo(query)
+        assert list(displayHandler.getResult()) == results[index]
+        assert len(query.clauses) == index
+    assert not displayHandler.undo(query)
+
+    assert displayHandler.redo(query)
+    assert displayHandler.redo(query)
+    assert list(displayHandler.getResult()) == results[2]
+    query.clauses.pop() # A new filter state drops what is left to redo
+    displayHandler.applyQuery(query)
+    assert not displayHandler.canRedo()
+
+def testRemovingFilterKeepsLaterFilters(scheduleStore):
+    displayHandler = DisplayHandler(scheduleStore)
+    clauses = makeQueries(scheduleStore)[4] + [("value", "session", getValue(scheduleStore, "session"), "not")]
+    query = Query()
+    query.clauses = list(clauses)
+    displayHandler.applyQuery(query)
+    query.removeClause(0)
+    displayHandler.applyQuery(query)
+    assert set(displayHandler.getResult()) == findRows(scheduleStore, clauses[1:])
+
+
+
+# ===== Indexes =====
+def testBitmapsKeepRowIds():
+    rowIds = [0, 3, 8, 9, 64, 65, 1000]
+    assert fromBitmap(toBitmap(rowIds)) == rowIds
+    assert fromBitmap(0) == []
+
+def testBitmapIndexRemovesRows():
+    bitmapIndex = BitmapIndex()
+    for rowId, code in enumerate([0, 1, 0, 2, 1, 0]):
+        bitmapIndex.add(code, rowId)
+    bitmapIndex.removeAll(0, {0, 5})
+    bitmapIndex.removeAll(2, {3})
+    assert list(bitmapIndex.getRowIds(0)) == [2]
+    assert bitmapIndex.getBitmap(1) == toBitmap([1, 4])
+    assert bitmapIndex.getCount(2) == 0
+
+def testSortedIndexRanges():
+    values = ["1:30", "10:00", ":30", "2:00"]
+    postings = {0: [4, 7], 1: [1], 2: [0, 5], 3: [2]}
+    toMinutes = lambda value: int(value.split(":")[0] or 0) * 60 + int(value.split(":")[1])
+    sortedIndex = SortedIndex(values, postings, toMinutes)
+    assert list(sortedIndex.getRange("1:00", "2:00")) == [4, 7, 2]
+    assert sortedIndex.getCount(None, ":30") == 2
+    assert list(sortedIndex.getRange("10:00")) == [1]
+
+def testIntervalIndexMatchesEveryInterval(scheduleStore):
+    rowIds = scheduleStore.getRowIds()
+    starts = [scheduleStore.get(rowId, "activityDate").toordinal() * 86400 + timeToSeconds(scheduleStore.get(rowId, "startTime")) for rowId in rowIds]
+    ends = [scheduleStore.get(rowId, "activityDate").toordinal() * 86400 + timeToSeconds(scheduleStore.get(rowId, "endTime")) for rowId in rowIds]
+    intervalIndex = IntervalIndex(starts, ends, rowIds)
+    for start in starts[:50]:
+        end = start + 5400
+        assert sorted(intervalIndex.getOverlapping(start, end)) == [rowId for rowId, s, e in zip(rowIds, starts, ends) if s < end and e > start]
+        assert sorted(intervalIndex.getContaining(start)) == [rowId for rowId, s, e in zip(rowIds, starts, ends) if s <= start < e]
+        assert sorted(intervalIndex.getEnclosed(start, end)) == [rowId for rowId, s, e in zip(rowIds, starts, ends) if s >= start and e <= end]
@@ -0,0 +1,88 @@
+# ===== Import =====
+import os, datetime # For rewriting the timetable files
+from collections import Counter # For comparing schedules whatever their row order
+
+from timetableCore import DataHandler, DisplayHandler
+from generateTimetables import TimetableGenerator
+
+
+"""
+Reloading changed, added and deleted files, in memory and in lazy mode, against loading the same files from scratch.
+"""
+
+
+
+# ===== Helpers =====
+def rewriteFile(filePath:str, rowCnt:int, seed=1):
+    # Writes other schedules into the same path, with a new modified time even on a coarse clock
+    modified = os.stat(filePath).st_mtime_ns
+    TimetableGenerator(seed).writeFile(filePath, rowCnt, datetime.date(2024, 1, 8))
+    os.utime(filePath, ns=(modified + 10**9, modified + 10**9))
+
+def loadSchedules(filesList:list, cacheDirectory:str, **options) -> DataHandler:
+    dataHandler = DataHandler(cacheDirectory)
+    dataHandler.setFilesPathList(filesList)
+    dataHandler.setSchedules(**options)
+    return dataHandler
+
+def getRows(dataHandler:DataHandler) -> Counter:
+    # Values of every schedule, read through each column so that the columns not decoded yet are decoded
+    schedules = dataHandler.getSchedules()
+    rows = Counter()
+    for rowId in schedules.getRowIds():
+        values = schedules.getAll(rowId)
+        assert values == [schedules.get(rowId, category) for category in schedules.categories]
+        rows[tuple(values)] += 1
+    return rows
+
+
+
+# ===== Tests =====
+def testReloadKeepsUnchangedFiles(timetableFiles, cacheDirectory):
+    dataHandler = loadSchedules(timetableFiles, cacheDirectory)
+    rowCnt = len(dataHandler.getSchedules())
+    addedRows, removedRows = dataHandler.reloadSchedules()
+    assert (list(addedRows), list(removedRows)) == ([], [])
+    assert len(dataHandler.getSchedules()) == rowCnt
+
+def testReloadReplacesChangedFile(timetableFiles, cacheDirectory):
+    dataHandler = loadSchedules(timetableFiles, cacheDirectory)
+    displayHandler = DisplayHandler(dataHandler.getSchedules())
+    rewriteFile(timetableFiles[1], 50)
+    addedRows, removedRows = dataHandler.reloadSchedules()
+    displayHandler.updateSchedules(addedRows, removedRows)
+
+    assert (len(addedRows), len(removedRows)) == (50, 200)
+    assert getRows(dataHandler) == getRows(loadSchedules(timetableFiles, cacheDirectory, isCached=False))
+    assert displayHandler.getResultCount() == 650
+
+def testReloadAddsAndDeletesFiles(timetableFiles, cacheDirectory):
+    dataHandler = loadSchedules(timetableFiles[:3], cacheDirectory)
+    dataHandler.setFilesPathList(timetableFiles[1:])
+    addedRows, removedRows = dataHandler.reloadSchedules()
+    assert (len(addedRows), len(removedRows)) == (200, 200)
+    assert getRows(dataHandler) == getRows(loadSchedules(timetableFiles[1:], cacheDirectory, isCached=False))
+
+def testLazyLoadMatchesParsedLoad(timetableFiles, cacheDirectory):
+    assert getRows(loadSchedules(timetableFiles, cacheDirectory, isLazy=True)) == getRows(loadSchedules(timetableFiles, cacheDirectory, isCached=False))
+
+def testLazyReloadAfterFileRewritten(timetableFiles, cacheDirectory):
+    # The rewritten file is shorter than its offsets, so its old rows must not be decoded from it again
+    dataHandler = loadSchedules(timetableFiles, cacheDirectory, isLazy=True)
+    displayHandler = DisplayHandler(dataHandler.getSchedules())
+    displayHandler.sort("module") # Only the module column is decoded before the reload
+    rewriteFile(timetableFiles[0], 20)
+    addedRows, removedRows = dataHandler.reloadSchedules()
+    displayHandler.updateSchedules(addedRows, removedRows)
+
+    assert getRows(dataHandler) == getRows(loadSchedules(timetableFiles, cacheDirectory, isCached=False))
+    displayHandler.sort("lecturer")
+    assert displayHandler.getResultCount() == 620
+    assert len(displayHandler.getPage(0, 1000)) == 620
+
+def testLazyReloadAfterFileDeleted(timetableFiles, cacheDirectory):
+    dataHandler = loadSchedules(timetableFiles, cacheDirectory, isLazy=True)
+    os.remove(timetableFiles[2])
+    dataHandler.setFilesPathList(timetableFiles[:2] + timetableFiles[3:])
+    dataHandler.reloadSchedules()
+    assert getRows(dataHandler) == getRows(loadSchedules(timetableFiles[:2] + timetableFiles[3:], cacheDirectory, isCached=False))
@@ -0,0 +1,225 @@
+# ===== Import =====
+import os, sys, csv # For reading the folder and writing the result
+import argparse # For command line options
+import datetime # For date and time ranges
+
+# Handler Classes
+from timetableCore import DataHandler, DisplayHandler, ExportHandler, ScheduleStore, ScheduleArchive, ArchiveDisplayHandler, Query
+
+
+"""
+Runs the Timetable Viewer without a display. Loads a folder of CSV files, then filters, sorts and exports the schedules.
+Only timetableCore is imported, so tkinter and ttkbootstrap are never loaded.
+
+Example:
+    python timetableCLI.py ./term1 --filter "lecturer=Dr Jane Smith" --date 01/03/2023 31/03/2023 --time 09:00 17:00 --sort startTime --format excel --output ./exports
+    python timetableCLI.py ./term1 --any cohort=FT_C01 --any cohort=FT_C02 --exclude "zone=Zone C"
+    python timetableCLI.py ./term2 --archive timetables.sqlite --filter "zone=Zone A" --sort activityDate
+"""
+
+
+
+# ===== Value Conversion =====
+def parseDate(strVal:str) -> datetime.date:
+    # Same format as the CSV files, dd/mm/yyyy. dd-mm-yyyy is also accepted, as used by the GUI
+    return datetime.datetime.strptime(strVal.replace("-", "/"), "%d/%m/%Y").date()
+
+def parseTime(strVal:str) -> datetime.time:
+    dateformat = "%H:%M:%S" if strVal.count(":") == 2 else "%H:%M"
+    return datetime.datetime.strptime(strVal, dateformat).time()
+
+def toValue(category:str, strVal:str):
+    # Changes the text of a filter into the value stored in the schedules
+    days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+    if category == "activityDate":
+        return parseDate(strVal)
+    elif category == "scheduledDay":
+        return days.index(strVal.lower()) + 1 if strVal.lower() in days else int(strVal)
+    elif category == "startTime" or category == "endTime":
+        return parseTime(strVal)
+    elif category == "size":
+        return int(strVal)
+    elif category == "duration":
+        return strVal.lstrip("0")
+    else:
+        return strVal
+
+def parseDateTime(strVal:str) -> datetime.datetime:
+    # A date and a time, "dd/mm/yyyy HH:MM"
+    dateVal, _, timeVal = strVal.strip().partition(" ")
+    return datetime.datetime.combine(parseDate(dateVal), parseTime(timeVal.strip()))
+
+def parseFilter(expression:str) -> list:
+    # Filter expressions are written as category=value
+    category, separator, strVal = expression.partition("=")
+    if separator == "" or category not in ScheduleStore.categories:
+        raise argparse.ArgumentTypeError(f"'{expression}' is not category=value with one of: {', '.join(ScheduleStore.categories)}")
+    try:
+        return [category, toValue(category, strVal)]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{strVal}' is not a valid value for {category}")
+
+
+
+# ===== Pipeline =====
+def listFiles(paths:list) -> list:
+    # Folders are searched for CSV files like the Open Folder button, files are used as they are
+    filesList = []
+    for path in paths:
+        if os.path.isdir(path):
+            for file in sorted(os.listdir(path)):
+                if file.endswith(".csv"):
+                    filesList.append(os.path.join(path, file))
+        elif path.endswith(".csv"):
+            filesList.append(path)
+
+    return filesList
+
+def writeCSV(displayHandler, outputPath:str, pageSize=10000):
+    # Writes the schedules in the order of the result, with the same columns as the schedule table.
+    # The result is read one page at a time, so an archive is written without holding its result in memory
+    dayString = ["","Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
+    with open(outputPath, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(ScheduleStore.categories)
+        for pageStart in range(0, displayHandler.getResultCount(), pageSize):
+            for li in displayHandler.getPage(pageStart, pageSize):
+                li[6] = li[6].strftime("%d/%m/%Y")
+                li[7] = dayString[li[7]]
+                writer.writerow(li)
+
+def runArchivePipeline(options):
+    # Files are added to the archive, and the filters run as one query in SQLite. The first --any is an "and" filter
+    # and the others are "or" filters, so the filters after them keep the schedules with any of the values
+    archive = ScheduleArchive(options.archive)
+    try:
+        archive.addFiles(options.filesList)
+        displayHandler = ArchiveDisplayHandler(archive)
+
+        query = Query()
+        for index, (category, value) in enumerate(options.any):
+            query.addFilter(category, value, "or" if index > 0 else "and")
+        for category, value in options.filter:
+            query.addFilter(category, value)
+        for category, value in options.exclude:
+            query.addFilter(category, value, "not")
+        if options.date is not None:
+            query.addRange("activityDate", options.date[0], options.date[1])
+        if options.time is not None:
+            query.addRange("time", options.time[0], options.time[1])
+        if options.at is not None:
+            query.addInterval("contains", options.at)
+        if options.overlap is not None:
+            query.addInterval("overlap", options.overlap[0], options.overlap[1])
+        displayHandler.applyQuery(query)
+        if options.sort is not None:
+            displayHandler.sort(options.sort, not options.descending, options.thenBy)
+    except BaseException: # A failed pipeline closes its archive here, a finished one is closed by main after the export
+        archive.close()
+        raise
+
+    return displayHandler
+
+def runPipeline(options):
+    # Same order as the GUI: load, filter, range, then sort
+    if options.archive is not None:
+        return runArchivePipeline(options)
+    dataHandler = DataHandler()
+    dataHandler.setFilesPathList(options.filesList)
+    dataHandler.setSchedules(isParallel=options.parallel, isCached=not options.noCache, isLazy=options.lazy)
+    displayHandler = DisplayHandler(dataHandler.getSchedules())
+
+    # Filters are combined as bitmaps first: every --filter, any one --any, and no --exclude
+    bitmap = displayHandler.getAllSchedules()
+    for category, value in options.filter:
+        bitmap &= displayHandler.getFilteredSchedule(category, value)
+    if len(options.any) > 0:
+        anyBitmap = 0
+        for category, value in options.any:
+            anyBitmap |= displayHandler.getFilteredSchedule(category, value)
+        bitmap &= anyBitmap
+    for category, value in options.exclude:
+        bitmap &= ~displayHandler.getFilteredSchedule(category, value)
+    displayHandler.setCommonSchedules(bitmap)
+    if options.date is not None:
+        displayHandler.rangeSearch(options.date[0], options.date[1], "activityDate")
+    if options.time is not None:
+        displayHandler.rangeSearch(options.time[0], options.time[1], "time")
+    if options.at is not None:
+        displayHandler.intervalSearch("contains", options.at)
+    if options.overlap is not None:
+        displayHandler.intervalSearch("overlap", options.overlap[0], options.overlap[1])
+    if options.sort is not None:
+        displayHandler.sort(options.sort, not options.descending, options.thenBy)
+
+    return displayHandler
+
+def exportSchedules(displayHandler, options) -> int:
+    resultCnt = displayHandler.getResultCount()
+    if resultCnt == 0:
+        print("No schedules to export.", file=sys.stderr)
+        return 1
+
+    os.makedirs(options.output, exist_ok=True)
+    if options.format == "csv":
+        outputPath = os.path.join(options.output, "Timetable.csv")
+        writeCSV(displayHandler, outputPath)
+    else:
+        exportHandler = ExportHandler()
+        exportHandler.setResult(displayHandler.getSchedules(), displayHandler.exportResult(), options.output)
+        if options.format == "excel":
+            outputPath = os.path.join(options.output, "Excel_Timetable.xlsx")
+            exportHandler.exportExcel()
+        else:
+            outputPath = os.path.join(options.output, "PDF_Timetable.pdf")
+            exportHandler.exportPDF()
+
+    print(f"{resultCnt} schedules exported to {outputPath}")
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Filter, sort and export timetables without the GUI")
+    parser.add_argument("paths", nargs="*", help="folders of CSV files, or CSV files")
+    parser.add_argument("--filter", action="append", default=[], type=parseFilter, metavar="CATEGORY=VALUE",
+                        help="keep schedules with this value. Repeated filters are all applied")
+    parser.add_argument("--any", action="append", default=[], type=parseFilter, metavar="CATEGORY=VALUE",
+                        help="keep schedules with at least one of the repeated values")
+    parser.add_argument("--exclude", action="append", default=[], type=parseFilter, metavar="CATEGORY=VALUE",
+                        help="drop schedules with this value")
+    parser.add_argument("--date", nargs=2, type=parseDate, metavar=("START", "END"), help="date range, dd/mm/yyyy")
+    parser.add_argument("--time", nargs=2, type=parseTime, metavar=("START", "END"), help="time range, HH:MM")
+    parser.add_argument("--at", type=parseDateTime, metavar="\"DATE TIME\"", help="schedules running at this moment, \"dd/mm/yyyy HH:MM\"")
+    parser.add_argument("--overlap", nargs=2, type=parseDateTime, metavar=("\"START\"", "\"END\""),
+                        help="schedules sharing time with this window, \"dd/mm/yyyy HH:MM\"")
+    parser.add_argument("--sort", choices=ScheduleStore.categories, help="category to sort by")
+    parser.add_argument("--then-by", dest="thenBy", action="append", default=[], choices=ScheduleStore.categories,
+                        help="category to sort equal schedules by, can be repeated")
+    parser.add_argument("--descending", action="store_true", help="sort in descending order")
+    parser.add_argument("--format", choices=["excel", "pdf", "csv"], default="csv", help="output format")
+    parser.add_argument("--output", default=".", help="folder of the exported file")
+    parser.add_argument("--parallel", action="store_true", help="read the CSV files on a process pool")
+    parser.add_argument("--lazy", action="store_true", help="map the CSV files and decode only the columns that are used")
+    parser.add_argument("--no-cache", dest="noCache", action="store_true", help="do not use the parsed file cache")
+    parser.add_argument("--archive", metavar="PATH", help="add the CSV files to this SQLite archive and filter every schedule in it")
+    options = parser.parse_args(argv)
+
+    options.filesList = listFiles(options.paths)
+    if len(options.filesList) == 0 and options.archive is None:
+        parser.error("no CSV files found")
+    if options.date is not None and options.date[0] > options.date[1]:
+        parser.error("starting date cannot exceed ending date")
+    if options.time is not None and options.time[0] > options.time[1]:
+        parser.error("starting time cannot exceed ending time")
+
+    displayHandler = runPipeline(options)
+    try:
+        return exportSchedules(displayHandler, options)
+    finally:
+        if isinstance(displayHandler, ArchiveDisplayHandler):
+            displayHandler.getSchedules().close() # The archive is not used after the export
+
+
+
+# ===== Main =====
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2903 @@
+# ===== Import =====
+# Data Handler Class
+import os, csv # For reading data
+from concurrent.futures import ProcessPoolExecutor, wait # For reading CSV files in parallel
+import hashlib, pickle # For caching parsed files
+from array import array # For compact parsed files
+import mmap, locale, re, bisect # For reading CSV files lazily
+from operator import itemgetter, add # For the raw fields of each column, and the start and end of each archived schedule
+import sqlite3 # For the schedule archive
+
+# Data Handler Class and Display Handler Class
+import datetime # For date and time in the schedule
+from itertools import groupby, repeat # For grouping the rows of each value, and the file of each archived schedule
+import heapq # For the best search results
+import numpy as np # For the occupancy cube
+from collections import Counter, deque, OrderedDict # For counting the values of a few rows, the filter history and the query cache
+
+# Export Handler Class
+import random # For random color generator
+import colorsys # For erandom color generator
+from fpdf import FPDF # For editting pdf
+from openpyxl import Workbook # For editting Excel
+from openpyxl.utils import get_column_letter # # For changing index number to column letter
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill # For editting components of Excel
+from openpyxl.formatting.rule import ColorScaleRule # For the occupancy heatmap in Excel
+
+
+"""
+Schedules, filters and exports of the Timetable Viewer. Nothing in this module imports tkinter,
+so it is shared by the GUI (timetableViewer.py) and the command line (timetableCLI.py).
+
+Module Download Requirements:
+    1. openpyxl
+    2. fpdf
+    3. numpy
+"""
+
+
+
+# ===== Custom Data Structures =====
+class Node:
+    def __init__(self, data):
+        self.data = data
+        self.next = None
+
+    def __iter__(self):
+        currentNode = self
+        while currentNode:
+            yield currentNode
+            currentNode = currentNode.next
+
+class LinkedList:
+    def __init__(self):
+        self.head = None # Starting point of the linked list
+        self.tail = None # Tail is added for O(1) for appending
+    
+    def __iter__(self):
+        currentNode = self.head
+        while currentNode:
+            yield currentNode
+            currentNode = currentNode.next
+
+    def __contains__(self, node):
+        currentNode = self.head
+        while currentNode:
+            if currentNode.data == node:
+                return True
+            currentNode = currentNode.next
+
+    def append(self, data):
+        newNode = Node(data)
+        if self.head == None:
+            self.head = newNode
+            self.tail = newNode
+        
+        else:
+            self.tail.next = newNode
+            self.tail= newNode
+
+    def pop(self):
+        if self.head != None:
+            tmp = self.head
+            self.head = self.head.next
+            if self.head == None: self.tail = None
+            return tmp.data
+        else:
+            return None
+
+    def removeAll(self, dataSet:set): # Removes every node with data in the set in one pass
+        startNode = Node(None)
+        startNode.next = self.head
+        currentNode = startNode
+        while currentNode.next:
+            if currentNode.next.data in dataSet:
+                currentNode.next = currentNode.next.next
+            else:
+                currentNode = currentNode.next
+
+        self.head = startNode.next
+        self.tail = currentNode if self.head is not None else None
+
+class BitmapIndex: # Row ids of each value code of a column. Filters use the bitmap of a code, where bit n is row n
+    def __init__(self):
+        self.postings = {} # Sorted row ids of each code
+        self.bitmaps = {} # Bitmap of each code, made when it is first used
+
+    def build(self, column:array, rowIds:list): # Row ids are grouped by code with one sort, rather than one insert for each row
+        self.postings = {code: array("I", group) for code, group in groupby(sorted(rowIds, key=column.__getitem__), key=column.__getitem__)}
+        self.bitmaps = {}
+
+    def add(self, code:int, rowId:int): # Row ids only grow, so the row ids of each code stay sorted
+        self.postings.setdefault(code, array("I")).append(rowId)
+        self.bitmaps.pop(code, None)
+
+    def removeAll(self, code:int, rowSet:set): # Removes the rows from the code. Code is deleted when nothing is left
+        rowIds = array("I", [rowId for rowId in self.postings.get(code, ()) if rowId not in rowSet])
+        if len(rowIds) > 0:
+            self.postings[code] = rowIds
+        else:
+            self.postings.pop(code, None)
+        self.bitmaps.pop(code, None)
+
+    def getCount(self, code:int) -> int:
+        return len(self.postings.get(code, ()))
+
+    def getRowIds(self, code:int) -> array:
+        return self.postings.get(code, array("I"))
+
+    def getBitmap(self, code:int) -> int:
+        if code not in self.bitmaps:
+            self.bitmaps[code] = toBitmap(self.postings.get(code, ()))
+        return self.bitmaps[code]
+
+class SortedIndex: # Row ids in the order of their values. Rows between two values are found with bisect
+    def __init__(self, values:list, postings:dict, key=None):
+        # Built from the row ids of each code, so only the distinct values are sorted
+        self.__key = key if key is not None else (lambda value: value)
+        codes = sorted(postings, key=lambda code: self.__key(values[code]))
+        self.keys = [self.__key(values[code]) for code in codes] # Sorted key of each distinct value
+        self.starts = array("I", [0]) # Position of the first row of each key in rowIds, and the end of the last key
+        self.rowIds = array("I")
+        for code in codes:
+            self.rowIds.extend(postings[code])
+            self.starts.append(len(self.rowIds))
+
+    def getBounds(self, start=None, end=None) -> tuple: # Positions of the rows from start to end, both included. None is unbounded
+        low = self.starts[bisect.bisect_left(self.keys, self.__key(start))] if start is not None else 0
+        high = self.starts[bisect.bisect_right(self.keys, self.__key(end))] if end is not None else len(self.rowIds)
+        return (low, max(low, high))
+
+    def getCount(self, start=None, end=None) -> int:
+        low, high = self.getBounds(start, end)
+        return high - low
+
+    def getRange(self, start=None, end=None) -> array:
+        low, high = self.getBounds(start, end)
+        return self.rowIds[low:high]
+
+class IntervalIndex: # Intervals sorted by start, with the latest end below each node of an implicit tree, for overlap queries
+    def __init__(self, starts:list, ends:list, rowIds:list):
+        order = sorted(range(len(rowIds)), key=starts.__getitem__)
+        self.starts = array("q", [starts[index] for index in order])
+        self.ends = array("q", [ends[index] for index in order])
+        self.rowIds = array("I", [rowIds[index] for index in order])
+
+        # Node n covers the children 2n and 2n+1, leaves start at self.__size
+        self.__size = 1 << max(len(order) - 1, 0).bit_length()
+        self.__maxEnds = array("q", [-1]) * (2 * self.__size)
+        self.__maxEnds[self.__size:self.__size + len(order)] = self.ends
+        for node in range(self.__size - 1, 0, -1):
+            self.__maxEnds[node] = max(self.__maxEnds[2 * node], self.__maxEnds[2 * node + 1])
+
+    def getOverlapping(self, start:int, end:int) -> list: # Intervals sharing time with [start, end) - O((k + 1) log n) for k matches
+        return self.__find(end - 1, start + 1)
+
+    def getContaining(self, point:int) -> list: # Intervals running at the point, [start, end) includes the start only - O((k + 1) log n)
+        return self.__find(point, point + 1)
+
+    def getEnclosed(self, start:int, end:int) -> list: # Intervals that start and end within [start, end] - O(log n + m) for m starting within
+        low = bisect.bisect_left(self.starts, start)
+        high = bisect.bisect_right(self.starts, end)
+        return [self.rowIds[position] for position in range(low, high) if self.ends[position] <= end]
+
+    def __find(self, startAtMost:int, endAtLeast:int) -> list:
+        # Only nodes of intervals starting early enough with an end late enough are walked. Each match walks a path
+        # of up to log n nodes from the root, so the cost grows with the matches - O(k log n), never O(log n) alone
+        high = bisect.bisect_right(self.starts, startAtMost)
+        result = []
+        stack = [1] if high > 0 else []
+        while stack:
+            node = stack.pop()
+            if self.__maxEnds[node] < endAtLeast:
+                continue
+            depth = node.bit_length() - 1
+            if (node - (1 << depth)) * (self.__size >> depth) >= high: # Every interval below starts too late
+                continue
+            if node >= self.__size:
+                result.append(self.rowIds[node - self.__size])
+            else:
+                stack.append(2 * node + 1)
+                stack.append(2 * node)
+        return result
+
+class OccupancyIndex: # Busy times of each room as sorted intervals, with overlapping bookings merged, for free room queries
+    def __init__(self, codes:list, starts:list, ends:list, sizes:list, zones:list):
+        # Merged intervals do not overlap, so their ends are sorted as well and one bisect finds the gap of a window.
+        # The largest class booked in each room stands in for its capacity
+        self.starts = {} # Busy starts of each room code, in seconds
+        self.ends = {}
+        self.capacities = {} # Largest class size of each room code
+        self.zones = {} # Zone code of each room code
+        for position in sorted(range(len(codes)), key=lambda position: (codes[position] << 64) | starts[position]):
+            code = codes[position]
+            if code not in self.starts:
+                self.starts[code], self.ends[code] = array("q"), array("q")
+                self.capacities[code], self.zones[code] = sizes[position], zones[position]
+            roomStarts, roomEnds = self.starts[code], self.ends[code]
+            if len(roomEnds) > 0 and starts[position] <= roomEnds[-1]: # Overlaps or touches the previous booking
+                roomEnds[-1] = max(roomEnds[-1], ends[position])
+            else:
+                roomStarts.append(starts[position])
+                roomEnds.append(ends[position])
+            self.capacities[code] = max(self.capacities[code], sizes[position])
+
+    def getGap(self, code:int, start:int, end:int): # Free time around [start, end) as (free from, free until), None when busy
+        # None in the gap is no booking before or after the window
+        roomStarts, roomEnds = self.starts[code], self.ends[code]
+        position = bisect.bisect_left(roomStarts, end) # Bookings starting before the end of the window
+        if position > 0 and roomEnds[position - 1] > start:
+            return None
+        return (roomEnds[position - 1] if position > 0 else None, roomStarts[position] if position < len(roomStarts) else None)
+
+class OccupancyCube: # Booked minutes of each room by weekday and time slot, for the room utilization heatmap
+    weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+    def __init__(self, locations:list, zones:list, minutes:np.ndarray, dayCnts:np.ndarray, slotMinutes:int):
+        self.locations = locations # Name of each room, in the order of the first axis
+        self.zones = zones # Zone of each room
+        self.minutes = minutes # Booked minutes, rooms x weekdays x slots. Double booked minutes are counted twice
+        self.dayCnts = dayCnts # Number of each weekday from the first to the last date of the schedules
+        self.slotMinutes = slotMinutes
+
+    def getSlots(self) -> list: # Start time of each slot
+        return [secondsToTime(slot * self.slotMinutes * 60) for slot in range(self.minutes.shape[2])]
+
+    def getBookedSlots(self) -> range: # Slots from the first to the last one booked on any day, for leaving out the night
+        booked = np.flatnonzero(self.minutes.sum(axis=(0, 1)))
+        return range(booked[0], booked[-1] + 1) if len(booked) > 0 else range(0)
+
+    def getPercentages(self, category="location") -> tuple:
+        # Names and the percent of their time booked in each weekday and slot, of rooms or of the rooms of each zone.
+        # Double bookings are capped at a fully booked slot
+        if category == "zone":
+            names, groups = np.unique(np.array(self.zones, dtype=object), return_inverse=True)
+            minutes = np.zeros((len(names),) + self.minutes.shape[1:])
+            np.add.at(minutes, groups, self.minutes)
+            roomCnts = np.bincount(groups, minlength=len(names))
+            names = list(names)
+        else:
+            names, minutes, roomCnts = self.locations, self.minutes, np.ones(len(self.locations))
+        available = roomCnts[:, None, None] * self.dayCnts[None, :, None] * self.slotMinutes
+        percentages = np.divide(minutes * 100.0, available, out=np.zeros(minutes.shape), where=available > 0)
+        return names, np.minimum(percentages, 100.0)
+
+class QueryCache: # Results of the latest queries. The least recently used result is dropped after the limit
+    def __init__(self, limit=16):
+        self.__entries = OrderedDict() # From the least to the most recently used
+        self.__limit = limit
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key:tuple): # None when the key is not cached
+        if key not in self.__entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return self.__entries[key]
+
+    def put(self, key:tuple, entry:tuple):
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.__limit:
+            self.__entries.popitem(last=False)
+
+    def clear(self): # Counters are kept, as they count every lookup of the session
+        self.__entries.clear()
+
+class TrigramIndex: # Distinct values of text columns by their trigrams, for substring, prefix and typo tolerant search
+    def __init__(self):
+        self.entries = [] # (category, code, lowered value, number of rows) of each value
+        self.gramCnts = array("I") # Number of distinct trigrams of each entry
+        self.postings = {} # Entry ids of each trigram
+
+    def add(self, category:str, code:int, value:str, rowCnt:int):
+        entryId = len(self.entries)
+        lowered = value.lower()
+        grams = toTrigrams(lowered)
+        self.entries.append((category, code, lowered, rowCnt))
+        self.gramCnts.append(len(grams))
+        for gram in grams:
+            self.postings.setdefault(gram, array("I")).append(entryId)
+
+    def search(self, text:str, minSimilarity=0.5) -> list:
+        # Matching entries as (score, entry id). Substrings score 4 for the whole value, 3 for its start,
+        # 2.5 for the start of a word and 2 elsewhere. Other values score the share of the trigrams of the text
+        # they have, so a value with a typo still matches
+        text = " ".join(text.lower().split())
+        if len(text) == 0:
+            return []
+        grams = toTrigrams(text)
+        shared = Counter(entryId for gram in grams for entryId in self.postings.get(gram, ()))
+        candidates = range(len(self.entries)) if len(text) < 3 else shared # A short text may only be inside a trigram
+        result = []
+        for entryId in candidates:
+            lowered = self.entries[entryId][2]
+            if lowered == text:
+                score = 4
+            elif lowered.startswith(text):
+                score = 3
+            elif " " + text in lowered:
+                score = 2.5
+            elif text in lowered:
+                score = 2
+            elif shared[entryId] / len(grams) >= minSimilarity:
+                score = shared[entryId] / len(grams)
+            else:
+                continue
+            result.append((score, entryId))
+        return result
+
+def toTrigrams(text:str) -> set: # Each word is padded, so the start and end of a word have trigrams of their own
+    grams = set()
+    for word in text.split():
+        word = "  " + word + " "
+        grams.update(word[index:index + 3] for index in range(len(word) - 2))
+    return grams
+
+def findOverlaps(intervals) -> list:
+    # Pairs of row ids of the intervals that share time, as (earlier row id, row id). Intervals are (group, start, end,
+    # row id, session) sorted by group then start. A sweep line keeps the intervals still running in a heap by end,
+    # so each interval is only checked against the ones it overlaps - O(n log n + k). Intervals of the same session
+    # are one booking shared by several rows, so they are not paired
+    overlaps = []
+    running = [] # (end, row id, session) of the intervals of the group that have not ended
+    currentGroup = None
+    for group, start, end, rowId, session in intervals:
+        if group != currentGroup:
+            running = []
+            currentGroup = group
+        while running and running[0][0] <= start:
+            heapq.heappop(running)
+        for _, otherRowId, otherSession in running:
+            if otherSession != session:
+                overlaps.append((otherRowId, rowId))
+        heapq.heappush(running, (end, rowId, session))
+    return overlaps
+
+def buildOccupancyCube(locations:list, zones:list, locationCodes, weekdays, starts, ends, firstDate, lastDate, weights=None, slotMinutes=60) -> OccupancyCube:
+    # Cube of the schedules given as arrays of room codes, weekdays from Monday as 0 and start and end minutes, each
+    # optionally counted weights times, from the first to the last date ordinal. Each schedule adds one at its start
+    # minute and takes one away at its end minute of its room and weekday, so a cumulative sum gives the bookings
+    # running at each minute - one vectorized pass whatever the number of schedules, with no loop over the slots
+    if slotMinutes <= 0 or 1440 % slotMinutes != 0:
+        raise ValueError(f"Slot minutes must divide a day of 1440 minutes: {slotMinutes}")
+    cells = (np.asarray(locationCodes, dtype=np.int64) * 7 + np.asarray(weekdays, dtype=np.int64)) * 1441
+    size = len(locations) * 7 * 1441
+    changes = (np.bincount(cells + np.asarray(starts, dtype=np.int64), weights, minlength=size)
+               - np.bincount(cells + np.asarray(ends, dtype=np.int64), weights, minlength=size))
+    running = np.cumsum(changes.reshape(len(locations), 7, 1441), axis=2)[:, :, :1440]
+    minutes = running.reshape(len(locations), 7, 1440 // slotMinutes, slotMinutes).sum(axis=3)
+
+    dayCnts = np.zeros(7, dtype=np.int64)
+    if firstDate is not None:
+        dayCnts = np.bincount((np.arange(firstDate, lastDate + 1) - 1) % 7, minlength=7) # Ordinal 1 is a Monday
+    return OccupancyCube(locations, zones, minutes, dayCnts, slotMinutes)
+
+def findFreeWindows(busyLists:list, start:int, end:int, minLength:int) -> list:
+    # Windows of at least minLength from start to end that are in none of the busy lists, as (start, end). Each list
+    # is sorted by start, and heapq.merge walks them as one sorted list - O(n log k) for k lists - so the gaps
+    # between the busy times found so far are the common free windows
+    windows = []
+    freeFrom = start
+    minLength = max(minLength, 1) # Empty gaps between touching busy times are not windows
+    for busyStart, busyEnd in heapq.merge(*busyLists):
+        if busyStart >= end:
+            break
+        if busyStart - freeFrom >= minLength:
+            windows.append((freeFrom, busyStart))
+        freeFrom = max(freeFrom, busyEnd)
+    if end - freeFrom >= minLength:
+        windows.append((freeFrom, end))
+    return windows
+
+def getClosedTimes(startDate:datetime.date, endDate:datetime.date, openTime:datetime.time, closeTime:datetime.time) -> list:
+    # Times outside the open hours of each date, in seconds, as a busy list shared by every participant
+    closedTimes = []
+    for ordinal in range(startDate.toordinal(), endDate.toordinal() + 1):
+        dayStart = ordinal * 86400
+        closedTimes += [(dayStart, dayStart + timeToSeconds(openTime)), (dayStart + timeToSeconds(closeTime), dayStart + 86400)]
+    return closedTimes
+
+def toFreeSlots(windows:list) -> list: # Windows in seconds as (date, start time, end time)
+    return [(datetime.date.fromordinal(start // 86400), secondsToTime(start % 86400), secondsToTime(end % 86400)) for start, end in windows]
+
+def timeToSeconds(value:datetime.time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+def secondsToTime(seconds:int) -> datetime.time:
+    return datetime.time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+def rankFreeRooms(rooms:list, dayStart:int, minSize=None) -> list:
+    # Rooms as (location, zone, largest class, free from, free until) in seconds, ranked by fit: the fewest spare seats,
+    # then the shortest free time around the window. Free times are cut to the date, and are None at its start or end
+    ranked = []
+    for location, zone, capacity, freeFrom, freeUntil in rooms:
+        freeFrom = freeFrom if freeFrom is not None and freeFrom > dayStart else None
+        freeUntil = freeUntil if freeUntil is not None and freeUntil < dayStart + 86400 else None
+        gap = (freeUntil if freeUntil is not None else dayStart + 86400) - (freeFrom if freeFrom is not None else dayStart)
+        ranked.append((capacity - (minSize or 0), gap, location, zone, capacity,
+                       secondsToTime(freeFrom - dayStart) if freeFrom is not None else None,
+                       secondsToTime(freeUntil - dayStart) if freeUntil is not None else None))
+    ranked.sort()
+    return [room[2:] for room in ranked]
+
+def durationToMinutes(duration:str) -> int: # Durations are stored as "H:MM" without leading zeros, so they are compared in minutes
+    hours, minutes = duration.split(":")
+    return int(hours or 0) * 60 + int(minutes)
+
+def weeklyHours(minutes:int, firstDate:datetime.date, lastDate:datetime.date) -> float: # Hours per week from the first to the last date
+    return minutes / 60 / ((lastDate - firstDate).days // 7 + 1)
+
+BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)] # Set bits of each byte
+NONZERO_BYTES = re.compile(rb"[^\x00]+") # Runs of bytes with at least one row
+
+def toBitmap(rowIds) -> int: # Bitmap with the bit of each row id set
+    if len(rowIds) == 0:
+        return 0
+    bits = bytearray((max(rowIds) >> 3) + 1)
+    for rowId in rowIds:
+        bits[rowId >> 3] |= 1 << (rowId & 7)
+    return int.from_bytes(bits, "little")
+
+def fromBitmap(bitmap:int) -> list: # Row ids of the set bits in ascending order. Empty bytes are skipped in C
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, "little")
+    rowIds = []
+    for match in NONZERO_BYTES.finditer(data):
+        for index in range(match.start(), match.end()):
+            base = index << 3
+            rowIds.extend([base + bit for bit in BYTE_BITS[data[index]]])
+    return rowIds
+
+class Stack:
+    def __init__(self):
+        self.head = None
+    
+    def __iter__(self):
+        currentNode = self.head
+        while currentNode:
+            yield currentNode
+            currentNode = currentNode.next
+
+    def __contains__(self, node):
+        currentNode = self.head
+        while currentNode:
+            if currentNode.data == node:
+                return True
+            currentNode = currentNode.next
+
+    def push(self, data):
+        newNode = Node(data)
+        if self.head == None:
+            self.head = newNode
+        
+        else:
+            newNode.next = self.head
+            self.head = newNode
+
+    def isEmpty(self) -> bool:
+        if self.head == None:
+            return 1
+        else:
+            return 0
+
+    def pop(self) -> Node:
+        if self.isEmpty():
+            return None
+        else:
+            filteredLL = self.head
+            self.head = self.head.next
+            filteredLL.next = None
+            return filteredLL.data
+
+class ColumnDictionary: # Stores each distinct value of a column once and gives it a small integer code
+    def __init__(self):
+        self.values = [] # Value of each code
+        self.codes = {} # Code of each value
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value) -> int: # New values are given the next code
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code:int):
+        return self.values[code]
+
+    def intern(self, value): # Returns the shared object of the value
+        return self.values[self.encode(value)]
+
+
+
+# ===== Schedule Class =====
+class Schedule():
+    # Slots are used instead of a dictionary for each schedule, as there are a lot of schedules
+    __slots__ = ("__module", "__moduleCode", "__cohort", "__course", "__fullPart", "__session", "__activityDate", "__scheduledDay",
+                 "__startTime", "__endTime", "__duration", "__location", "__size", "__lecturer", "__zone")
+
+    def __init__(self, module:str, moduleCode:str, cohort:str, course:str, fullPart:str,
+                session:str, activityDate:str, scheduledDay:str,startTime:str,endTime:str,
+                duration:str,location:str,size:str,lecturer:str,zone:str):
+        self.__module = module
+        self.__moduleCode = moduleCode
+        self.__cohort = cohort
+        self.__course = course
+        self.__fullPart = fullPart
+        self.__session = session
+        self.__activityDate = activityDate
+        self.__scheduledDay = scheduledDay
+        self.__startTime = startTime
+        self.__endTime = endTime
+        self.__duration = duration
+        self.__location = location
+        self.__size = size
+        self.__lecturer = lecturer
+        self.__zone = zone
+    
+    def get(self, key): # Used for specific value
+        value = {
+            "module" : self.__module, "moduleCode" : self.__moduleCode, "cohort" : self.__cohort,
+            "course" : self.__course, "fullPart" : self.__fullPart, "session" : self.__session,
+            "activityDate" : self.__activityDate, "scheduledDay" : self.__scheduledDay,
+            "startTime" : self.__startTime, "endTime" : self.__endTime, "duration" : self.__duration,
+            "location" : self.__location, "size" : self.__size, "lecturer" : self.__lecturer, "zone" : self.__zone
+        }[key]
+        
+        return value
+    
+    def getAll(self) -> list: # Used for all values
+        li = [
+            self.__module, self.__moduleCode, self.__cohort, self.__course, self.__fullPart,
+            self.__session, self.__activityDate, self.__scheduledDay, self.__startTime,
+            self.__endTime, self.__duration, self.__location, self.__size, self.__lecturer, self.__zone
+        ]
+
+        return  li
+
+
+
+# ===== Schedule Store Class =====
+class MappedScheduleFile:
+    # CSV file mapped into memory, with the byte offset of each schedule row. Fields are only parsed when
+    # a column or a row is needed. Rows are expected on a single line, as in the exported timetables
+    rowStart = re.compile(rb'\n(?=[^,\r\n])(?!"",)') # Line break before a row with a first field, the rows read by parseFile
+
+    def __init__(self, fileDirectory:str):
+        self.__encoding = locale.getpreferredencoding(False) # Same encoding as reading the file in text mode
+        self.__map = None
+        self.__offsets = array("Q")
+        with open(fileDirectory, "rb") as file:
+            if os.fstat(file.fileno()).st_size > 0:
+                self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__map is not None:
+            self.__indexRows()
+
+    def __len__(self):
+        return len(self.__offsets)
+
+    def getRow(self, index:int) -> list:
+        return next(csv.reader([self.__getLine(self.__offsets[index])], delimiter=","))
+
+    def close(self): # The offsets no longer match a file changed since it was mapped, so it is not read again
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+    def getRows(self):
+        # Every schedule row in order, parsed into its fields
+        return csv.reader(map(self.__getLine, self.__offsets), delimiter=",")
+
+    def __getLine(self, offset:int) -> str:
+        end = self.__map.find(b"\n", offset)
+        return self.__map[offset:end if end != -1 else len(self.__map)].decode(self.__encoding)
+
+    def __indexRows(self):
+        if self.rowStart.match(b"\n" + self.__map[:3]):
+            self.__offsets.append(0)
+        self.__offsets.extend(match.end() for match in self.rowStart.finditer(self.__map))
+
+
+
+class ScheduleStore:
+    # Column oriented storage of the schedules. Each field is an array of value codes addressed by row id
+    categories = ["module", "moduleCode", "cohort", "course", "fullPart", "session", "activityDate", "scheduledDay",
+                  "startTime", "endTime", "duration", "location", "size", "lecturer", "zone"]
+    rankKeys = {"duration": durationToMinutes} # Sort key of the categories whose values do not sort as stored
+
+    def __init__(self, dictionaries:list):
+        self.__dictionaries = dict(zip(self.categories, dictionaries)) # Dictionaries can be shared by several stores
+        self.__columns = {category: array("I") for category in self.categories}
+        self.__rowCnt = 0
+        self.__removedRows = set() # Removed rows keep their row id, so the other row ids do not change
+        self.__ranks = {} # Sorting order of the codes of each column
+        self.__mappedFiles = [] # Files whose rows are not decoded yet, with the row id of their first row, their number of rows and their decoder
+        self.__fileStarts = [] # Row id of the first row of each mapped file, for finding the file of a row
+        self.__loadedRows = dict.fromkeys(self.categories, 0) # Rows already decoded into each column
+        self.__indexes = {} # Bitmap index of each category, made when a filter first needs it and kept up to date after
+        self.__sortedIndexes = {} # Sorted index of each category, made again after the rows change
+        self.__intervalIndex = None
+        self.__occupancyIndex = None # Busy times of each location, made again after the rows change
+        self.__rowBitmap = None # Bitmap of every row that is not removed
+        self.__queryCache = QueryCache() # Results of recent queries, emptied when the rows change
+        self.__textIndexes = {} # Trigram index of each group of text categories, made again after the rows change
+        self.__rowRanks = {} # Rank table of each category, and the rank of the value of each row
+        self.__sortPermutations = {} # Every row id in the order of each list of categories, made again after the rows change
+
+    def __len__(self):
+        return self.__rowCnt - len(self.__removedRows)
+
+    def appendColumns(self, columns:list) -> range:
+        # Adds the codes of each column and returns the row ids of the added rows
+        self.loadColumns(self.categories) # Rows of mapped files come first in every column
+        start = self.__rowCnt
+        for category, codes in zip(self.categories, columns):
+            self.__columns[category].extend(codes)
+        self.__rowCnt = len(self.__columns["module"])
+        self.__loadedRows = dict.fromkeys(self.categories, self.__rowCnt)
+        self.__addToIndexes(range(start, self.__rowCnt))
+
+        return range(start, self.__rowCnt)
+
+    def appendFile(self, mappedFile:MappedScheduleFile, decoder) -> range:
+        # Adds the rows of a mapped file without decoding them. Each column is decoded by the decoder when it is first used
+        start = self.__rowCnt
+        self.__rowCnt += len(mappedFile)
+        self.__mappedFiles.append((start, len(mappedFile), mappedFile, decoder))
+        self.__fileStarts.append(start)
+        self.__addToIndexes(range(start, self.__rowCnt)) # Only the columns with an index are decoded
+
+        return range(start, self.__rowCnt)
+
+    def loadColumns(self, categories:list):
+        # Decodes the mapped rows of these columns, reading each file once for all of them
+        if all(self.__loadedRows[category] == self.__rowCnt for category in categories):
+            return
+        for start, rowCnt, mappedFile, decoder in self.__mappedFiles:
+            pending = [category for category in categories if self.__loadedRows[category] == start]
+            if not pending:
+                continue
+            if mappedFile is None:
+                # Rows of a released file are removed, so they only keep the rows after them in place
+                columns = {category: array("I", [0]) * rowCnt for category in pending}
+            else:
+                # Columns decoded from the same fields come back together and are kept as well
+                columns = decoder.decodeColumns(mappedFile, pending)
+            for category, codes in columns.items():
+                if self.__loadedRows[category] == start:
+                    self.__columns[category].extend(codes)
+                    self.__loadedRows[category] += rowCnt
+
+    def releaseFile(self, mappedFile:MappedScheduleFile):
+        # Used before the rows of a changed or deleted mapped file are removed. The file may no longer match its
+        # offsets, so it is closed and never decoded, and its columns not decoded yet are filled with code 0
+        for index, (start, rowCnt, otherFile, _) in enumerate(self.__mappedFiles):
+            if otherFile is mappedFile:
+                self.__mappedFiles[index] = (start, rowCnt, None, None)
+                mappedFile.close()
+
+    def removeRows(self, rowIds):
+        rowIds = [rowId for rowId in rowIds if rowId not in self.__removedRows]
+        self.__removedRows.update(rowIds)
+        for category, bitmapIndex in self.__indexes.items():
+            # Removed rows are grouped by code, so each code is rebuilt only once
+            column = self.__columns[category]
+            removedByCode = {}
+            for rowId in rowIds:
+                removedByCode.setdefault(column[rowId], set()).add(rowId)
+            for code, rowSet in removedByCode.items():
+                bitmapIndex.removeAll(code, rowSet)
+        if len(rowIds) > 0:
+            self.__sortedIndexes = {}
+            self.__intervalIndex = None
+            self.__occupancyIndex = None
+            self.__rowBitmap = None
+            self.__queryCache.clear()
+            self.__textIndexes = {}
+            self.__rowRanks = {}
+            self.__sortPermutations = {}
+
+    def getRowBitmap(self) -> int:
+        if self.__rowBitmap is None:
+            self.__rowBitmap = (1 << self.__rowCnt) - 1 if not self.__removedRows else toBitmap(self.getRowIds())
+        return self.__rowBitmap
+
+    def getTextIndex(self, categories:list) -> TrigramIndex:
+        # Every value with rows is indexed with its number of rows. Rows are counted from the bitmap index
+        # when it is built, otherwise the column is counted once
+        key = tuple(categories)
+        if key not in self.__textIndexes:
+            textIndex = TrigramIndex()
+            for category in categories:
+                if category in self.__indexes:
+                    rowCnts = {code: len(rowIds) for code, rowIds in self.__indexes[category].postings.items()}
+                elif not self.__removedRows:
+                    rowCnts = Counter(self.getColumn(category))
+                else:
+                    rowCnts = Counter(map(self.getColumn(category).__getitem__, self.getRowIds()))
+                values = self.__dictionaries[category].values
+                for code, rowCnt in rowCnts.items():
+                    textIndex.add(category, code, values[code], rowCnt)
+            self.__textIndexes[key] = textIndex
+        return self.__textIndexes[key]
+
+    def getQueryCache(self) -> QueryCache:
+        # Kept with the indexes, so a Reset that keeps this store also keeps the cached results
+        return self.__queryCache
+
+    def isIndexed(self, category:str) -> bool:
+        return category in self.__indexes
+
+    def getIndex(self, category:str) -> BitmapIndex:
+        # Built the first time the category is filtered, then reused by every DisplayHandler of this store
+        if category not in self.__indexes:
+            bitmapIndex = BitmapIndex()
+            bitmapIndex.build(self.getColumn(category), self.getRowIds())
+            self.__indexes[category] = bitmapIndex
+        return self.__indexes[category]
+
+    def getSortedIndex(self, category:str) -> SortedIndex:
+        # Values are ordered by the same key as their ranks, so ranges agree with sorting
+        if category not in self.__sortedIndexes:
+            self.__sortedIndexes[category] = SortedIndex(self.__dictionaries[category].values, self.getIndex(category).postings, self.rankKeys.get(category))
+        return self.__sortedIndexes[category]
+
+    def getIntervalIndex(self) -> IntervalIndex:
+        # Each schedule is the interval from its start to its end in seconds. Seconds are found once for each code
+        if self.__intervalIndex is None:
+            dateSeconds = [value.toordinal() * 86400 for value in self.__dictionaries["activityDate"].values]
+            startSeconds = [timeToSeconds(value) for value in self.__dictionaries["startTime"].values]
+            endSeconds = [timeToSeconds(value) for value in self.__dictionaries["endTime"].values]
+            dateColumn = self.getColumn("activityDate")
+            startColumn = self.getColumn("startTime")
+            endColumn = self.getColumn("endTime")
+            rowIds = self.getRowIds()
+            starts = [dateSeconds[dateColumn[rowId]] + startSeconds[startColumn[rowId]] for rowId in rowIds]
+            ends = [dateSeconds[dateColumn[rowId]] + endSeconds[endColumn[rowId]] for rowId in rowIds]
+            self.__intervalIndex = IntervalIndex(starts, ends, rowIds)
+        return self.__intervalIndex
+
+    def getOccupancyIndex(self) -> OccupancyIndex:
+        if self.__occupancyIndex is None:
+            dateSeconds = [value.toordinal() * 86400 for value in self.__dictionaries["activityDate"].values]
+            startSeconds = [timeToSeconds(value) for value in self.__dictionaries["startTime"].values]
+            endSeconds = [timeToSeconds(value) for value in self.__dictionaries["endTime"].values]
+            sizes = self.__dictionaries["size"].values
+            dateColumn, startColumn, endColumn = self.getColumn("activityDate"), self.getColumn("startTime"), self.getColumn("endTime")
+            locationColumn, sizeColumn, zoneColumn = self.getColumn("location"), self.getColumn("size"), self.getColumn("zone")
+            rowIds = self.getRowIds()
+            self.__occupancyIndex = OccupancyIndex([locationColumn[rowId] for rowId in rowIds],
+                                                   [dateSeconds[dateColumn[rowId]] + startSeconds[startColumn[rowId]] for rowId in rowIds],
+                                                   [dateSeconds[dateColumn[rowId]] + endSeconds[endColumn[rowId]] for rowId in rowIds],
+                                                   [sizes[sizeColumn[rowId]] for rowId in rowIds], [zoneColumn[rowId] for rowId in rowIds])
+        return self.__occupancyIndex
+
+    def __addToIndexes(self, rowIds:range):
+        for category, bitmapIndex in self.__indexes.items():
+            column = self.getColumn(category)
+            for rowId in rowIds:
+                bitmapIndex.add(column[rowId], rowId)
+        if len(rowIds) > 0:
+            self.__sortedIndexes = {}
+            self.__intervalIndex = None
+            self.__occupancyIndex = None
+            self.__rowBitmap = None
+            self.__queryCache.clear()
+            self.__textIndexes = {}
+            self.__rowRanks = {}
+            self.__sortPermutations = {}
+
+    def getRowIds(self) -> list:
+        if not self.__removedRows:
+            return list(range(self.__rowCnt))
+        return [rowId for rowId in range(self.__rowCnt) if rowId not in self.__removedRows]
+
+    def getColumn(self, category:str) -> array:
+        self.loadColumns([category])
+        return self.__columns[category]
+
+    def getDictionary(self, category:str) -> ColumnDictionary:
+        self.loadColumns([category]) # Values of mapped rows are only in the dictionary once the column is decoded
+        return self.__dictionaries[category]
+
+    def getRank(self, category:str) -> list:
+        # Rank of each code when the values are sorted, so comparing codes does not need the values.
+        # Values with the same sort key, such as "1:00" and "01:00", share a rank
+        self.loadColumns([category])
+        values = self.__dictionaries[category].values
+        if category not in self.__ranks or len(self.__ranks[category]) != len(values):
+            sortKey = self.rankKeys.get(category)
+            keys = [sortKey(value) for value in values] if sortKey is not None else values
+            rank = [0] * len(values)
+            position, previousKey = -1, None
+            for code in sorted(range(len(values)), key=keys.__getitem__):
+                if position < 0 or keys[code] != previousKey:
+                    position, previousKey = position + 1, keys[code]
+                rank[code] = position
+            self.__ranks[category] = rank
+
+        return self.__ranks[category]
+
+    def getRowRanks(self, category:str) -> array:
+        # Rank of the value of each row, so rows are sorted with the array as the key instead of a Python function
+        rank = self.getRank(category)
+        if category not in self.__rowRanks or self.__rowRanks[category][0] is not rank: # The rank table changed with the dictionary
+            rowRank = rank if len(rank) > 0 else [0] # Removed rows of released files have code 0 even in an empty column
+            self.__rowRanks[category] = (rank, array("I", map(rowRank.__getitem__, self.getColumn(category))))
+        return self.__rowRanks[category][1]
+
+    def getSortPermutation(self, categories:tuple) -> array:
+        # Every row id sorted by the first category, then by the next ones for equal values, then by row id.
+        # Sorting is stable, so the rows are sorted by the last category first
+        if categories not in self.__sortPermutations:
+            rowIds = self.getRowIds()
+            for category in reversed(categories):
+                rowIds.sort(key=self.getRowRanks(category).__getitem__)
+            self.__sortPermutations[categories] = array("I", rowIds)
+        return self.__sortPermutations[categories]
+
+    def get(self, rowId:int, category:str): # Used for specific value
+        if self.__loadedRows[category] <= rowId:
+            self.loadColumns([category])
+        return self.__dictionaries[category].values[self.__columns[category][rowId]]
+
+    def getAll(self, rowId:int) -> list: # Used for all values
+        if self.__mappedFiles and min(self.__loadedRows.values()) <= rowId:
+            # Only this row is decoded when some of its columns are still in the mapped file
+            index = bisect.bisect_right(self.__fileStarts, rowId) - 1
+            start, _, mappedFile, decoder = self.__mappedFiles[index]
+            return decoder.decodeRow(mappedFile.getRow(rowId - start))
+        return [self.__dictionaries[category].values[self.__columns[category][rowId]] for category in self.categories]
+
+    def getSchedule(self, rowId:int) -> Schedule:
+        return Schedule(*self.getAll(rowId))
+
+
+
+class ScheduleArchive:
+    # Schedules of every added file in a SQLite file, for archives too large to keep in memory. Each category is a
+    # typed column with its own index, so filters and sorts run in SQLite, and a reopened archive is queried without
+    # reading the CSV files again. Dates and times are stored as ISO text, which sorts in their order
+    categories = ScheduleStore.categories
+    columnTypes = ["TEXT", "TEXT", "TEXT", "TEXT", "TEXT", "TEXT", "TEXT", "INTEGER", "TEXT", "TEXT", "TEXT", "TEXT", "INTEGER", "TEXT", "TEXT"]
+    indexedColumns = categories + ["fileId", "durationMinutes", "startAt", "endAt"]
+
+    def __init__(self, archivePath:str):
+        self.__connection = sqlite3.connect(archivePath, check_same_thread=False) # Opened on the loading thread and used by the GUI after
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        columns = ", ".join(f"{category} {columnType}" for category, columnType in zip(self.categories, self.columnTypes))
+        with self.__connection:
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS files (fileId INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER, modified INTEGER, contentHash TEXT)")
+            # Duration in minutes is kept for sorting, and the start and end in seconds for the interval filters
+            self.__connection.execute(f"CREATE TABLE IF NOT EXISTS schedules (rowId INTEGER PRIMARY KEY, fileId INTEGER, {columns}, "
+                                      "durationMinutes INTEGER, startAt INTEGER, endAt INTEGER)")
+        self.__rowCnt = None # Counted when first asked for, and again after files are added
+        self.__longestSpan = None # Seconds of the longest schedule, which bounds the starts an interval filter looks at
+
+    def __len__(self):
+        if self.__rowCnt is None:
+            self.__rowCnt = self.execute("SELECT COUNT(*) FROM schedules").fetchone()[0]
+        return self.__rowCnt
+
+    def execute(self, sql:str, params=()) -> sqlite3.Cursor:
+        return self.__connection.execute(sql, params)
+
+    def write(self, sql:str, params=()) -> sqlite3.Cursor: # Runs in a transaction of its own
+        with self.__connection:
+            return self.__connection.execute(sql, params)
+
+    def addFiles(self, filesList:list, progressQueue=None, cancelEvent=None) -> int:
+        # Files are parsed and written one at a time, each in a transaction of its own, so memory holds one file at most
+        # and a cancelled load keeps the files written before it. Unchanged files are skipped and changed files replace
+        # their rows. Files of earlier loads stay in the archive. Returns the number of files written
+        cacheHandler = CacheHandler()
+        writtenCnt = 0
+        for index, fileDirectory in enumerate(filesList):
+            checkCancelled(cancelEvent)
+            fingerprint = cacheHandler.getFingerprint(fileDirectory)
+            fileRow = self.execute("SELECT fileId, contentHash FROM files WHERE path = ?", (fingerprint[0],)).fetchone()
+            if fileRow is not None and fileRow[1] == fingerprint[3]:
+                rowCnt = self.execute("SELECT COUNT(*) FROM schedules WHERE fileId = ?", (fileRow[0],)).fetchone()[0]
+            else:
+                parsedFile = cacheHandler.load(fingerprint) # Parsed files of the disk cache are reused
+                if parsedFile is None:
+                    parsedFile = parseScheduleFile(fileDirectory, cancelEvent=cancelEvent)
+                rowCnt = self.__writeFile(fingerprint, fileRow[0] if fileRow is not None else None, parsedFile)
+                writtenCnt += 1
+
+            if progressQueue is not None:
+                progressQueue.put(("file", os.path.basename(fileDirectory), rowCnt, index+1, len(filesList)))
+
+        if writtenCnt > 0:
+            # Indexes are made after the first files are written, as building an index once is faster than
+            # updating it for each row. The statistics help SQLite choose between the indexes of a query
+            with self.__connection:
+                for column in self.indexedColumns:
+                    self.__connection.execute(f"CREATE INDEX IF NOT EXISTS schedules_{column} ON schedules ({column})")
+            self.__connection.execute("ANALYZE")
+            self.__rowCnt = None
+            self.__longestSpan = None
+        return writtenCnt
+
+    def getLongestSpan(self) -> int:
+        if self.__longestSpan is None:
+            self.__longestSpan = self.execute("SELECT COALESCE(MAX(endAt - startAt), 0) FROM schedules").fetchone()[0]
+        return self.__longestSpan
+
+    def getFiles(self) -> list: # Paths of every file in the archive
+        return [row[0] for row in self.execute("SELECT path FROM files ORDER BY fileId")]
+
+    def toColumnValue(self, value): # Value as stored in the archive
+        return value.isoformat() if isinstance(value, (datetime.date, datetime.time)) else value
+
+    def toValues(self, row) -> list: # Values of a row of the schedules table, as stored in the schedule store
+        values = list(row)
+        values[6] = datetime.date.fromisoformat(values[6])
+        values[8] = datetime.time.fromisoformat(values[8])
+        values[9] = datetime.time.fromisoformat(values[9])
+        return values
+
+    def fromColumnValue(self, category:str, value):
+        if category == "activityDate":
+            return datetime.date.fromisoformat(value)
+        elif category == "startTime" or category == "endTime":
+            return datetime.time.fromisoformat(value)
+        return value
+
+    def getAll(self, rowId:int) -> list: # Used for all values
+        row = self.execute(f"SELECT {', '.join(self.categories)} FROM schedules WHERE rowId = ?", (rowId,)).fetchone()
+        return self.toValues(row)
+
+    def getSchedule(self, rowId:int) -> Schedule:
+        return Schedule(*self.getAll(rowId))
+
+    def close(self):
+        self.__connection.close()
+
+    def __writeFile(self, fingerprint:tuple, fileId, parsedFile:list) -> int:
+        # Values are changed into their stored form once for each distinct value, then each row takes them by code
+        values, columns = parsedFile
+        storedValues = [[self.toColumnValue(value) for value in categoryValues] for categoryValues in values]
+        durationMinutes = [durationToMinutes(value) for value in values[10]]
+        dateSeconds = [value.toordinal() * 86400 for value in values[6]]
+        startSeconds = [timeToSeconds(value) for value in values[8]]
+        endSeconds = [timeToSeconds(value) for value in values[9]]
+        rowCnt = len(columns[0])
+        with self.__connection:
+            if fileId is None:
+                fileId = self.__connection.execute("INSERT INTO files (path, size, modified, contentHash) VALUES (?, ?, ?, ?)", fingerprint).lastrowid
+            else:
+                self.__connection.execute("DELETE FROM schedules WHERE fileId = ?", (fileId,))
+                self.__connection.execute("UPDATE files SET size = ?, modified = ?, contentHash = ? WHERE fileId = ?", (*fingerprint[1:], fileId))
+            rows = zip(repeat(fileId, rowCnt), *[map(categoryValues.__getitem__, column) for categoryValues, column in zip(storedValues, columns)],
+                       map(durationMinutes.__getitem__, columns[10]),
+                       map(add, map(dateSeconds.__getitem__, columns[6]), map(startSeconds.__getitem__, columns[8])),
+                       map(add, map(dateSeconds.__getitem__, columns[6]), map(endSeconds.__getitem__, columns[9])))
+            self.__connection.executemany(f"INSERT INTO schedules (fileId, {', '.join(self.categories)}, durationMinutes, startAt, endAt) "
+                                          f"VALUES ({', '.join('?' * (len(self.categories) + 4))})", rows)
+        return rowCnt
+
+
+
+# ===== Handler Classes =====
+class LoadCancelled(Exception): # Raised when the user cancels loading the schedules
+    pass
+
+def checkCancelled(cancelEvent):
+    # Stops a background load at the next check once Cancel is pressed
+    if cancelEvent is not None and cancelEvent.is_set():
+        raise LoadCancelled()
+
+class DataHandler:
+    def __init__(self, cacheDirectory=None):
+        self.__dictionaries = [ColumnDictionary() for _ in range(15)] # Values shared by the schedules of every file
+        self.__schedules = ScheduleStore(self.__dictionaries)
+        self.__filesPathList = []
+        self.__cacheHandler = CacheHandler(cacheDirectory)
+        self.__loadedFiles = {} # Columns of each loaded file with its fingerprint, reused while the file is unchanged
+        self.__fileRows = {} # Row ids of each loaded file in the schedule store
+        self.__rangeList = [] # For initializing hash table. Contains below values in int
+        self.__isLazy = False # Files are mapped and their columns decoded when first used
+        self.__isRangeStale = False # Ranges of mapped files are found when they are first asked for
+
+        # Raw fields of each group of columns, the columns decoded from them and the conversion
+        self.__fieldGroups = [(itemgetter(1, 2), (0, 1, 2, 3, 4, 5), lambda fields: self.__extractData(*fields)),
+                              (itemgetter(3), (6, 7), lambda strVal: [self.__dateInput(strVal), self.__dateInput(strVal).isoweekday()]),
+                              (itemgetter(5), (8,), lambda strVal: [self.__timeInput(strVal)]), (itemgetter(6), (9,), lambda strVal: [self.__timeInput(strVal)]),
+                              (itemgetter(7), (10,), lambda strVal: [strVal.lstrip("0")]), (itemgetter(8), (11,), lambda strVal: [strVal]),
+                              (itemgetter(9), (12,), lambda strVal: [int(strVal)]), (itemgetter(10), (13,), lambda strVal: [strVal]), (itemgetter(11), (14,), lambda strVal: [strVal])]
+
+        # To hand over the range number to DisplayHandler for intialization of Hash Table
+        self.__moduleRange = set()
+        self.__moduleCodeRange = set()
+        self.__cohortRange = set()
+        self.__courseRange = set()
+        self.__fullPartRange = set()
+        self.__sessionRange = set()
+        self.__activityDateRange = set()
+        self.__scheduledDayRange = set()
+        self.__startTimeRange = set()
+        self.__endTimeRange = set()
+        self.__durationRange = set()
+        self.__locationRange = set()
+        self.__sizeRange = set()
+        self.__lecturerRange = set()
+        self.__zoneRange = set()
+
+    def setSchedules(self, isParallel=False, progressQueue=None, cancelEvent=None, isCached=True, isLazy=False):
+        # Schedules are stored in a new schedule store, so a cancelled load keeps the previous schedules.
+        # In lazy mode the files are only mapped, and the columns are decoded when they are first used
+        if isLazy:
+            self.__storeMappedFiles(ScheduleStore(self.__dictionaries), {}, progressQueue, cancelEvent)
+        else:
+            self.__storeFiles(ScheduleStore(self.__dictionaries), {}, isParallel, progressQueue, cancelEvent, isCached)
+        self.__isLazy = isLazy
+
+    def reloadSchedules(self, isParallel=False, progressQueue=None, cancelEvent=None) -> list:
+        # Only the files added or changed since the last load are read. Returns the row ids added and removed
+        if self.__isLazy:
+            return self.__storeMappedFiles(self.__schedules, self.__fileRows, progressQueue, cancelEvent)
+        return self.__storeFiles(self.__schedules, self.__fileRows, isParallel, progressQueue, cancelEvent, True)
+
+    def parseFile(self, fileDirectory:str, cancelEvent=None) -> list:
+        # Reads one CSV file into the distinct values of each column and the code of the value in each row.
+        # Each distinct raw text is converted only once, and rows only hold the codes
+        dictionaries = [ColumnDictionary() for _ in range(15)]
+        columns = [array("I") for _ in range(15)]
+        extractedCodes = {} # Codes of module, moduleCode, cohort, course, fullPart and session for each name and description
+        dateCodes = {} # Codes of activityDate and scheduledDay for each raw date
+        rawCodes = [{} for _ in range(15)] # Code for each raw text of the other columns
+        converters = [(8, 5, self.__timeInput), (9, 6, self.__timeInput), (10, 7, lambda strVal: strVal.lstrip("0")),
+                      (11, 8, str), (12, 9, int), (13, 10, str), (14, 11, str)] # Column, raw index and conversion
+
+        rowCnt = 0
+        with open(fileDirectory, "r") as csvfile:
+            csvData = csv.reader(csvfile, delimiter=",")
+            for row in csvData:
+                if row[0] == '':
+                    continue
+
+                # Extract certain values from the raw data
+                codes = extractedCodes.get((row[1], row[2]))
+                if codes is None:
+                    codes = extractedCodes[(row[1], row[2])] = [dictionaries[i].encode(value) for i, value in enumerate(self.__extractData(row[1], row[2]))]
+
+                dateCode = dateCodes.get(row[3])
+                if dateCode is None:
+                    activityDate = self.__dateInput(row[3])
+                    dateCode = dateCodes[row[3]] = [dictionaries[6].encode(activityDate), dictionaries[7].encode(activityDate.isoweekday())]
+
+                for column, code in enumerate(codes):
+                    columns[column].append(code)
+                columns[6].append(dateCode[0])
+                columns[7].append(dateCode[1])
+
+                for column, rawIndex, convert in converters:
+                    code = rawCodes[column].get(row[rawIndex])
+                    if code is None:
+                        code = rawCodes[column][row[rawIndex]] = dictionaries[column].encode(convert(row[rawIndex]))
+                    columns[column].append(code)
+
+                rowCnt += 1
+                if rowCnt % 10000 == 0:
+                    checkCancelled(cancelEvent)
+
+        return [[dictionary.values for dictionary in dictionaries], columns]
+
+    def decodeColumns(self, mappedFile:MappedScheduleFile, categories:list) -> dict:
+        # Codes of the columns of a mapped file in the shared dictionaries. Columns decoded from the same fields
+        # as a requested column are returned as well, since they cost nothing more
+        indexes = [ScheduleStore.categories.index(category) for category in categories]
+        fieldGroups = [group for group in self.__fieldGroups if any(index in group[1] for index in indexes)]
+        columns = [[array("I") for _ in columnIndexes] for _, columnIndexes, _ in fieldGroups]
+        rawCodes = [{} for _ in fieldGroups] # Codes for each raw text of each group
+        groups = list(zip(fieldGroups, columns, rawCodes))
+        for row in mappedFile.getRows():
+            for (getFields, columnIndexes, convert), groupColumns, groupCodes in groups:
+                fields = getFields(row)
+                codes = groupCodes.get(fields)
+                if codes is None:
+                    codes = groupCodes[fields] = [self.__dictionaries[index].encode(value) for index, value in zip(columnIndexes, convert(fields))]
+                for column, code in zip(groupColumns, codes):
+                    column.append(code)
+
+        return {ScheduleStore.categories[index]: column for (_, columnIndexes, _), groupColumns in zip(fieldGroups, columns)
+                for index, column in zip(columnIndexes, groupColumns)}
+
+    def decodeRow(self, row:list) -> list:
+        # Values of every column of one raw row, in the order of the categories
+        return [value for getFields, _, convert in self.__fieldGroups for value in convert(getFields(row))]
+
+    def getSchedules(self) -> ScheduleStore:
+        return self.__schedules
+    
+    def getRangeList(self) -> list:
+        self.__updateStaleRange()
+        return self.__rangeList
+
+    def setFilesPathList(self, filesList:list):
+        self.__filesPathList = filesList
+
+    def getFilesPathList(self) -> list:
+        return self.__filesPathList
+
+    def setRange(self, rowIds:list):
+        # Used externally for finding the range of each values
+        self.__isRangeStale = False
+        self.__resetRange()
+        rangeSets = [self.__moduleRange, self.__moduleCodeRange, self.__cohortRange, self.__courseRange, self.__fullPartRange,
+                     self.__sessionRange, self.__activityDateRange, self.__scheduledDayRange, self.__startTimeRange, self.__endTimeRange,
+                     self.__durationRange, self.__locationRange, self.__sizeRange, self.__lecturerRange, self.__zoneRange]
+        for rangeSet, category in zip(rangeSets, ScheduleStore.categories):
+            # Distinct codes of the rows are found first, so each value is decoded once
+            values = self.__schedules.getDictionary(category).values
+            rangeSet.update(map(values.__getitem__, set(map(self.__schedules.getColumn(category).__getitem__, rowIds))))
+
+    def getRange(self, category) -> set: # Used for available options
+        self.__updateStaleRange()
+        value = {
+        "module": self.__moduleRange,
+        "moduleCode": self.__moduleCodeRange,
+        "cohort": self.__cohortRange,
+        "course": self.__courseRange,
+        "fullPart": self.__fullPartRange,
+        "session": self.__sessionRange,
+        "activityDate": self.__activityDateRange,
+        "scheduledDay": self.__scheduledDayRange,
+        "startTime": self.__startTimeRange,
+        "endTime": self.__endTimeRange,
+        "duration": self.__durationRange,
+        "location": self.__locationRange,
+        "size": self.__sizeRange,
+        "lecturer": self.__lecturerRange,
+        "zone": self.__zoneRange,
+        }[category]
+
+        return value
+
+    def __dateInput(self, strVal):
+        day, month, year = strVal.split("/")
+        return datetime.date(int(year),int(month),int(day))
+
+    def __timeInput(self, strVal):
+        hour, minute,second = strVal.split(":")
+        return datetime.time(int(hour),int(minute),int(second))
+
+    def __setRange(self, module:str, moduleCode:str, cohort:str, course:str, fullPart:str,
+                   session:str, activityDate:str, scheduleDay:str, startTime:str, endTime:str,
+                   duration:str, location:str, size:str, lecturer:str, zone:str):
+        # Internally used for initialization of hash table
+        self.__moduleRange.add(module)
+        self.__moduleCodeRange.add(moduleCode)
+        self.__cohortRange.add(cohort)
+        self.__courseRange.add(course)
+        self.__fullPartRange.add(fullPart)
+        self.__sessionRange.add(session)
+        self.__activityDateRange.add(activityDate)
+        self.__scheduledDayRange.add(scheduleDay)
+        self.__startTimeRange.add(startTime)
+        self.__endTimeRange.add(endTime)
+        self.__durationRange.add(duration)
+        self.__locationRange.add(location)
+        self.__sizeRange.add(size)
+        self.__lecturerRange.add(lecturer)
+        self.__zoneRange.add(zone)
+
+    def __loadFiles(self, isParallel:bool, cancelEvent, isCached:bool):
+        # Yields the columns of each file in order. Unchanged files come from memory or the disk cache,
+        # the others are parsed on a process pool when several files and cores are available
+        cacheHandler = self.__cacheHandler if isCached else None
+        fingerprints = {}
+        parsingFiles = []
+        for fileDirectory in self.__filesPathList:
+            checkCancelled(cancelEvent)
+            if isCached:
+                fingerprints[fileDirectory] = fingerprint = self.__cacheHandler.getFingerprint(fileDirectory)
+                if self.__isLoaded(fileDirectory, fingerprint) or self.__cacheHandler.isCached(fingerprint):
+                    continue
+            else:
+                fingerprints[fileDirectory] = None
+            parsingFiles.append(fileDirectory)
+
+        workerCnt = min(len(parsingFiles), os.cpu_count() or 1)
+        executor = ProcessPoolExecutor(max_workers=workerCnt) if isParallel and workerCnt > 1 else None
+        try:
+            futures = {}
+            if executor is not None:
+                for fileDirectory in parsingFiles:
+                    futures[fileDirectory] = executor.submit(parseScheduleFile, fileDirectory, fingerprints[fileDirectory], cacheHandler)
+
+            for fileDirectory in self.__filesPathList:
+                fingerprint = fingerprints[fileDirectory]
+                if isCached and self.__isLoaded(fileDirectory, fingerprint):
+                    _, fileColumns, ranges = self.__loadedFiles[fileDirectory]
+                    yield fileDirectory, fingerprint, fileColumns, ranges
+                    continue
+
+                parsedFile = self.__cacheHandler.load(fingerprint) if fileDirectory not in parsingFiles else None
+                if parsedFile is None and fileDirectory in futures:
+                    future = futures[fileDirectory]
+                    while not future.done():
+                        checkCancelled(cancelEvent)
+                        wait([future], timeout=0.1)
+                    parsedFile = future.result()
+                elif parsedFile is None:
+                    parsedFile = parseScheduleFile(fileDirectory, fingerprint, cacheHandler, cancelEvent)
+
+                fileColumns, ranges = self.__encodeFile(parsedFile)
+                yield fileDirectory, fingerprint, fileColumns, ranges
+        finally:
+            # Files still waiting in the pool are dropped when loading is cancelled
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def __isLoaded(self, fileDirectory:str, fingerprint:tuple) -> bool:
+        # Columns of the file are already in memory and the file did not change since
+        return fileDirectory in self.__loadedFiles and self.__loadedFiles[fileDirectory][0] == fingerprint
+
+    def __storeFiles(self, schedules:ScheduleStore, fileRows:dict, isParallel:bool, progressQueue, cancelEvent, isCached:bool) -> list:
+        # Every file is read before the schedule store changes, so a cancelled load keeps the previous schedules
+        loadedFiles = {}
+        for index, (fileDirectory, fingerprint, fileColumns, ranges) in enumerate(self.__loadFiles(isParallel, cancelEvent, isCached)):
+            checkCancelled(cancelEvent)
+            loadedFiles[fileDirectory] = (fingerprint, fileColumns, ranges)
+
+            if progressQueue is not None:
+                progressQueue.put(("file", os.path.basename(fileDirectory), len(fileColumns[0]), index+1, len(self.__filesPathList)))
+
+        return self.__applyFiles(schedules, fileRows, loadedFiles)
+
+    def __storeMappedFiles(self, schedules:ScheduleStore, fileRows:dict, progressQueue, cancelEvent) -> list:
+        # Each file is only mapped and its rows found. Files with the same size and modified time stay mapped
+        loadedFiles = {}
+        for index, fileDirectory in enumerate(self.__filesPathList):
+            checkCancelled(cancelEvent)
+            fileStat = os.stat(fileDirectory)
+            fingerprint = (os.path.abspath(fileDirectory), fileStat.st_size, fileStat.st_mtime_ns)
+            if self.__isLoaded(fileDirectory, fingerprint):
+                loadedFiles[fileDirectory] = self.__loadedFiles[fileDirectory]
+            else:
+                loadedFiles[fileDirectory] = (fingerprint, MappedScheduleFile(fileDirectory), None)
+
+            if progressQueue is not None:
+                progressQueue.put(("file", os.path.basename(fileDirectory), len(loadedFiles[fileDirectory][1]), index+1, len(self.__filesPathList)))
+
+        return self.__applyFiles(schedules, fileRows, loadedFiles)
+
+    def __applyFiles(self, schedules:ScheduleStore, fileRows:dict, loadedFiles:dict) -> list:
+        # Rows of deleted or changed files are removed, and rows of new or changed files are added.
+        # Loading the same unchanged files again keeps the schedule store, so the indexes built on it are reused
+        if len(fileRows) == 0 and self.__isSameFiles(loadedFiles):
+            schedules, fileRows = self.__schedules, self.__fileRows
+        addedRows = []
+        removedRows = []
+        newFileRows = {}
+        for fileDirectory, rowIds in fileRows.items():
+            if fileDirectory in loadedFiles and loadedFiles[fileDirectory][1] is self.__loadedFiles[fileDirectory][1]:
+                newFileRows[fileDirectory] = rowIds
+            else:
+                if isinstance(self.__loadedFiles[fileDirectory][1], MappedScheduleFile):
+                    schedules.releaseFile(self.__loadedFiles[fileDirectory][1])
+                removedRows.extend(rowIds)
+        schedules.removeRows(removedRows)
+
+        for fileDirectory, (_, fileColumns, _) in loadedFiles.items():
+            if fileDirectory not in newFileRows:
+                if isinstance(fileColumns, MappedScheduleFile):
+                    newFileRows[fileDirectory] = schedules.appendFile(fileColumns, self)
+                else:
+                    newFileRows[fileDirectory] = schedules.appendColumns(fileColumns)
+                addedRows.extend(newFileRows[fileDirectory])
+
+        self.__schedules = schedules
+        self.__loadedFiles = loadedFiles
+        self.__fileRows = newFileRows
+        self.__resetRange() # Reset the range before storing the ranges of each file
+        self.__isRangeStale = any(ranges is None for _, _, ranges in loadedFiles.values())
+        if self.__isRangeStale:
+            return [addedRows, removedRows]
+        for _, _, ranges in loadedFiles.values():
+            self.__mergeRange(ranges)
+
+        self.__setRangeList()
+        return [addedRows, removedRows]
+
+    def __isSameFiles(self, loadedFiles:dict) -> bool:
+        # Same files in the same order, unchanged, with their rows in that order in the schedule store
+        if list(loadedFiles) != list(self.__fileRows):
+            return False
+        if any(loadedFiles[fileDirectory][1] is not self.__loadedFiles[fileDirectory][1] for fileDirectory in loadedFiles):
+            return False
+        starts = [rowIds.start for rowIds in self.__fileRows.values()]
+        return starts == sorted(starts)
+
+    def __updateStaleRange(self):
+        # Ranges of mapped files are the distinct values of the columns, so finding them decodes the columns
+        if self.__isRangeStale:
+            self.__schedules.loadColumns(ScheduleStore.categories)
+            self.setRange(self.__schedules.getRowIds())
+            self.__setRangeList()
+
+    def __setRangeList(self):
+        # Storing size of range for optimal hashtable size
+        self.__rangeList = [len(self.__moduleRange), len(self.__moduleCodeRange), len(self.__cohortRange), len(self.__courseRange), len(self.__fullPartRange), 
+                            len(self.__sessionRange), len(self.__activityDateRange), len(self.__scheduledDayRange), len(self.__startTimeRange), len(self.__endTimeRange), 
+                            len(self.__durationRange), len(self.__locationRange), len(self.__sizeRange), len(self.__lecturerRange), len(self.__zoneRange)]
+
+    def __encodeFile(self, parsedFile:list) -> list:
+        # Codes of the file are changed to the codes of the dictionaries shared with the other files
+        values, columns = parsedFile
+        codeMaps = [[dictionary.encode(value) for value in columnValues] for dictionary, columnValues in zip(self.__dictionaries, values)]
+        fileColumns = [array("I", map(codeMap.__getitem__, codes)) for codeMap, codes in zip(codeMaps, columns)]
+
+        # Distinct values of each column are the range of the file
+        ranges = [set(map(dictionary.values.__getitem__, codeMap)) for dictionary, codeMap in zip(self.__dictionaries, codeMaps)]
+        return [fileColumns, ranges]
+
+    def __mergeRange(self, ranges:list):
+        # Merge the ranges of a parsed file into the ranges of all schedules
+        rangeSets = [self.__moduleRange, self.__moduleCodeRange, self.__cohortRange, self.__courseRange, self.__fullPartRange,
+                     self.__sessionRange, self.__activityDateRange, self.__scheduledDayRange, self.__startTimeRange, self.__endTimeRange,
+                     self.__durationRange, self.__locationRange, self.__sizeRange, self.__lecturerRange, self.__zoneRange]
+        for rangeSet, fileRange in zip(rangeSets, ranges):
+            rangeSet.update(fileRange)
+
+    def __extractData(self,name:str, description:str) -> list:
+        course,cohort,fullPart,moduleCode,session = name.split("_")
+        cohort = fullPart + "_" + cohort
+        module = description[4:].split(" (")[0]
+        
+        return [module, moduleCode, cohort, course, fullPart, session]
+    
+    def __resetRange(self):
+        self.__moduleRange.clear()
+        self.__moduleCodeRange.clear()
+        self.__cohortRange.clear()
+        self.__courseRange.clear()
+        self.__fullPartRange.clear()
+        self.__sessionRange.clear()
+        self.__activityDateRange.clear()
+        self.__scheduledDayRange.clear()
+        self.__startTimeRange.clear()
+        self.__endTimeRange.clear()
+        self.__durationRange.clear()
+        self.__locationRange.clear()
+        self.__sizeRange.clear()
+        self.__lecturerRange.clear()
+        self.__zoneRange.clear() 
+
+
+
+def parseScheduleFile(fileDirectory:str, fingerprint=None, cacheHandler=None, cancelEvent=None) -> list:
+    # Also used by the process pool, as worker processes cannot share the DataHandler of the GUI
+    parsedFile = DataHandler().parseFile(fileDirectory, cancelEvent)
+    if cacheHandler is not None:
+        cacheHandler.save(fingerprint, parsedFile)
+    return parsedFile
+
+
+
+class CacheHandler:
+    def __init__(self, cacheDirectory=None):
+        # Parsed files are kept in the user's home folder so that they survive a relaunch
+        if cacheDirectory is None:
+            cacheDirectory = os.path.join(os.path.expanduser("~"), ".timetableViewer", "cache")
+        self.__cacheDirectory = cacheDirectory
+        self.__version = 2 # Changed when the format of the parsed files changes
+
+    def getFingerprint(self, fileDirectory:str) -> tuple:
+        # Path, size, modified time and content hash of the file. Any change in the file changes the fingerprint
+        fileDirectory = os.path.abspath(fileDirectory)
+        fileStat = os.stat(fileDirectory)
+        with open(fileDirectory, "rb") as file:
+            contentHash = hashlib.file_digest(file, "blake2b").hexdigest()
+
+        return (fileDirectory, fileStat.st_size, fileStat.st_mtime_ns, contentHash)
+
+    def isCached(self, fingerprint:tuple) -> bool:
+        return self.__readFingerprint(fingerprint) == (self.__version, fingerprint)
+
+    def load(self, fingerprint:tuple):
+        # Returns the parsed file, or None if the cache is missing or out of date
+        try:
+            with open(self.__getCachePath(fingerprint), "rb") as cacheFile:
+                if pickle.load(cacheFile) != (self.__version, fingerprint):
+                    return None
+                return pickle.load(cacheFile)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+
+    def save(self, fingerprint:tuple, parsedFile:list):
+        # Parsed files are already stored as the distinct values and codes of each column, so they are saved as they are.
+        # Written to a temporary file of this process first, so a cache file is never left half written
+        # even when several processes save the same file
+        try:
+            os.makedirs(self.__cacheDirectory, exist_ok=True)
+            cachePath = self.__getCachePath(fingerprint)
+            temporaryPath = f"{cachePath}.{os.getpid()}.tmp"
+            with open(temporaryPath, "wb") as cacheFile:
+                pickle.dump((self.__version, fingerprint), cacheFile, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(parsedFile, cacheFile, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporaryPath, cachePath)
+        except OSError:
+            pass
+
+    def __readFingerprint(self, fingerprint:tuple):
+        try:
+            with open(self.__getCachePath(fingerprint), "rb") as cacheFile:
+                return pickle.load(cacheFile)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+
+    def __getCachePath(self, fingerprint:tuple) -> str:
+        # One cache file for each CSV file path, replaced when the file changes
+        return os.path.join(self.__cacheDirectory, hashlib.blake2b(fingerprint[0].encode(), digest_size=16).hexdigest() + ".pickle")
+
+
+
+class Query: # Filters chosen by the user, in the order they were chosen
+    def __init__(self):
+        self.clauses = [] # ("value", category, value, matchMode), ("range", category, start, end) or ("interval", mode, start, end)
+
+    def addFilter(self, category:str, value, matchMode="and"):
+        self.clauses.append(("value", category, value, matchMode))
+
+    def addRange(self, category:str, start, end): # category is "activityDate" or "time"
+        self.clauses.append(("range", category, start, end))
+
+    def addInterval(self, mode:str, start:datetime.datetime, end=None): # mode is "overlap", "contains" or "enclosed"
+        self.clauses.append(("interval", mode, start, end))
+
+    def removeClause(self, index:int): # Filters after it stay in their order
+        del self.clauses[index]
+
+    def clear(self):
+        self.clauses = []
+
+    def isEmpty(self) -> bool:
+        return len(self.clauses) == 0
+
+def splitClauses(clauses:list) -> list:
+    # Clauses in groups that start at each "or" filter, as (starts with "or", clauses)
+    groups = [[False, []]]
+    for clause in clauses:
+        if clause[0] == "value" and clause[3] == "or":
+            groups.append([True, []])
+        groups[-1][1].append(clause)
+    return [group for group in groups if group[0] or group[1]]
+
+class FilterHistory: # Earlier states of the DisplayHandler result for undo and redo. Only the latest states are kept
+    def __init__(self, limit=20):
+        self.__undoStates = deque(maxlen=limit) # The oldest state is dropped when the limit is reached
+        self.__redoStates = deque(maxlen=limit)
+
+    def record(self, state:tuple): # A new result clears the states that were undone
+        self.__undoStates.append(state)
+        self.__redoStates.clear()
+
+    def undo(self, state:tuple): # Returns the previous state and keeps the current one for redo. None when nothing is left to undo
+        if len(self.__undoStates) == 0:
+            return None
+        self.__redoStates.append(state)
+        return self.__undoStates.pop()
+
+    def redo(self, state:tuple):
+        if len(self.__redoStates) == 0:
+            return None
+        self.__undoStates.append(state)
+        return self.__redoStates.pop()
+
+    def canUndo(self) -> bool:
+        return len(self.__undoStates) > 0
+
+    def canRedo(self) -> bool:
+        return len(self.__redoStates) > 0
+
+    def getStates(self) -> list: # Every kept state, for reusing their results
+        return list(self.__undoStates) + list(self.__redoStates)
+
+    def clear(self):
+        self.__undoStates.clear()
+        self.__redoStates.clear()
+
+
+
+class FacetCounts: # Number of rows of the result with each value code of a category, for the counts of the filter options
+    def __init__(self, schedules:ScheduleStore):
+        self.__schedules = schedules
+        self.__counts = {} # Result bitmap and the count of each code, of each category. Codes without rows are left out
+
+    def getCounts(self, category:str, resultBitmap:int, rowIds:list) -> dict:
+        # Counts are only found again when the result changed. A result within the previous one can only lose rows,
+        # so only the codes that still had rows are intersected again
+        previousBitmap, counts = self.__counts.get(category, (None, None))
+        if previousBitmap == resultBitmap:
+            return counts
+
+        column = self.__schedules.getColumn(category)
+        if len(rowIds) == len(column): # Nothing is filtered out or removed, so the whole column is counted in C
+            counts = dict(Counter(column))
+        elif not self.__schedules.isIndexed(category): # Building the index costs more than counting the rows
+            counts = dict(Counter(map(column.__getitem__, rowIds)))
+        else:
+            # An intersection costs a word for each 64 rows, and a bitmap not made yet a pass over its rows.
+            # The rows of the result are counted instead when that costs less
+            bitmapIndex = self.__schedules.getIndex(category)
+            codes = counts if previousBitmap is not None and resultBitmap & previousBitmap == resultBitmap else bitmapIndex.postings
+            bitmapCost = len(codes) * (len(column) >> 6) + 16 * sum(bitmapIndex.getCount(code) for code in codes if code not in bitmapIndex.bitmaps)
+            if len(rowIds) * 16 < bitmapCost:
+                counts = dict(Counter(map(column.__getitem__, rowIds)))
+            else:
+                counts = {code: (resultBitmap & bitmapIndex.getBitmap(code)).bit_count() for code in codes}
+                counts = {code: count for code, count in counts.items() if count > 0}
+        self.__counts[category] = (resultBitmap, counts)
+
+        return counts
+
+    def clear(self): # Used when the rows of the schedule store change
+        self.__counts = {}
+
+class DisplayHandler:
+    sortedCategories = ["activityDate", "startTime", "endTime", "duration"] # Categories with a sorted index, ordered by ScheduleStore.rankKeys
+    textCategories = ["module", "lecturer", "location"] # Categories found by searchValues
+    clashCategories = ["location", "lecturer", "cohort"] # Categories that cannot be booked twice at the same time
+
+    def __init__(self, schedules:ScheduleStore, historyLimit=20):
+        # Only the row ids are sorted and filtered, the schedules stay in the schedule store.
+        # Indexes are kept by the schedule store, and each one is only built when a filter first needs it.
+        # A result is never changed once made, so earlier results are kept in the history as they are
+        self.__schedules = schedules
+        self.__sortedSchedules = array("I", schedules.getRowIds())
+        self.__clauses = () # Query clauses of the result. None when the result was not made by a query
+        self.__history = FilterHistory(historyLimit)
+        self.__allSchedules = schedules.getRowBitmap() # Bitmap of every schedule, used for NOT filters
+        self.__resultBitmap = None # Bitmap of the result. None when the result changed since
+        self.__sortOrder = None # Categories and direction of the last sort, used when OR adds schedules to the result
+        self.__sortedResults = {} # Result in ascending order of each list of categories, read backwards for descending order
+        self.__facetCounts = FacetCounts(schedules) # Counts of the filter options, updated as the result changes
+        self.__resultFacets = {} # Counts of each category found for the result, shared with its history state and cached result
+    
+    def updateSchedules(self, addedRows:list, removedRows:list):
+        # Rows changed by a reload are already applied to the indexes by the schedule store, so only the result is reset
+        self.__sortedSchedules = array("I", self.__schedules.getRowIds())
+        self.__allSchedules = self.__schedules.getRowBitmap()
+        self.__resultBitmap = None
+        self.__sortOrder = None
+        self.__sortedResults = {}
+        self.__clauses = ()
+        self.__history.clear() # Earlier results may hold removed rows
+        self.__facetCounts.clear()
+        self.__resultFacets = {}
+
+    def getFilteredSchedule(self, category:str, specificValue) -> int:
+        # Bitmap of the schedules with the value. Bitmaps can be combined with & (and), | (or) and & ~ (not)
+        code = self.__schedules.getDictionary(category).codes.get(specificValue)
+        if code is None: # No schedule has the value
+            return 0
+        return self.__schedules.getIndex(category).getBitmap(code)
+
+    def getAllSchedules(self) -> int:
+        return self.__allSchedules
+
+    def getResultBitmap(self) -> int:
+        if self.__resultBitmap is None: # Every schedule while nothing is filtered out
+            self.__resultBitmap = self.__allSchedules if len(self.__sortedSchedules) == len(self.__schedules) else toBitmap(self.__sortedSchedules)
+        return self.__resultBitmap
+
+    def getOptionCounts(self, category:str, matchMode="and") -> dict:
+        # Number of schedules the result would have after choosing each value of the category.
+        # "and" and "not" offer the values in the result, "or" the values of every schedule
+        counts = self.__resultFacets.get(category)
+        if counts is None:
+            counts = self.__facetCounts.getCounts(category, self.getResultBitmap(), self.__sortedSchedules)
+            self.__resultFacets[category] = counts
+        values = self.__schedules.getDictionary(category).values
+        resultCnt = len(self.__sortedSchedules)
+        if matchMode == "and":
+            return {values[code]: count for code, count in counts.items()}
+        elif matchMode == "or":
+            postings = self.__schedules.getIndex(category).postings
+            return {values[code]: resultCnt + len(rowIds) - counts.get(code, 0) for code, rowIds in postings.items()}
+        elif matchMode == "not":
+            return {values[code]: resultCnt - count for code, count in counts.items()}
+        else:
+            raise ValueError(f"Unknown match mode: {matchMode}")
+
+    def buildSearchIndex(self):
+        # Used while loading, so the first search does not build the trigram index
+        self.__schedules.getTextIndex(self.textCategories)
+
+    def searchValues(self, text:str, limit=20) -> list:
+        # Values of the text categories matching the text as (category, value, number of schedules), best first.
+        # Values with the same score are ordered by their number of schedules
+        textIndex = self.__schedules.getTextIndex(self.textCategories)
+        matches = heapq.nsmallest(limit, ((-score, -textIndex.entries[entryId][3], entryId) for score, entryId in textIndex.search(text)))
+        results = []
+        for _, _, entryId in matches:
+            category, code, _, rowCnt = textIndex.entries[entryId]
+            results.append((category, self.__schedules.getDictionary(category).values[code], rowCnt))
+        return results
+
+    def rangeSearch(self,start, end, category:str):
+        # Finds the schedules between two values and keeps them in the order of the result.
+        # Rows come from the sorted index, so only the k matching rows are visited - O(log n + k log k)
+        if category == "time": # Starting at or after start and ending at or before end
+            startRows = self.__getSortedIndex("startTime").getRange(start, None)
+            endRows = self.__getSortedIndex("endTime").getRange(None, end)
+            if len(startRows) <= len(endRows):
+                rows, otherCategory, condition = startRows, "endTime", lambda value: value <= end
+            else:
+                rows, otherCategory, condition = endRows, "startTime", lambda value: value >= start
+            match = self.__getMatch(otherCategory, condition)
+            column = self.__schedules.getColumn(otherCategory)
+            rows = [rowId for rowId in rows if match[column[rowId]]]
+        elif category in self.sortedCategories:
+            rows = self.__getSortedIndex(category).getRange(start, end)
+        else: # Categories without a sorted index are checked once for each distinct value - O(n)
+            match = self.__getMatch(category, lambda value: start <= value <= end)
+            column = self.__schedules.getColumn(category)
+            rows = [rowId for rowId in self.__sortedSchedules if match[column[rowId]]]
+
+        self.__keepRows(rows)
+
+    def intervalSearch(self, mode:str, start:datetime.datetime, end=None):
+        # Finds the schedules whose date and times overlap the window, run at the start, or are enclosed by the window
+        self.__keepRows(self.getIntervalRows(mode, start, end))
+
+    def getIntervalRows(self, mode:str, start:datetime.datetime, end=None) -> list:
+        # Rows of every schedule matching the interval query, in no particular order
+        intervalIndex = self.__schedules.getIntervalIndex()
+        if mode == "overlap":
+            return intervalIndex.getOverlapping(self.__toSeconds(start), self.__toSeconds(end))
+        elif mode == "contains":
+            return intervalIndex.getContaining(self.__toSeconds(start))
+        elif mode == "enclosed":
+            return intervalIndex.getEnclosed(self.__toSeconds(start), self.__toSeconds(end))
+        raise ValueError(f"Unknown interval mode: {mode}")
+
+    def applyQuery(self, query:Query):
+        # A recent result of the same filters and sort order is taken from the query cache. Otherwise the result
+        # is found from the kept result with the most of the first filters of the query, so adding
+        # or removing a filter only runs the filters after it. Filters between two "or" filters are
+        # planned together: rows of the most selective filter are taken from its index, and only those rows
+        # are checked against the other filters, most selective first
+        queryClauses = tuple(query.clauses)
+        if queryClauses == self.__clauses: # Nothing changed, so no state is added to the history
+            return
+        entry = self.__schedules.getQueryCache().get(self.__getCacheKey(queryClauses))
+        if entry is not None:
+            self.__setResult(entry[0], queryClauses, entry[1], self.__sortOrder, entry[2])
+            return
+        baseClauses, resultRows, resultBitmap, sortOrder, facets = self.__findState(queryClauses)
+        if len(baseClauses) == len(queryClauses) and resultRows is not None: # Same filters as a kept result
+            self.__setResult(resultRows, queryClauses, resultBitmap, sortOrder, facets)
+            self.__cacheResult()
+            return
+
+        for isOr, clauses in splitClauses(queryClauses[len(baseClauses):]):
+            if isOr:
+                # Rows of an "or" filter are added to the result found so far
+                category, value = clauses[0][1], clauses[0][2]
+                resultRows = fromBitmap(self.__toBitmap(resultRows) | self.getFilteredSchedule(category, value))
+                clauses = clauses[1:]
+            resultRows = self.__runPlan(self.planQuery(clauses, resultRows))
+
+        self.__setResult(resultRows if resultRows is not None else self.__schedules.getRowIds(), queryClauses)
+        self.__cacheResult()
+
+    def undo(self, query:Query) -> bool:
+        # Puts back the previous result and sets the query back to its filters. False when nothing is left to undo
+        state = self.__history.undo(self.__getState())
+        if state is None:
+            return False
+        self.__setState(state, query)
+        return True
+
+    def redo(self, query:Query) -> bool:
+        state = self.__history.redo(self.__getState())
+        if state is None:
+            return False
+        self.__setState(state, query)
+        return True
+
+    def canUndo(self) -> bool:
+        return self.__history.canUndo()
+
+    def canRedo(self) -> bool:
+        return self.__history.canRedo()
+
+    def getCacheStats(self) -> tuple:
+        # Hits and misses of the query cache, and the number of cached results
+        queryCache = self.__schedules.getQueryCache()
+        return (queryCache.hits, queryCache.misses, len(queryCache))
+
+    def planQuery(self, clauses:list, baseRows=None) -> list:
+        # Steps of the plan as (estimated rows, column, match table, rows of the step) in the order they run.
+        # Estimates come from the number of rows of each code in the indexes, so nothing is scanned
+        steps = []
+        if baseRows is not None:
+            steps.append((len(baseRows), None, None, lambda: baseRows))
+        for clause in clauses:
+            if clause[0] == "range" and clause[1] == "time":
+                steps.append(self.__getStep("startTime", lambda value, start=clause[2]: value >= start, (clause[2], None)))
+                steps.append(self.__getStep("endTime", lambda value, end=clause[3]: value <= end, (None, clause[3])))
+            elif clause[0] == "range":
+                steps.append(self.__getStep(clause[1], lambda value, start=clause[2], end=clause[3]: start <= value <= end, (clause[2], clause[3])))
+            elif clause[0] == "interval":
+                # No estimate without the rows, so the interval query is run here - O(k log n) for its k rows
+                rows = self.getIntervalRows(clause[1], clause[2], clause[3])
+                steps.append((len(rows), None, None, lambda rows=rows: rows))
+            elif clause[3] == "not":
+                steps.append(self.__getStep(clause[1], lambda value, specificValue=clause[2]: value != specificValue))
+            else:
+                steps.append(self.__getStep(clause[1], lambda value, specificValue=clause[2]: value == specificValue))
+
+        steps.sort(key=lambda step: step[0])
+        return steps
+
+    def getResult(self) -> array:
+        return self.__sortedSchedules
+
+    def getResultCount(self) -> int:
+        return len(self.__sortedSchedules)
+
+    def getPage(self, offset:int, limit:int) -> list:
+        # Values of the schedules of one page of the result, in the order of the result
+        return [self.__schedules.getAll(rowId) for rowId in self.__sortedSchedules[offset:offset + limit]]
+
+    def getSchedules(self) -> ScheduleStore:
+        return self.__schedules
+
+    def sort(self, category:str, isAscending=True, thenBy=()):
+        # Sorts by the category, then by each category of thenBy for equal values. Schedules equal in every
+        # category stay in row order, and descending order is the ascending order read backwards
+        self.__sortOrder = (tuple(dict.fromkeys([category, *thenBy])), isAscending)
+        self.__applySortOrder()
+
+    def setCommonSchedules(self, filteredSchedules:int, matchMode="and"):
+        # Combines the bitmap with the result: "and" keeps the common schedules, "or" adds the schedules
+        # and "not" removes them. The result keeps its order
+        resultBitmap = self.getResultBitmap()
+        if matchMode == "and":
+            resultBitmap &= filteredSchedules
+        elif matchMode == "or":
+            resultBitmap |= filteredSchedules & self.__allSchedules
+        elif matchMode == "not":
+            resultBitmap &= ~filteredSchedules
+        else:
+            raise ValueError(f"Unknown match mode: {matchMode}")
+
+        if matchMode == "or":
+            # Added schedules have no place in the result yet, so the result is sorted again
+            self.__setResult(fromBitmap(resultBitmap), None, resultBitmap)
+        else:
+            # Each row is checked against one byte of the bitmap
+            data = resultBitmap.to_bytes((self.__allSchedules.bit_length() + 7) >> 3, "little")
+            rows = [rowId for rowId in self.__sortedSchedules if data[rowId >> 3] >> (rowId & 7) & 1]
+            self.__setResult(rows, None, resultBitmap, self.__sortOrder)
+
+    def exportResult(self) -> list:
+        # Result specifically for export as it requires "sort by date"
+        return sorted(self.__sortedSchedules, key=self.__schedules.getRowRanks("activityDate").__getitem__)
+
+    def getOccupancyCube(self, slotMinutes=60) -> OccupancyCube:
+        # Room utilization of the result. Columns are read as arrays of codes, and each code table is turned into
+        # minutes or ordinals once, so no schedule is decoded
+        rowIds = np.frombuffer(self.__sortedSchedules, dtype=np.uint32)
+        columns = {category: np.frombuffer(self.__schedules.getColumn(category), dtype=np.uint32)[rowIds]
+                   for category in ["location", "zone", "activityDate", "startTime", "endTime"]}
+        locations = self.__schedules.getDictionary("location").values
+        roomCodes = sorted(np.flatnonzero(np.bincount(columns["location"], minlength=len(locations))), key=locations.__getitem__) # Rooms of the result by name
+        compactCodes = np.zeros(len(locations), dtype=np.int64)
+        compactCodes[roomCodes] = np.arange(len(roomCodes))
+        zoneCodes = np.zeros(len(locations), dtype=np.int64)
+        zoneCodes[columns["location"]] = columns["zone"]
+
+        zones = self.__schedules.getDictionary("zone").values
+        toOrdinals = np.array([value.toordinal() for value in self.__schedules.getDictionary("activityDate").values] or [0], dtype=np.int64)
+        toMinutes = {category: np.array([value.hour * 60 + value.minute for value in self.__schedules.getDictionary(category).values] or [0], dtype=np.int64)
+                     for category in ["startTime", "endTime"]}
+        dates = toOrdinals[columns["activityDate"]]
+        return buildOccupancyCube([locations[code] for code in roomCodes], [zones[zoneCodes[code]] for code in roomCodes],
+                                  compactCodes[columns["location"]], (dates - 1) % 7,
+                                  toMinutes["startTime"][columns["startTime"]], toMinutes["endTime"][columns["endTime"]],
+                                  int(dates.min()) if len(dates) > 0 else None, int(dates.max()) if len(dates) > 0 else None, slotMinutes=slotMinutes)
+
+    def aggregate(self, categories:list) -> list:
+        # Totals of the result for each group of values of the categories, as (values, count, minutes, total size,
+        # first date, last date) in the order of the values. Groups are kept by their codes in a hash table filled
+        # in one pass over the result, and the values of each group are only read at the end
+        schedules = self.__schedules
+        keyColumns = [schedules.getColumn(category) for category in categories]
+        durationColumn, sizeColumn, dateColumn = [schedules.getColumn(category) for category in ["duration", "size", "activityDate"]]
+        toMinutes = [durationToMinutes(value) for value in schedules.getDictionary("duration").values]
+        toSizes = schedules.getDictionary("size").values
+        toOrdinals = [value.toordinal() for value in schedules.getDictionary("activityDate").values]
+
+        groups = {} # Count, minutes, size, first and last date ordinal of each key
+        keyColumn = keyColumns[0] if len(keyColumns) == 1 else None
+        for rowId in self.__sortedSchedules:
+            key = keyColumn[rowId] if keyColumn is not None else tuple([column[rowId] for column in keyColumns])
+            date = toOrdinals[dateColumn[rowId]]
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [1, toMinutes[durationColumn[rowId]], toSizes[sizeColumn[rowId]], date, date]
+                continue
+            group[0] += 1
+            group[1] += toMinutes[durationColumn[rowId]]
+            group[2] += toSizes[sizeColumn[rowId]]
+            if date < group[3]:
+                group[3] = date
+            elif date > group[4]:
+                group[4] = date
+
+        ranks = [schedules.getRank(category) for category in categories]
+        dictionaries = [schedules.getDictionary(category).values for category in categories]
+        keys = [(key,) for key in groups] if keyColumn is not None else list(groups)
+        keys.sort(key=lambda codes: tuple([rank[code] for rank, code in zip(ranks, codes)]))
+        result = []
+        for codes in keys:
+            count, minutes, size, firstDate, lastDate = groups[codes[0] if keyColumn is not None else codes]
+            result.append((tuple([values[code] for values, code in zip(dictionaries, codes)]), count, minutes, size,
+                           datetime.date.fromordinal(firstDate), datetime.date.fromordinal(lastDate)))
+        return result
+
+    def findFreeSlots(self, participants:list, startDate:datetime.date, endDate:datetime.date, openTime:datetime.time,
+                      closeTime:datetime.time, minMinutes:int) -> list:
+        # Times from the start to the end date, within the open hours, when none of the participants has a schedule,
+        # as (date, start time, end time) lasting at least minMinutes. Participants are (category, value), such as
+        # ("cohort", value) or ("lecturer", value), and every loaded schedule books them, whatever the filters
+        schedules = self.__schedules
+        rangeStart, rangeEnd = startDate.toordinal() * 86400, (endDate.toordinal() + 1) * 86400
+        dateColumn, startColumn, endColumn = [schedules.getColumn(category) for category in ["activityDate", "startTime", "endTime"]]
+        toDays = [value.toordinal() * 86400 for value in schedules.getDictionary("activityDate").values]
+        isInRange = [rangeStart <= day < rangeEnd for day in toDays] # Schedules end on their own date, so only the date is checked
+        toSeconds = {category: [timeToSeconds(value) for value in schedules.getDictionary(category).values] for category in ["startTime", "endTime"]}
+        busyLists = [getClosedTimes(startDate, endDate, openTime, closeTime)]
+        for category, value in participants:
+            code = schedules.getDictionary(category).codes.get(value)
+            rowIds = schedules.getIndex(category).getRowIds(code) if code is not None else ()
+            busyLists.append(sorted([(toDays[dateColumn[rowId]] + toSeconds["startTime"][startColumn[rowId]], toDays[dateColumn[rowId]] + toSeconds["endTime"][endColumn[rowId]])
+                                     for rowId in rowIds if isInRange[dateColumn[rowId]]]))
+        return toFreeSlots(findFreeWindows(busyLists, rangeStart, rangeEnd, minMinutes * 60))
+
+    def findFreeRooms(self, date:datetime.date, startTime:datetime.time, endTime:datetime.time, minSize=None) -> list:
+        # Locations with no schedule sharing time with the window on the date, as (location, zone, largest class,
+        # free from, free until), best fit first. Rooms with a largest class under minSize are left out.
+        # Every loaded schedule books its room, whatever the filters of the result
+        occupancyIndex = self.__schedules.getOccupancyIndex()
+        locations, zones = self.__schedules.getDictionary("location").values, self.__schedules.getDictionary("zone").values
+        dayStart = date.toordinal() * 86400
+        start, end = dayStart + timeToSeconds(startTime), dayStart + timeToSeconds(endTime)
+        rooms = []
+        for code, capacity in occupancyIndex.capacities.items():
+            if minSize is not None and capacity < minSize:
+                continue
+            gap = occupancyIndex.getGap(code, start, end)
+            if gap is not None:
+                rooms.append((locations[code], zones[occupancyIndex.zones[code]], capacity, gap[0], gap[1]))
+        return rankFreeRooms(rooms, dayStart, minSize)
+
+    def findClashes(self, categories=None) -> list:
+        # Schedules of the result with the same value of a category that overlap in time, as (category, row id,
+        # other row id). Rows are sorted once by value, then start date and time, and swept group by group.
+        # Each sort key is one integer of the rank of the value, the start in seconds and the position of the row.
+        # Values of each row are kept in lists in row order, so the columns are read in order
+        schedules = self.__schedules
+        dateSeconds = [value.toordinal() * 86400 for value in schedules.getDictionary("activityDate").values]
+        startSeconds = [timeToSeconds(value) for value in schedules.getDictionary("startTime").values]
+        endSeconds = [timeToSeconds(value) for value in schedules.getDictionary("endTime").values]
+        dateColumn, startColumn, endColumn = schedules.getColumn("activityDate"), schedules.getColumn("startTime"), schedules.getColumn("endTime")
+        moduleCodeColumn, sessionColumn = schedules.getColumn("moduleCode"), schedules.getColumn("session")
+        rows = sorted(self.__sortedSchedules)
+        starts = [dateSeconds[dateColumn[rowId]] + startSeconds[startColumn[rowId]] for rowId in rows]
+        ends = [dateSeconds[dateColumn[rowId]] + endSeconds[endColumn[rowId]] for rowId in rows]
+        # Module code, session, start and end codes in one integer, which is compared faster than a tuple
+        sessionCnt, startCnt, endCnt = len(schedules.getDictionary("session")), len(startSeconds), len(endSeconds)
+        sessions = [((moduleCodeColumn[rowId] * sessionCnt + sessionColumn[rowId]) * startCnt + startColumn[rowId]) * endCnt + endColumn[rowId]
+                    for rowId in rows]
+
+        clashes = []
+        for category in categories if categories is not None else self.clashCategories:
+            rowRanks = schedules.getRowRanks(category)
+            keys = sorted([(rowRanks[rowId] << 96) | (start << 32) | position for position, (rowId, start) in enumerate(zip(rows, starts))])
+            positions = [key & 0xFFFFFFFF for key in keys]
+            intervals = zip([key >> 96 for key in keys], map(starts.__getitem__, positions), map(ends.__getitem__, positions),
+                            map(rows.__getitem__, positions), map(sessions.__getitem__, positions))
+            clashes += [(category, rowId, otherRowId) for rowId, otherRowId in findOverlaps(intervals)]
+        return clashes
+
+    def __getStep(self, category:str, condition, bounds=None) -> tuple:
+        # Match table of the codes, the number of rows it matches, and its rows taken from the index.
+        # Ranges are counted and read from the sorted index
+        match = self.__getMatch(category, condition)
+        if bounds is not None and category in self.sortedCategories:
+            sortedIndex = self.__getSortedIndex(category)
+            return (sortedIndex.getCount(*bounds), self.__schedules.getColumn(category), match, lambda: sortedIndex.getRange(*bounds))
+        bitmapIndex = self.__schedules.getIndex(category)
+        matchedCodes = [code for code, isMatched in enumerate(match) if isMatched]
+        estimate = sum(bitmapIndex.getCount(code) for code in matchedCodes)
+        getRows = lambda: [rowId for code in matchedCodes for rowId in bitmapIndex.getRowIds(code)]
+
+        return (estimate, self.__schedules.getColumn(category), match, getRows)
+
+    def __runPlan(self, steps:list) -> list:
+        # Rows of the most selective step are checked against the other steps in order. Rows are in ascending order
+        if len(steps) == 0:
+            return self.__schedules.getRowIds()
+        rows = steps[0][3]()
+        for _, column, match, getRows in steps[1:]:
+            if column is None: # Rows found before an "or" filter, or by an interval
+                data = self.__toBitmap(getRows()).to_bytes((self.__allSchedules.bit_length() + 7) >> 3, "little")
+                rows = [rowId for rowId in rows if data[rowId >> 3] >> (rowId & 7) & 1]
+            else:
+                rows = [rowId for rowId in rows if match[column[rowId]]]
+        return sorted(rows)
+
+    def __getSortedIndex(self, category:str) -> SortedIndex:
+        return self.__schedules.getSortedIndex(category)
+
+    def __toSeconds(self, value:datetime.datetime) -> int:
+        return value.toordinal() * 86400 + timeToSeconds(value)
+
+    def __keepRows(self, rows):
+        # Only the matching rows that are in the result are kept, and they are put in the order of the last sort
+        data = self.getResultBitmap().to_bytes((self.__allSchedules.bit_length() + 7) >> 3, "little")
+        self.__setResult(sorted(rowId for rowId in rows if data[rowId >> 3] >> (rowId & 7) & 1), None)
+
+    def __applySortOrder(self):
+        # A recent result of the same filters sorted the same way is taken from the query cache
+        entry = self.__schedules.getQueryCache().get(self.__getCacheKey(self.__clauses)) if self.__clauses is not None else None
+        if entry is not None:
+            self.__sortedSchedules = entry[0]
+            return
+        self.__sortRows()
+        self.__cacheResult()
+
+    def __sortRows(self):
+        # The ascending order of the result is kept for each list of categories. A few rows are sorted on the rank
+        # arrays of the categories, last category first. Otherwise the rows of the result are read from the
+        # permutation of every row, so no row is compared
+        categories, isAscending = self.__sortOrder
+        sortedRows = self.__sortedResults.get(categories)
+        if sortedRows is None:
+            if len(self.__sortedSchedules) == len(self.__schedules):
+                sortedRows = self.__schedules.getSortPermutation(categories)
+            elif len(self.__sortedSchedules) * 16 < len(self.__schedules):
+                rows = sorted(self.__sortedSchedules)
+                for category in reversed(categories):
+                    rows.sort(key=self.__schedules.getRowRanks(category).__getitem__)
+                sortedRows = array("I", rows)
+            else:
+                data = self.getResultBitmap().to_bytes((self.__allSchedules.bit_length() + 7) >> 3, "little")
+                sortedRows = array("I", [rowId for rowId in self.__schedules.getSortPermutation(categories) if data[rowId >> 3] >> (rowId & 7) & 1])
+            self.__sortedResults[categories] = sortedRows
+
+        # For Descending Order
+        self.__sortedSchedules = sortedRows if isAscending else sortedRows[::-1] # Never changed in place, so kept results keep their order
+
+    def __getCacheKey(self, clauses:tuple) -> tuple:
+        # Filters after an "or" filter only keep rows, so their order does not change the result. They are sorted
+        # by their text and repeats are dropped, so the same filters chosen in another order share a result
+        groups = tuple(tuple(sorted(set(group), key=repr)) for _, group in splitClauses(clauses))
+        return (groups, self.__sortOrder)
+
+    def __cacheResult(self):
+        # Results not made by a query have no key
+        if self.__clauses is not None:
+            entry = (self.__sortedSchedules, self.getResultBitmap(), self.__resultFacets)
+            self.__schedules.getQueryCache().put(self.__getCacheKey(self.__clauses), entry)
+
+    def __getState(self) -> tuple:
+        return (self.__clauses, self.__sortedSchedules, self.__resultBitmap, self.__sortOrder, self.__resultFacets)
+
+    def __setResult(self, rows, clauses, resultBitmap=None, sortOrder=None, facets=None):
+        # The current result goes to the history. sortOrder is the order the rows are in, None for row order.
+        # Rows in another order than the last sort are sorted again
+        self.__history.record(self.__getState())
+        self.__sortedSchedules = rows if isinstance(rows, array) else array("I", rows)
+        self.__resultBitmap = resultBitmap
+        self.__resultFacets = facets if facets is not None else {}
+        self.__sortedResults = {}
+        self.__clauses = clauses
+        if self.__sortOrder is not None and sortOrder != self.__sortOrder:
+            self.__sortRows()
+
+    def __setState(self, state:tuple, query:Query):
+        clauses, self.__sortedSchedules, self.__resultBitmap, sortOrder, self.__resultFacets = state
+        self.__sortedResults = {}
+        self.__clauses = clauses
+        query.clauses = list(clauses) if clauses is not None else []
+        if self.__sortOrder is not None and sortOrder != self.__sortOrder:
+            self.__applySortOrder()
+
+    def __findState(self, clauses:tuple) -> tuple:
+        # Current or kept state made by the most of the first clauses. Without a match every schedule
+        # is started from, and a kept result of no filters is only used for a query of no filters
+        bestState = ((), None, None, None, None)
+        for state in [self.__getState()] + self.__history.getStates():
+            stateClauses = state[0]
+            if stateClauses is None or clauses[:len(stateClauses)] != stateClauses:
+                continue
+            if len(stateClauses) == 0 and len(clauses) > 0:
+                continue
+            if bestState[1] is None or len(stateClauses) > len(bestState[0]):
+                bestState = state
+        return bestState
+
+    def __toBitmap(self, rowIds) -> int:
+        return self.__allSchedules if rowIds is None else toBitmap(rowIds)
+
+    def __getMatch(self, category:str, condition) -> list:
+        # Checks the condition once for each distinct value, instead of once for each row
+        return [condition(value) for value in self.__schedules.getDictionary(category).values]
+
+
+
+class ArchiveDisplayHandler:
+    # Filters, sorting and history of the DisplayHandler for the schedules of a ScheduleArchive. Each query runs in
+    # SQLite and its row ids are written in order to a temporary table, so a page is read by its positions and
+    # memory stays the same however many schedules the archive holds
+    textCategories = DisplayHandler.textCategories
+    clashCategories = DisplayHandler.clashCategories
+    sortColumns = {"duration": "durationMinutes"} # Columns sorted instead of the category, as in ScheduleStore.rankKeys
+
+    def __init__(self, archive:ScheduleArchive, historyLimit=20):
+        self.__archive = archive
+        self.__clauses = () # Query clauses of the result
+        self.__sortOrder = ((), True) # Categories and direction of the last sort. Rows are in row order before the first sort
+        self.__history = FilterHistory(historyLimit) # Clauses of the earlier results
+        self.__queryCache = QueryCache() # Counts of each category found for the latest queries
+        self.__textIndex = None
+        self.__textValues = {} # Values of each text category in the order of their codes in the trigram index
+        self.__rooms = None # Location, zone and largest class of each room, read when rooms are first searched
+        self.__resultCnt = 0
+        self.__writeResult()
+
+    def updateSchedules(self):
+        # Used after files are added to the archive. Results and counts of the earlier schedules are dropped
+        self.__clauses = ()
+        self.__history.clear()
+        self.__queryCache.clear()
+        self.__textIndex = None
+        self.__rooms = None
+        self.__writeResult()
+
+    def getOptionCounts(self, category:str, matchMode="and") -> dict:
+        # Number of schedules the result would have after choosing each value of the category, as in the DisplayHandler
+        counts = self.__getCounts(self.__clauses, category)
+        if matchMode == "and":
+            return dict(counts)
+        elif matchMode == "or":
+            return {value: self.__resultCnt + total - counts.get(value, 0) for value, total in self.__getCounts((), category).items()}
+        elif matchMode == "not":
+            return {value: self.__resultCnt - count for value, count in counts.items()}
+        else:
+            raise ValueError(f"Unknown match mode: {matchMode}")
+
+    def buildSearchIndex(self):
+        # Distinct values of the text categories are indexed with their number of schedules
+        if self.__textIndex is None:
+            textIndex = TrigramIndex()
+            for category in self.textCategories:
+                counts = self.__getCounts((), category)
+                self.__textValues[category] = list(counts)
+                for code, (value, rowCnt) in enumerate(counts.items()):
+                    textIndex.add(category, code, value, rowCnt)
+            self.__textIndex = textIndex
+
+    def searchValues(self, text:str, limit=20) -> list:
+        self.buildSearchIndex()
+        textIndex = self.__textIndex
+        matches = heapq.nsmallest(limit, ((-score, -textIndex.entries[entryId][3], entryId) for score, entryId in textIndex.search(text)))
+        results = []
+        for _, _, entryId in matches:
+            category, code, _, rowCnt = textIndex.entries[entryId]
+            results.append((category, self.__textValues[category][code], rowCnt))
+        return results
+
+    def applyQuery(self, query:Query):
+        queryClauses = tuple(query.clauses)
+        if queryClauses == self.__clauses:
+            return
+        self.__history.record(self.__clauses)
+        self.__clauses = queryClauses
+        self.__writeResult()
+
+    def undo(self, query:Query) -> bool:
+        # Earlier results are found again from their clauses
+        clauses = self.__history.undo(self.__clauses)
+        if clauses is None:
+            return False
+        self.__setClauses(clauses, query)
+        return True
+
+    def redo(self, query:Query) -> bool:
+        clauses = self.__history.redo(self.__clauses)
+        if clauses is None:
+            return False
+        self.__setClauses(clauses, query)
+        return True
+
+    def canUndo(self) -> bool:
+        return self.__history.canUndo()
+
+    def canRedo(self) -> bool:
+        return self.__history.canRedo()
+
+    def getCacheStats(self) -> tuple:
+        return (self.__queryCache.hits, self.__queryCache.misses, len(self.__queryCache))
+
+    def sort(self, category:str, isAscending=True, thenBy=()):
+        # Equal schedules are in row order, and descending order is the ascending order read backwards
+        self.__sortOrder = (tuple(dict.fromkeys([category, *thenBy])), isAscending)
+        self.__writeResult()
+
+    def getResultCount(self) -> int:
+        return self.__resultCnt
+
+    def getPage(self, offset:int, limit:int) -> list:
+        # Values of the schedules of one page of the result, in the order of the result
+        rows = self.__archive.execute(f"SELECT {', '.join(f's.{category}' for category in ScheduleArchive.categories)} FROM temp.result r "
+                                      "JOIN schedules s ON s.rowId = r.rowId WHERE r.position > ? AND r.position <= ? ORDER BY r.position",
+                                      (offset, offset + limit))
+        return [self.__archive.toValues(row) for row in rows]
+
+    def getSchedules(self) -> ScheduleArchive:
+        return self.__archive
+
+    def exportResult(self) -> list:
+        # Result specifically for export as it requires "sort by date"
+        rows = self.__archive.execute("SELECT r.rowId FROM temp.result r JOIN schedules s ON s.rowId = r.rowId ORDER BY s.activityDate, r.position")
+        return [row[0] for row in rows]
+
+    def getOccupancyCube(self, slotMinutes=60) -> OccupancyCube:
+        # Same cube as the DisplayHandler. SQLite counts the schedules of each room, weekday and times, so only
+        # the groups are read and they are weighted by their counts
+        where, params = self.__getWhere(self.__clauses)
+        groups = self.__archive.execute(f"SELECT location, MAX(zone), (startAt / 86400 - 1) % 7, startAt % 86400 / 60, endAt % 86400 / 60, "
+                                        f"COUNT(*), MIN(startAt / 86400), MAX(startAt / 86400) FROM schedules WHERE {where} "
+                                        f"GROUP BY location, (startAt / 86400 - 1) % 7, startAt % 86400, endAt % 86400", params).fetchall()
+        roomZones = {location: zone for location, zone, *_ in groups}
+        locations = sorted(roomZones)
+        roomCodes = {location: code for code, location in enumerate(locations)}
+        columns = list(zip(*groups)) or [()] * 8
+        return buildOccupancyCube(locations, [roomZones[location] for location in locations], [roomCodes[location] for location in columns[0]],
+                                  columns[2], columns[3], columns[4], min(columns[6], default=None), max(columns[7], default=None),
+                                  np.array(columns[5], dtype=np.float64), slotMinutes)
+
+    def aggregate(self, categories:list) -> list:
+        # Same totals as the DisplayHandler, grouped by SQLite
+        where, params = self.__getWhere(self.__clauses)
+        columns = ", ".join(categories)
+        order = ", ".join([self.sortColumns.get(category, category) for category in categories])
+        rows = self.__archive.execute(f"SELECT {columns}, COUNT(*), SUM(durationMinutes), SUM(size), MIN(activityDate), MAX(activityDate) "
+                                      f"FROM schedules WHERE {where} GROUP BY {columns} ORDER BY {order}", params)
+        return [(tuple([self.__archive.fromColumnValue(category, value) for category, value in zip(categories, row)]), *row[-5:-2],
+                 datetime.date.fromisoformat(row[-2]), datetime.date.fromisoformat(row[-1])) for row in rows]
+
+    def findFreeSlots(self, participants:list, startDate:datetime.date, endDate:datetime.date, openTime:datetime.time,
+                      closeTime:datetime.time, minMinutes:int) -> list:
+        # Same times as the DisplayHandler. SQLite reads the schedules of each participant in order of their start
+        rangeStart, rangeEnd = startDate.toordinal() * 86400, (endDate.toordinal() + 1) * 86400
+        busyLists = [getClosedTimes(startDate, endDate, openTime, closeTime)]
+        for category, value in participants:
+            busyLists.append(self.__archive.execute(f"SELECT startAt, endAt FROM schedules WHERE {category} = ? AND startAt BETWEEN ? AND ? "
+                                                    f"AND endAt > ? ORDER BY startAt, endAt", (value, rangeStart - self.__archive.getLongestSpan(),
+                                                                                              rangeEnd - 1, rangeStart)).fetchall())
+        return toFreeSlots(findFreeWindows(busyLists, rangeStart, rangeEnd, minMinutes * 60))
+
+    def findFreeRooms(self, date:datetime.date, startTime:datetime.time, endTime:datetime.time, minSize=None) -> list:
+        # Same rooms as the DisplayHandler. Each room's last end before the window and first start after it are
+        # read for the date only, and rooms with a schedule in the window are left out
+        if self.__rooms is None:
+            self.__rooms = self.__archive.execute("SELECT location, zone, MAX(size) FROM schedules GROUP BY location").fetchall()
+        dayStart = date.toordinal() * 86400
+        start, end = dayStart + timeToSeconds(startTime), dayStart + timeToSeconds(endTime)
+        longestSpan = self.__archive.getLongestSpan()
+        busyRooms = {row[0] for row in self.__archive.execute("SELECT DISTINCT location FROM schedules WHERE startAt BETWEEN ? AND ? AND endAt > ?",
+                                                              (start - longestSpan, end - 1, start))}
+        freeFrom = dict(self.__archive.execute("SELECT location, MAX(endAt) FROM schedules WHERE startAt BETWEEN ? AND ? GROUP BY location",
+                                               (dayStart - longestSpan, start)))
+        freeUntil = dict(self.__archive.execute("SELECT location, MIN(startAt) FROM schedules WHERE startAt BETWEEN ? AND ? GROUP BY location",
+                                                (end, dayStart + 86399)))
+        rooms = [(location, zone, capacity, freeFrom.get(location), freeUntil.get(location)) for location, zone, capacity in self.__rooms
+                 if location not in busyRooms and (minSize is None or capacity >= minSize)]
+        return rankFreeRooms(rooms, dayStart, minSize)
+
+    def findClashes(self, categories=None) -> list:
+        # Same clashes as the DisplayHandler. SQLite sorts the rows of the result, and they are swept as they are read
+        clashes = []
+        for category in categories if categories is not None else self.clashCategories:
+            rows = self.__archive.execute(f"SELECT s.{category}, s.startAt, s.endAt, s.rowId, s.moduleCode, s.session FROM temp.result r "
+                                          f"JOIN schedules s ON s.rowId = r.rowId ORDER BY s.{category}, s.startAt, s.rowId")
+            intervals = ((value, start, end, rowId, (moduleCode, session, start, end)) for value, start, end, rowId, moduleCode, session in rows)
+            clashes += [(category, rowId, otherRowId) for rowId, otherRowId in findOverlaps(intervals)]
+        return clashes
+
+    def __setClauses(self, clauses:tuple, query:Query):
+        self.__clauses = clauses
+        query.clauses = list(clauses)
+        self.__writeResult()
+
+    def __writeResult(self):
+        # Row ids of the result in the order of the last sort. Positions start at 1 in the new table
+        where, params = self.__getWhere(self.__clauses)
+        categories, isAscending = self.__sortOrder
+        direction = "" if isAscending else " DESC"
+        order = ", ".join([f"{self.sortColumns.get(category, category)}{direction}" for category in categories] + [f"rowId{direction}"])
+        self.__archive.write("DROP TABLE IF EXISTS temp.result")
+        self.__archive.write("CREATE TEMP TABLE result (position INTEGER PRIMARY KEY, rowId INTEGER)")
+        cursor = self.__archive.write(f"INSERT INTO temp.result (rowId) SELECT rowId FROM schedules WHERE {where} ORDER BY {order}", params)
+        self.__resultCnt = cursor.rowcount
+
+    def __getWhere(self, clauses:tuple) -> tuple:
+        # Groups are combined in order as in the DisplayHandler: an "or" filter adds its schedules to the result
+        # found so far, and the other filters keep the schedules matching them
+        condition, params = "1", []
+        for isOr, group in splitClauses(clauses):
+            if isOr:
+                clauseCondition, clauseParams = self.__getCondition(group[0])
+                condition = f"({condition}) OR {clauseCondition}"
+                params += clauseParams
+                group = group[1:]
+            for clause in group:
+                clauseCondition, clauseParams = self.__getCondition(clause)
+                condition = f"({condition}) AND ({clauseCondition})"
+                params += clauseParams
+        return condition, params
+
+    def __getCondition(self, clause:tuple) -> tuple:
+        # SQL condition of one clause and its parameters
+        if clause[0] == "value":
+            _, category, value, matchMode = clause
+            return (f"{category} != ?" if matchMode == "not" else f"{category} = ?"), [self.__archive.toColumnValue(value)]
+        elif clause[0] == "range":
+            _, category, start, end = clause
+            if category == "time": # Starting at or after start and ending at or before end
+                return "startTime >= ? AND endTime <= ?", [self.__archive.toColumnValue(start), self.__archive.toColumnValue(end)]
+            elif category == "duration":
+                return "durationMinutes BETWEEN ? AND ?", [durationToMinutes(start), durationToMinutes(end)]
+            return f"{category} BETWEEN ? AND ?", [self.__archive.toColumnValue(start), self.__archive.toColumnValue(end)]
+
+        # Intervals as in the IntervalIndex, where a schedule runs from its start up to but not at its end. No schedule
+        # is longer than the longest span, so only the starts within it of the window are searched in the index
+        _, mode, start, end = clause
+        longestSpan = self.__archive.getLongestSpan()
+        if mode == "overlap":
+            return "startAt BETWEEN ? AND ? AND endAt > ?", [self.__toSeconds(start) - longestSpan, self.__toSeconds(end) - 1, self.__toSeconds(start)]
+        elif mode == "contains":
+            return "startAt BETWEEN ? AND ? AND endAt > ?", [self.__toSeconds(start) - longestSpan, self.__toSeconds(start), self.__toSeconds(start)]
+        elif mode == "enclosed":
+            return "startAt BETWEEN ? AND ? AND endAt <= ?", [self.__toSeconds(start), self.__toSeconds(end), self.__toSeconds(end)]
+        raise ValueError(f"Unknown interval mode: {mode}")
+
+    def __getCounts(self, clauses:tuple, category:str) -> dict:
+        # Schedules with each value of the category in the result of the clauses, which are the current clauses
+        # or no clauses. Counts of the current result are read through the result table
+        key = tuple(tuple(sorted(set(group), key=repr)) for _, group in splitClauses(clauses))
+        facets = self.__queryCache.get(key)
+        if facets is None:
+            facets = {}
+            self.__queryCache.put(key, facets)
+        if category not in facets:
+            toValue = lambda value: self.__archive.fromColumnValue(category, value)
+            if len(clauses) == 0 or self.__resultCnt == len(self.__archive): # Read from the index of the category alone
+                rows = self.__archive.execute(f"SELECT {category}, COUNT(*) FROM schedules GROUP BY {category}")
+                facets[category] = {toValue(value): count for value, count in rows}
+            elif self.__resultCnt * 4 < len(self.__archive): # Each schedule of a small result is looked up by its row id
+                rows = self.__archive.execute(f"SELECT s.{category}, COUNT(*) FROM temp.result r JOIN schedules s ON s.rowId = r.rowId GROUP BY s.{category}")
+                facets[category] = {toValue(value): count for value, count in rows}
+            else:
+                # A scan of every schedule in table order costs less than looking up most of them. Only the schedules
+                # left out of the result are grouped, and their counts are taken from the counts of every schedule
+                where, params = self.__getWhere(clauses)
+                rows = self.__archive.execute(f"SELECT {category}, COUNT(*) FROM schedules NOT INDEXED WHERE NOT ({where}) GROUP BY {category}", params)
+                counts = Counter(self.__getCounts((), category))
+                counts.subtract({toValue(value): count for value, count in rows})
+                facets[category] = dict(+counts) # Values left with no schedules are dropped
+        return facets[category]
+
+    def __toSeconds(self, value:datetime.datetime) -> int:
+        return value.toordinal() * 86400 + timeToSeconds(value)
+
+
+
+class ExportHandler:
+    categoryNames = {"module": "Module", "moduleCode": "Module Code", "cohort": "Cohort", "course": "Course", "fullPart": "Full/Part",
+                     "session": "Session", "activityDate": "Date", "scheduledDay": "Day", "startTime": "Start Time", "endTime": "End Time",
+                     "duration": "Duration", "location": "Location", "size": "Size", "lecturer": "Lecturer", "zone": "Zone"}
+
+    def __init__(self):
+        self.__result = LinkedList()
+        self.__path = ""
+        self.__groupedModules = {}
+
+    def setResult(self, schedules:ScheduleStore, rowIds:list, path:str):
+        # Only the exported rows are made into schedule classes
+        result = LinkedList()
+        for rowId in rowIds:
+            result.append(schedules.getSchedule(rowId))
+        self.__result = result.head
+        self.__path = path
+
+    def exportExcel(self):
+        # Reset values for repeated process
+        self.__startingRow = 12
+        self.__weekCnt = 1
+        self.__minDate = datetime.date(3000,1,1)
+        self.__maxDate = datetime.date(1000,1,1)
+        self.__groupedModules = {}
+
+        # Border width predefine
+        self.__thick = Side(border_style="medium")
+        self.__thin = Side(border_style="thin",color="808080")
+        self.__getHeaderData()
+
+        wb = Workbook()
+        ws = wb.active
+
+        # First Row with small width
+        ws.column_dimensions['A'].width = 5
+
+        # Default Row width
+        col = 2
+        while col < 10:
+            i = get_column_letter(col)
+            ws.column_dimensions[i].width = 30
+            col += 1
+
+        # PSB logo
+        ws.merge_cells('B4:B7')
+        ws['B4'].font = Font(size=76,color="902108",name='Times New Roman', bold=True)
+        ws['B4'].alignment = Alignment(horizontal="center",vertical="center")
+        ws['B4'] = "PSB"
+
+        # ACADEMY logo
+        ws.row_dimensions[8].height = 20
+        ws.row_dimensions[9].height = 20
+        ws.merge_cells('B8:B9')
+        ws['B8'].font = Font(size=36,color="7F7F7F",name='Calibri', bold=True)
+        ws['B8'].alignment = Alignment(horizontal="center",vertical="center")
+        ws['B8'] = "Academy"
+
+        # Grouped Module list header
+        ws.merge_cells('D4:E4')
+        ws['D4'].alignment = Alignment(horizontal="left",vertical="center")
+        ws['D4'] = "Module"
+        ws['F4'] = "Cohort"
+        ws['G4'] = "Lecturer"
+        ws['H4'] = "Full-time / Part-time"
+        ws['I4'] = "Date Start - Date End"
+
+        ws['D4'].border = Border(left=self.__thick,top=self.__thick,bottom=self.__thick)
+        ws['E4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thin)
+        ws['F4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thin)
+        ws['G4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thin)
+        ws['H4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thin)
+        ws['I4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thick)
+
+        ws['D4'].fill = PatternFill("solid", start_color="AACDFF")
+        ws['F4'].fill = PatternFill("solid", start_color="AACDFF")
+        ws['G4'].fill = PatternFill("solid", start_color="AACDFF")
+        ws['H4'].fill = PatternFill("solid", start_color="AACDFF")
+        ws['I4'].fill = PatternFill("solid", start_color="AACDFF")
+
+        # Grouped Module Data Insert
+        i = 5
+        for _, value in self.__groupedModules.items():
+            module, cohort, lecturer, fullPart = value[0], value[1], value[2], value[3]
+            ws.merge_cells('D'+str(i)+':'+"E"+str(i))
+            ws["D" + str(i)] = module
+            ws["F" + str(i)] = cohort
+            ws["G" + str(i)] = lecturer
+            ws["H" + str(i)] = fullPart
+            ws["I" + str(i)] = str(value[5]) + " - " + str(value[6])
+            ws["D" + str(i)].fill = PatternFill("solid", start_color=value[4])
+
+            ws["D" + str(i)].border = Border(left=self.__thick,bottom=self.__thin)
+            ws["E" + str(i)].border = Border(bottom=self.__thin,right=self.__thin)
+            ws["F" + str(i)].border = Border(bottom=self.__thin,right=self.__thin)
+            ws["G" + str(i)].border = Border(bottom=self.__thin,right=self.__thin)
+            ws["H" + str(i)].border = Border(bottom=self.__thin,right=self.__thin)
+            ws["I" + str(i)].border = Border(bottom=self.__thin,right=self.__thick)
+            if len(self.__groupedModules.items())-1 == i-5:
+                ws["D" + str(i)].border = Border(left=self.__thick,bottom=self.__thick)
+                ws["E" + str(i)].border = Border(bottom=self.__thick,right=self.__thin)
+                ws["F" + str(i)].border = Border(bottom=self.__thick,right=self.__thin)
+                ws["G" + str(i)].border = Border(bottom=self.__thick,right=self.__thin)
+                ws["H" + str(i)].border = Border(bottom=self.__thick,right=self.__thin)
+                ws["I" + str(i)].border = Border(bottom=self.__thick,right=self.__thick)
+            ws.row_dimensions[i].height = 20
+            i+=1
+
+        # Define the Starting row
+        self.__startingRow = 12
+        if len(self.__groupedModules.items()) > 5:
+            self.__startingRow += len(self.__groupedModules.items())-4
+
+        # Build Main Schedule table
+        self.currentDate = self.__minDate
+        self.weekStartMarked = False
+        self.__createExcelHeading(ws)
+        self.__createExcelRow(ws)
+        moduleRow = self.__startingRow
+        createdRow = 1
+        stream = 1
+        prevDate = self.__minDate - datetime.timedelta(days=1)
+
+        # Insert schedules
+        for schedule in self.__result:
+            date = schedule.data.get("activityDate")
+            # if new heading has to be created
+            while date >= self.currentDate:
+                date = schedule.data.get("activityDate")
+                self.__createExcelHeading(ws)
+                self.__createExcelRow(ws)
+                moduleRow = self.__startingRow
+                createdRow = 1
+                stream = 1
+
+            # if the schedule is the first to go in the date
+            if date != prevDate:
+                stream = 1
+                insertingCell = get_column_letter(date.isoweekday()+2) + str(moduleRow - 6)
+                ws[insertingCell] = schedule.data.get("moduleCode") + " (" + schedule.data.get("fullPart")+")"
+                ws[insertingCell].fill = PatternFill("solid", start_color=self.__groupedModules[f"{schedule.data.get('module')}{schedule.data.get('cohort')}{schedule.data.get('lecturer')}{schedule.data.get('fullPart')}"][4])
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 5)] = str(schedule.data.get("startTime"))[:-3] + " ~ " + str(schedule.data.get("endTime"))[:-3]
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 4)] = self.__characterLimit(schedule.data.get("lecturer"))
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 3)] = schedule.data.get("location")
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 2)] = schedule.data.get("size")
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 1)] = schedule.data.get("zone")
+            
+            # If the schedule has to go to second ~ # rows
+            else:
+                stream += 1
+                # If I need to create a new row for new data
+                if createdRow < stream:
+                    self.__createExcelRow(ws)
+                    createdRow += 1
+                # Insert schedule
+                insertingCell = get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6))
+                ws[insertingCell] = schedule.data.get("moduleCode") + " (" + schedule.data.get("fullPart")+")"
+                ws[insertingCell].fill = PatternFill("solid", start_color=self.__groupedModules[f"{schedule.data.get('module')}{schedule.data.get('cohort')}{schedule.data.get('lecturer')}{schedule.data.get('fullPart')}"][4])
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+1)] = str(schedule.data.get("startTime"))[:-3] + " ~ " + str(schedule.data.get("endTime"))[:-3]
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+2)] = self.__characterLimit(schedule.data.get("lecturer"))
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+3)] = schedule.data.get("location")
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+4)] = schedule.data.get("size")
+                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+5)] = schedule.data.get("zone")
+            prevDate = date
+
+
+        # Remove the frid lines and headers in Excel for clean view
+        ws.sheet_view.showGridLines = False
+        ws.sheet_view.showRowColHeaders = False
+
+        wb.save(self.__path+"/Excel_Timetable.xlsx")
+
+    def exportPDF(self):
+        self.__weekStartMarked = False
+        self.__weekCnt = 1
+        self.__minDate = datetime.date(3000,1,1)
+        self.__maxDate = datetime.date(1000,1,1)
+        self.__groupedModules = {}
+
+        pdf =  FPDF('L','mm',(500,300))
+        pdf.add_page()
+
+        # PSB Logo
+        pdf.set_font("times","B",30)
+        pdf.set_text_color(158,36,36)
+        pdf.cell(33,8,"PSB",ln=True,border=0,align="C")
+
+        # Academy Logo
+        pdf.set_font("helvetica","B",12)
+        pdf.set_text_color(156,156,156)
+        pdf.cell(33,5,"Academy",border=0,ln=True,align="C")
+        pdf.cell(33,5,"",ln=True)
+
+        # Table header for grouped modules
+        pdf.set_font("helvetica", "B", 7)
+        pdf.set_text_color(0,0,0)
+        pdf.set_fill_color(170, 205, 255)
+        pdf.cell(60,5,"Module", border=True, fill=True)
+        pdf.cell(20,5,"Cohort", border=True, fill=True)
+        pdf.cell(50,5,"Lecturer", border=True, fill=True)
+        pdf.cell(30,5,"Full-time/Part-time", border=True, fill=True)
+        pdf.cell(30,5,"Date Start - Date End", border=True, fill=True, ln=True)
+
+        # Table for grouped modules
+        self.__getHeaderData(False)
+        self.__currentDate = self.__minDate
+        pdf.set_font("helvetica", "", 7)
+        pdf.set_text_color(0,0,0)
+        for i, value in self.__groupedModules.items():
+            pdf.set_fill_color(value[4][0],value[4][1],value[4][2])
+            pdf.cell(60,5,f"{value[0]}",border=True, fill=True)
+            pdf.cell(20,5,f"{value[1]}",border=True, fill=True)
+            pdf.cell(50,5,f"{value[2]}",border=True, fill=True)
+            pdf.cell(30,5,f"{value[3]}",border=True, fill=True)
+            pdf.cell(30,5,f"{value[5]} - {value[6]}",border=True, fill=True, ln=True)
+
+        pdf.cell(30,5,"", ln=True)
+
+        # Header for Schedules table
+        while self.__currentDate < self.__maxDate:
+            self.__createPDFHeading(pdf)
+            self.__createPDFRow(pdf)
+
+        pdf.output(self.__path+"/PDF_Timetable.pdf")
+
+    def exportClashes(self, schedules, clashes:list, path:str):
+        # One row for each clash, with the booked value and both schedules
+        categoryNames = {"location": "Location", "lecturer": "Lecturer", "cohort": "Cohort"}
+        headings = ["Category", "Booked", "Date", "Module", "Session", "Time", "Clashes With", "Session", "Time"]
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Clashes"
+        for col, heading in enumerate(headings, 1):
+            ws.cell(row=1, column=col, value=heading)
+            ws.cell(row=1, column=col).font = Font(size=12, bold=True)
+            ws.cell(row=1, column=col).fill = PatternFill("solid", start_color="AACDFF")
+            ws.column_dimensions[get_column_letter(col)].width = 40 if heading in ("Module", "Clashes With") else 18
+
+        for category, rowId, otherRowId in clashes:
+            schedule, otherSchedule = schedules.getSchedule(rowId), schedules.getSchedule(otherRowId)
+            ws.append([categoryNames.get(category, category), schedule.get(category), schedule.get("activityDate").strftime("%d/%m/%Y"),
+                       schedule.get("module") + " " + schedule.get("moduleCode"), schedule.get("session"),
+                       str(schedule.get("startTime"))[:-3] + " ~ " + str(schedule.get("endTime"))[:-3],
+                       otherSchedule.get("module") + " " + otherSchedule.get("moduleCode"), otherSchedule.get("session"),
+                       str(otherSchedule.get("startTime"))[:-3] + " ~ " + str(otherSchedule.get("endTime"))[:-3]])
+
+        ws.freeze_panes = "A2"
+        wb.save(path+"/Excel_Clashes.xlsx")
+
+    def exportReport(self, categories:list, groups:list, path:str):
+        # One row for each group found by aggregate, with its totals
+        days = ["", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        headings = [self.categoryNames[category] for category in categories] + ["Sessions", "Hours", "Hours per Week", "Total Size", "First Date", "Last Date"]
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Report"
+        for col, heading in enumerate(headings, 1):
+            ws.cell(row=1, column=col, value=heading)
+            ws.cell(row=1, column=col).font = Font(size=12, bold=True)
+            ws.cell(row=1, column=col).fill = PatternFill("solid", start_color="AACDFF")
+            ws.column_dimensions[get_column_letter(col)].width = 40 if heading == "Module" else 18
+
+        for values, count, minutes, size, firstDate, lastDate in groups:
+            values = [days[value] if category == "scheduledDay" else value for category, value in zip(categories, values)]
+            ws.append(values + [count, round(minutes / 60, 2), round(weeklyHours(minutes, firstDate, lastDate), 2), size,
+                                firstDate.strftime("%d/%m/%Y"), lastDate.strftime("%d/%m/%Y")])
+
+        ws.freeze_panes = "A2"
+        wb.save(path+"/Excel_Report.xlsx")
+
+    def exportOccupancy(self, cube:OccupancyCube, category:str, path:str):
+        # One sheet for each weekday with the percent of each room or zone booked in each slot, colored as a heatmap
+        slots = cube.getSlots()
+        bookedSlots = cube.getBookedSlots()
+        names, percentages = cube.getPercentages(category)
+        wb = Workbook()
+        wb.remove(wb.active)
+        for day, weekday in enumerate(cube.weekdays):
+            ws = wb.create_sheet(weekday)
+            ws.append(["Zone" if category == "zone" else "Location"] + [slots[slot].strftime("%H:%M") for slot in bookedSlots])
+            for col in range(1, len(bookedSlots) + 2):
+                ws.cell(row=1, column=col).font = Font(size=12, bold=True)
+                ws.cell(row=1, column=col).fill = PatternFill("solid", start_color="AACDFF")
+                ws.column_dimensions[get_column_letter(col)].width = 18 if col == 1 else 8
+            for name, row in zip(names, percentages[:, day, bookedSlots.start:bookedSlots.stop]):
+                ws.append([name] + [round(float(percent), 1) for percent in row])
+
+            if len(names) > 0 and len(bookedSlots) > 0:
+                cells = f"B2:{get_column_letter(len(bookedSlots) + 1)}{len(names) + 1}"
+                ws.conditional_formatting.add(cells, ColorScaleRule(start_type="num", start_value=0, start_color="FFFFFF",
+                                                                    end_type="num", end_value=100, end_color="F8696B"))
+            ws.freeze_panes = "B2"
+        wb.save(path+"/Excel_Occupancy.xlsx")
+
+    def __getHeaderData(self, isExcel = True): # Used for finding the grouped schedules
+        if isExcel == True: colorVar = "hex"
+        else: colorVar = "rgb"
+
+        groupingSchedule = {}
+        for i in self.__result:
+            strVal = f"{i.data.get('module')}{i.data.get('cohort')}{i.data.get('lecturer')}{i.data.get('fullPart')}"
+            # If the schedule is first time recording
+            if strVal not in groupingSchedule:
+                minDate, maxDate = i.data.get("activityDate"), i.data.get("activityDate")
+                groupingSchedule[strVal] = [i.data.get('module')+' '+i.data.get('moduleCode'),i.data.get('cohort'),i.data.get('lecturer'),i.data.get('fullPart'),self.__generateRandomColor(colorVar), minDate, maxDate]
+
+            # If it has been recorded
+            else:
+                minDate = groupingSchedule[strVal][5]
+                maxDate = groupingSchedule[strVal][6]
+                # Finding the starting and ending date of each group
+                if minDate > i.data.get("activityDate"):
+                    minDate = i.data.get("activityDate")
+                if maxDate < i.data.get("activityDate"):
+                    maxDate = i.data.get("activityDate")
+
+                groupingSchedule.update({strVal:[i.data.get('module')+' '+i.data.get('moduleCode'),i.data.get('cohort'),i.data.get('lecturer'),i.data.get('fullPart'),self.__generateRandomColor(colorVar), minDate, maxDate]})
+
+            if i.data.get("activityDate") < self.__minDate: self.__minDate = i.data.get("activityDate")
+            if i.data.get("activityDate") > self.__maxDate: self.__maxDate = i.data.get("activityDate")
+
+        self.__groupedModules = groupingSchedule
+    
+    def __createExcelHeading(self, ws): # Used for creating heading with days and dates
+        # 
+        headingFont = Font(size=14, bold=True, underline="single")
+        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        for i in range(8):
+            currentColumnLetter = get_column_letter(i+2)
+            currentCell = currentColumnLetter + str(self.__startingRow)
+            bottomCell = currentColumnLetter + str(self.__startingRow+1)
+            
+            # For the Week columns
+            if currentColumnLetter == "B":
+                ws.merge_cells('B' + str(self.__startingRow)+':'+'B'+ str(self.__startingRow+1))
+                ws[currentCell] = "Week" + str(self.__weekCnt)
+                ws[currentCell].border = Border(left=self.__thick, top=self.__thick,right=self.__thick)
+                ws[bottomCell].border = Border(left=self.__thick, bottom=self.__thick, right=self.__thick)
+
+            # For the Days and date columns
+            else:
+                currentCell = currentColumnLetter + str(self.__startingRow)
+                ws[currentCell] = days[i-1]
+                ws[currentCell].border = Border(top=self.__thick,right=self.__thin)
+                ws[bottomCell].border = Border(bottom=self.__thick, right=self.__thin)
+                if currentColumnLetter == "I":
+                    ws[currentCell].border = Border(top=self.__thick,right=self.__thick)
+                    ws[bottomCell].border = Border(bottom=self.__thick,right=self.__thick)
+                
+
+            # Font and color on all cells
+            ws[currentCell].font = headingFont
+            ws[currentCell].fill = PatternFill("solid", start_color="AACDFF")
+            ws[bottomCell].fill = PatternFill("solid", start_color="AACDFF")
+            ws[currentCell].alignment = Alignment(horizontal="center",vertical="center")
+            ws[bottomCell].alignment = Alignment(horizontal="center",vertical="center")
+        
+        # Entering Date
+        
+        for i in range(7):
+            currentColumnLetter = get_column_letter(i+3)
+            currentCell = currentColumnLetter + str(self.__startingRow+1)
+            if self.__weekCnt == 1 and not self.weekStartMarked:
+                if self.currentDate.isoweekday() == i+1:
+                    ws[currentCell] = self.currentDate
+                    self.weekStartMarked = True
+                
+            # If start has marked
+            else:
+                ws[currentCell] = self.currentDate
+
+            if self.weekStartMarked == True:
+                self.currentDate += datetime.timedelta(days=1)
+
+        self.__weekCnt += 1
+        self.__startingRow += 2
+
+    def __createExcelRow(self,ws): # Used for creating empty schedules row frame
+        detailList = ["Module", "Time", "Lecturer", "Location", "Size", "Zone"]
+        ws.row_dimensions[self.__startingRow].height = 70
+        # Left Column border and data setting
+        for i in range(6):
+            currentCell = "B" + str(i + self.__startingRow)
+            ws[currentCell] = detailList[i]
+            ws[currentCell].fill = PatternFill("solid", start_color="AACDFF")
+            ws[currentCell].font = Font(bold = True, size=14)
+            ws[currentCell].alignment = Alignment(horizontal="center",vertical="center")
+            ws[currentCell].border = Border(bottom=self.__thin,right=self.__thick,left=self.__thick)
+
+        ws["B" + str(5 + self.__startingRow)].border = Border(bottom=self.__thick,right=self.__thick,left=self.__thick)
+
+        # Setting the font and border for the actual values
+        for i in range(7):
+            for j in range(6):
+                currentColumnLetter = get_column_letter(i+3)
+                currentCell = currentColumnLetter + str(j+self.__startingRow)
+                ws[currentCell].font = Font(size=14)
+                ws[currentCell].border = Border(bottom=self.__thin,right=self.__thin)
+                ws[currentCell].alignment = Alignment(horizontal="center",vertical="center")
+                if j == 5:
+                    ws[currentCell].border = Border(bottom=self.__thick,right=self.__thin)
+                if i == 6:
+                    ws[currentCell].border = Border(bottom=self.__thin,right=self.__thick)
+                if j == 5 and i == 6:
+                    ws[currentCell].border = Border(bottom=self.__thick,right=self.__thick)
+
+        self.__startingRow += 6
+
+    def __createPDFHeading(self, pdf):
+        pdf.set_font("helvetica", "B", 7)
+        pdf.set_fill_color(170, 205, 255)
+        pdf.cell(30,10, f"Week{self.__weekCnt}", border=True, fill=True, align="C")
+        pdf.cell(35,5, "Monday", border=True, fill=True, align="C")
+        pdf.cell(35,5, "Tuesday", border=True, fill=True, align="C")
+        pdf.cell(35,5, "Wednesday", border=True, fill=True, align="C")
+        pdf.cell(35,5, "Thursday", border=True, fill=True, align="C")
+        pdf.cell(35,5, "Friday", border=True, fill=True, align="C")
+        pdf.cell(35,5, "Saturday", border=True, fill=True, align="C")
+        pdf.cell(35,5, "Sunday", border=True, fill=True, align="C", ln=True)
+        pdf.cell(30,5, "", border=False,fill=False)
+        
+        # Adding date in the cell
+        for i in range(7):
+            pdf.set_font("helvetica", "", 7)
+            if self.__weekCnt == 1 and not self.__weekStartMarked:
+                if self.__currentDate.isoweekday() == i+1 and i == 6:
+                    pdf.cell(35,5,f"{self.__currentDate}",fill=True, border=True, ln=True, align="C")
+                    self.__weekStartMarked = True
+                elif self.__currentDate.isoweekday() == i+1:
+                    pdf.cell(35,5,f"{self.__currentDate}",fill=True,border=True, align="C")
+                    self.__weekStartMarked = True
+                else:
+                    pdf.cell(35,5,"",fill=True,border=True)
+            else:
+                if i == 6:
+                    pdf.cell(35,5,f"{self.__currentDate}",fill=True,border=True, align="C", ln=True)
+                else:    
+                    pdf.cell(35,5,f"{self.__currentDate}",fill=True,border=True, align="C")
+
+            if self.__weekStartMarked == True:
+                self.__currentDate += datetime.timedelta(days=1)
+        
+        self.__weekCnt += 1
+        
+    def __createPDFRow(self, pdf, commonSchedules = LinkedList(), common = False):
+        pdf.set_font("helvetica", "B", 7)
+        # Module row schedule input
+        pdf.set_fill_color(222, 235, 255)
+        pdf.cell(30,25,"Module", fill=True, border = True, align = "C")
+        currentWeekSchedules = LinkedList()
+
+
+        # Adding the current schedule
+
+        if common == False:
+            for schedule in self.__result:
+                if schedule.data.get("activityDate") < self.__currentDate:
+                    currentWeekSchedules.append(schedule.data)
+                else:
+                    break
+        else:
+            currentWeekSchedules = commonSchedules
+            commonSchedules= LinkedList()
+
+        otherData = LinkedList()
+
+        prev = self.__currentDate
+        if currentWeekSchedules.head == None:
+            for i in range(7):
+                pdf.set_fill_color(255, 255, 255)
+                if i == 6:
+                    pdf.cell(35,25,f"", fill=True, border = True, align = "C", ln=True)
+                else:
+                    pdf.cell(35,25,f"", fill=True, border = True, align = "C")
+        else:
+            for i in range(7):
+                # For Module
+                if currentWeekSchedules.head != None:
+                    if prev != currentWeekSchedules.head.data.get("activityDate"):
+                        if currentWeekSchedules.head.data.get("activityDate").isoweekday() == i+1:
+                            prev = currentWeekSchedules.head.data.get("activityDate")
+                            r,g,b = self.__groupedModules[f"{currentWeekSchedules.head.data.get('module')}{currentWeekSchedules.head.data.get('cohort')}{currentWeekSchedules.head.data.get('lecturer')}{currentWeekSchedules.head.data.get('fullPart')}"][4]
+                            pdf.set_fill_color(r,g,b)
+                            otherData.append(currentWeekSchedules.head.data)
+                            if i == 6:
+                                pdf.cell(35,25,f"{currentWeekSchedules.pop().get('moduleCode')}", fill=True, border=True, align="C", ln=True)
+                            else:
+                                pdf.cell(35,25,f"{currentWeekSchedules.pop().get('moduleCode')}", fill=True, border=True, align="C")
+
+                            while currentWeekSchedules.head != None and prev == currentWeekSchedules.head.data.get("activityDate"):
+                                commonSchedules.append(currentWeekSchedules.head.data)
+                                currentWeekSchedules.pop()
+                        else:
+                            pdf.cell(35,25,f"", border = True, align = "C")
+
+                elif currentWeekSchedules.head == None:
+                    pdf.set_fill_color(255, 255, 255)
+                    if i == 6: pdf.cell(35,25,"", border = True, align = "C", ln=True)
+                    else: pdf.cell(35,25,"", border = True, align = "C")
+
+
+        pdf.set_fill_color(222, 235, 255)
+        pdf.cell(30,5,"Time", fill=True, border = True, align = "C")
+        self.__createOtherPDFData(pdf,otherData,"time")
+        pdf.set_fill_color(222, 235, 255)
+        pdf.cell(30,5,"Lecturer", fill=True, border = True, align = "C")
+        self.__createOtherPDFData(pdf,otherData,"lecturer")
+        pdf.set_fill_color(222, 235, 255)
+        pdf.cell(30,5,"Location", fill=True, border = True, align = "C")
+        self.__createOtherPDFData(pdf,otherData,"location")
+        pdf.set_fill_color(222, 235, 255)
+        pdf.cell(30,5,"Size", fill=True, border = True, align = "C")
+        self.__createOtherPDFData(pdf,otherData,"size")
+        pdf.set_fill_color(222, 235, 255)
+        pdf.cell(30,5,"Zone", fill=True, border = True, align = "C")
+        self.__createOtherPDFData(pdf,otherData,"zone")
+        
+        if commonSchedules.head == None:
+            for i in self.__result:
+                if i.data.get("activityDate") >= self.__currentDate:
+                    self.__result = i
+                    break
+        else:
+            self.__createPDFRow(pdf,commonSchedules,True)
+
+    def __createOtherPDFData(self,pdf,otherData, category):
+        prev = self.__currentDate
+        copiedData = LinkedList()
+        for i in otherData:
+            copiedData.append(i.data)
+
+        if copiedData.head == None:
+            for i in range(7):
+                pdf.set_fill_color(255, 255, 255)
+                if i == 6:
+                    pdf.cell(35,5,f"", fill=True, border = True, align = "C", ln=True)
+                else:    
+                    pdf.cell(35,5,f"", fill=True, border = True, align = "C")
+        else:
+            for i in range(7):
+                # For Module
+                if copiedData.head != None:
+                    if prev != copiedData.head.data.get("activityDate"):
+                        if copiedData.head.data.get("activityDate").isoweekday() == i+1:
+                            prev = copiedData.head.data.get("activityDate")
+
+                            if i == 6:
+                                if category == "time":
+                                    pdf.cell(35,5,f"{copiedData.head.data.get('startTime')} ~ {copiedData.head.data.get('endTime')}", border=True, align="C", ln=True)
+                                    copiedData.pop()
+                                else:
+                                    pdf.cell(35,5,f"{self.__characterLimit(str(copiedData.pop().get(category)))}", border=True, align="C", ln=True)
+                            else:
+                                if category == "time":
+                                    pdf.cell(35,5,f"{copiedData.head.data.get('startTime')} ~ {copiedData.head.data.get('endTime')}", border=True, align="C")
+                                    copiedData.pop()
+                                else:
+                                    pdf.cell(35,5,f"{self.__characterLimit(str(copiedData.pop().get(category)))}", border=True, align="C")
+
+                            while copiedData.head != None and prev == copiedData.head.data.get("activityDate"):
+                                copiedData.pop()
+                        else:
+                            # After End
+                            if i == 6:
+                                pdf.cell(35,5,f"", border = True, align = "C",ln=True)
+                            else:
+                                pdf.cell(35,5,f"", border = True, align = "C")
+
+                elif copiedData.head == None:
+                    if i == 6: pdf.cell(35,5,"", border = True, align = "C", ln=True)
+                    else: pdf.cell(35,5,"", border = True, align = "C")
+
+    def __characterLimit(self, strVal) -> str:
+        # If the character is too big, only display first and last name
+        if len(strVal) > 25:
+            return strVal.split()[0] + " "+ strVal.split()[-1]
+        else:
+            return strVal
+        
+    def __generateRandomColor(self, resultType="hex"):
+        # Generate random color for grouping modules
+        h,s,l = random.random()*360, random.random(), 0.9
+        r,g,b = [int(256*i) for i in colorsys.hls_to_rgb(h,l,s)]
+        
+        if resultType == "hex":
+            result = '{:02x}{:02x}{:02x}'.format(r, g, b)
+        elif resultType == "rgb":
+            result = [int(r),int(g),int(b)]
+            
+        return result
@@ -1,22 +1,15 @@
 # ===== Import =====
 # GUI Class
-import os, csv # For reading data
+import os # For reading data
+import threading, queue # For loading schedules in the background
+import datetime # For date and time in the filters
 import tkinter as tk # For GUI Feature
 import ttkbootstrap as ttk # For modern tkinter GUI
 from ttkbootstrap.dialogs import Messagebox as mb # For error message
 from tkinter import filedialog as fd # For file directory
 
-# Data Handler Class and Display Handler Class
-import math # For hashtable size
-import datetime # For date and time in the schedule
-
-# Export Handler Class
-import random # For random color generator
-import colorsys # For erandom color generator
-from fpdf import FPDF # For editting pdf
-from openpyxl import Workbook # For editting Excel
-from openpyxl.utils import get_column_letter # # For changing index number to column letter
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill # For editting components of Excel
+# Handler Classes
+from timetableCore import DataHandler, DisplayHandler, ExportHandler, Query, LoadCancelled, ScheduleArchive, ArchiveDisplayHandler, weeklyHours
 
 
 """
@@ -29,1080 +22,20 @@ Module Download Requirements:
 
 
 
-# ===== Custom Data Structures =====
-class Node:
-    def __init__(self, data):
-        self.data = data
-        self.next = None
-
-    def __iter__(self):
-        currentNode = self
-        while currentNode:
-            yield currentNode
-            currentNode = currentNode.next
-
-class LinkedList:
-    def __init__(self):
-        self.head = None # Starting point of the linked list
-        self.tail = None # Tail is added for O(1) for appending
-    
-    def __iter__(self):
-        currentNode = self.head
-        while currentNode:
-            yield currentNode
-            currentNode = currentNode.next
-
-    def __contains__(self, node):
-        currentNode = self.head
-        while currentNode:
-            if currentNode.data == node:
-                return True
-            currentNode = currentNode.next
-
-    def append(self, data):
-        newNode = Node(data)
-        if self.head == None:
-            self.head = newNode
-            self.tail = newNode
-        
-        else:
-            self.tail.next = newNode
-            self.tail= newNode
-
-    def pop(self):
-        if self.head != None:
-            tmp = self.head
-            self.head = self.head.next
-            if self.head == None: self.tail = None
-            return tmp.data
-        else:
-            return None
-
-class HashNode: # Used for Hash table
-    def __init__(self, key = -1):
-        self.key = key
-        self.value = LinkedList() # Value is set to linked list to save schedule classes with same key
-        self.next = None # Used when hash value is same, but key is different
-
-class HashTable: # Used for storing schedules with same value.
-    def __init__(self, size):
-        self.cnt = int(math.floor(size * 1.3)) # Set the list size to reduce collisions
-        self.table = [HashNode() for _ in range(self.cnt)]
-
-    def customHash(self, key) -> int: # Generates hashed int value
-        key = str(key)
-        hashedKey = sum(ord(char) for char in key) % self.cnt
-        return hashedKey
-    
-    def add(self, key, data): # If key exits, append it to linked list. If not, create a Hashnode
-        currentNode = self.table[self.customHash(key)]
-        while currentNode.next:
-            if currentNode.next.key == key:
-                currentNode.next.value.append(data)
-                return
-            currentNode = currentNode.next
-
-        currentNode.next = HashNode(key)
-        currentNode.next.value.append(data)
-
-    def get(self, key) -> LinkedList: # Schedule classes are returned in linked list
-        currentNode = self.table[self.customHash(key)].next
-        while currentNode:
-            if currentNode.key == key:
-                return currentNode.value
-            currentNode = currentNode.next
-        return -1
-
-class Stack:
-    def __init__(self):
-        self.head = None
-    
-    def __iter__(self):
-        currentNode = self.head
-        while currentNode:
-            yield currentNode
-            currentNode = currentNode.next
-
-    def __contains__(self, node):
-        currentNode = self.head
-        while currentNode:
-            if currentNode.data == node:
-                return True
-            currentNode = currentNode.next
-
-    def push(self, data):
-        newNode = Node(data)
-        if self.head == None:
-            self.head = newNode
-        
-        else:
-            newNode.next = self.head
-            self.head = newNode
-
-    def isEmpty(self) -> bool:
-        if self.head == None:
-            return 1
-        else:
-            return 0
-
-    def pop(self) -> Node:
-        if self.isEmpty():
-            return None
-        else:
-            filteredLL = self.head
-            self.head = self.head.next
-            filteredLL.next = None
-            return filteredLL.data
-
-
-
-# ===== Schedule Class =====
-class Schedule():
-    def __init__(self, module:str, moduleCode:str, cohort:str, course:str, fullPart:str,
-                session:str, activityDate:str, scheduledDay:str,startTime:str,endTime:str,
-                duration:str,location:str,size:str,lecturer:str,zone:str):
-        self.__module = module
-        self.__moduleCode = moduleCode
-        self.__cohort = cohort
-        self.__course = course
-        self.__fullPart = fullPart
-        self.__session = session
-        self.__activityDate = activityDate
-        self.__scheduledDay = scheduledDay
-        self.__startTime = startTime
-        self.__endTime = endTime
-        self.__duration = duration
-        self.__location = location
-        self.__size = size
-        self.__lecturer = lecturer
-        self.__zone = zone
-    
-    def get(self, key): # Used for specific value
-        value = {
-            "module" : self.__module, "moduleCode" : self.__moduleCode, "cohort" : self.__cohort,
-            "course" : self.__course, "fullPart" : self.__fullPart, "session" : self.__session,
-            "activityDate" : self.__activityDate, "scheduledDay" : self.__scheduledDay,
-            "startTime" : self.__startTime, "endTime" : self.__endTime, "duration" : self.__duration,
-            "location" : self.__location, "size" : self.__size, "lecturer" : self.__lecturer, "zone" : self.__zone
-        }[key]
-        
-        return value
-    
-    def getAll(self) -> list: # Used for all values
-        li = [
-            self.__module, self.__moduleCode, self.__cohort, self.__course, self.__fullPart,
-            self.__session, self.__activityDate, self.__scheduledDay, self.__startTime,
-            self.__endTime, self.__duration, self.__location, self.__size, self.__lecturer, self.__zone
-        ]
-
-        return  li
-
-
-
-# ===== Handler Classes =====
-class DataHandler:
-    def __init__(self):
-        self.__schedules = LinkedList()
-        self.__filesPathList = []
-        self.__rangeList = [] # For initializing hash table. Contains below values in int
-
-        # To hand over the range number to DisplayHandler for intialization of Hash Table
-        self.__moduleRange = set()
-        self.__moduleCodeRange = set()
-        self.__cohortRange = set()
-        self.__courseRange = set()
-        self.__fullPartRange = set()
-        self.__sessionRange = set()
-        self.__activityDateRange = set()
-        self.__scheduledDayRange = set()
-        self.__startTimeRange = set()
-        self.__endTimeRange = set()
-        self.__durationRange = set()
-        self.__locationRange = set()
-        self.__sizeRange = set()
-        self.__lecturerRange = set()
-        self.__zoneRange = set()
-
-    def setSchedules(self):
-        self.__schedules.head = None  # Reset the head before storing the schedules
-        self.__resetRange() # Reset the range before storing the schedules
-
-        # Read CSV files from the path
-        for fileDirectory in self.__filesPathList:
-            with open(fileDirectory, "r") as csvfile:
-                csvData = csv.reader(csvfile, delimiter=",")
-                for row in csvData:
-                    if row[0] == '':
-                        continue
-
-                    # Extract certain values from the raw data
-                    module, moduleCode, cohort, course, fullPart, session = self.__extractData(row[1], row[2])
-
-                    # Set range
-                    self.__setRange(
-                        module, moduleCode, cohort, course, fullPart, session, self.__dateInput(row[3]),
-                        self.__dateInput(row[3]).isoweekday(), self.__timeInput(row[5]),
-                        self.__timeInput(row[6]),row[7].lstrip("0"), row[8], int(row[9]), row[10], row[11]
-                    )
-                    
-                    # Store schedule class into linked list
-                    self.__schedules.append(
-                        Schedule(
-                            module, moduleCode, cohort, course, fullPart, session, self.__dateInput(row[3]),
-                            self.__dateInput(row[3]).isoweekday(), self.__timeInput(row[5]), self.__timeInput(row[6]),
-                            row[7].lstrip("0"), row[8], int(row[9]), row[10], row[11]
-                        )
-                    )
-
-        # Storing size of range for optimal hashtable size
-        self.__rangeList = [len(self.__moduleRange), len(self.__moduleCodeRange), len(self.__cohortRange), len(self.__courseRange), len(self.__fullPartRange), 
-                            len(self.__sessionRange), len(self.__activityDateRange), len(self.__scheduledDayRange), len(self.__startTimeRange), len(self.__endTimeRange), 
-                            len(self.__durationRange), len(self.__locationRange), len(self.__sizeRange), len(self.__lecturerRange), len(self.__zoneRange)]
-
-    def getSchedules(self) -> Node:
-        return self.__schedules.head
-    
-    def getRangeList(self) -> list:
-        return self.__rangeList
-
-    def setFilesPathList(self, filesList:list):
-        self.__filesPathList = filesList
-
-    def getFilesPathList(self) -> list:
-        return self.__filesPathList
-
-    def setRange(self, schedules):
-        # Used externally for finding the range of each values
-        self.__resetRange()
-        try:
-            for i in schedules:
-                module, moduleCode, cohort, course, fullPart, session, activityDate, scheduleDay, startTime, endTime, duration, location, size, lecturer, zone = i.data.getAll()
-                self.__setRange(module, moduleCode, cohort, course, fullPart, session, activityDate, scheduleDay, startTime, endTime, duration, location, size, lecturer, zone)
-        except:
-            pass
-
-    def getRange(self, category) -> set: # Used for available options
-        value = {
-        "module": self.__moduleRange,
-        "moduleCode": self.__moduleCodeRange,
-        "cohort": self.__cohortRange,
-        "course": self.__courseRange,
-        "fullPart": self.__fullPartRange,
-        "session": self.__sessionRange,
-        "activityDate": self.__activityDateRange,
-        "scheduledDay": self.__scheduledDayRange,
-        "startTime": self.__startTimeRange,
-        "endTime": self.__endTimeRange,
-        "duration": self.__durationRange,
-        "location": self.__locationRange,
-        "size": self.__sizeRange,
-        "lecturer": self.__lecturerRange,
-        "zone": self.__zoneRange,
-        }[category]
-
-        return value
-
-    def __dateInput(self, strVal):
-        day, month, year = strVal.split("/")
-        return datetime.date(int(year),int(month),int(day))
-
-    def __timeInput(self, strVal):
-        hour, minute,second = strVal.split(":")
-        return datetime.time(int(hour),int(minute),int(second))
-
-    def __setRange(self, module:str, moduleCode:str, cohort:str, course:str, fullPart:str,
-                   session:str, activityDate:str, scheduleDay:str, startTime:str, endTime:str,
-                   duration:str, location:str, size:str, lecturer:str, zone:str):
-        # Internally used for initialization of hash table
-        self.__moduleRange.add(module)
-        self.__moduleCodeRange.add(moduleCode)
-        self.__cohortRange.add(cohort)
-        self.__courseRange.add(course)
-        self.__fullPartRange.add(fullPart)
-        self.__sessionRange.add(session)
-        self.__activityDateRange.add(activityDate)
-        self.__scheduledDayRange.add(scheduleDay)
-        self.__startTimeRange.add(startTime)
-        self.__endTimeRange.add(endTime)
-        self.__durationRange.add(duration)
-        self.__locationRange.add(location)
-        self.__sizeRange.add(size)
-        self.__lecturerRange.add(lecturer)
-        self.__zoneRange.add(zone)
-
-    def __extractData(self,name:str, description:str) -> list:
-        course,cohort,fullPart,moduleCode,session = name.split("_")
-        cohort = fullPart + "_" + cohort
-        module = description[4:].split(" (")[0]
-        
-        return [module, moduleCode, cohort, course, fullPart, session]
-    
-    def __resetRange(self):
-        self.__moduleRange.clear()
-        self.__moduleCodeRange.clear()
-        self.__cohortRange.clear()
-        self.__courseRange.clear()
-        self.__fullPartRange.clear()
-        self.__sessionRange.clear()
-        self.__activityDateRange.clear()
-        self.__scheduledDayRange.clear()
-        self.__startTimeRange.clear()
-        self.__endTimeRange.clear()
-        self.__durationRange.clear()
-        self.__locationRange.clear()
-        self.__sizeRange.clear()
-        self.__lecturerRange.clear()
-        self.__zoneRange.clear() 
-
-
-
-class DisplayHandler:
-    def __init__(self, schedulesHead:Node, rangeList:list):
-        # Only the head of the schedule is added for higher performance
-        self.__sortedSchedules = schedulesHead
-
-        # Used for filtering data.
-        self.__moduleHT = HashTable(rangeList[0])
-        self.__moduleCodeHT = HashTable(rangeList[1])
-        self.__cohortHT = HashTable(rangeList[2])
-        self.__courseHT = HashTable(rangeList[3])
-        self.__fullPartHT = HashTable(rangeList[4])
-        self.__sessionHT = HashTable(rangeList[5])
-        self.__activityDateHT = HashTable(rangeList[6])
-        self.__scheduledDayHT = HashTable(rangeList[7])
-        self.__startTimeHT = HashTable(rangeList[8])
-        self.__endTimeHT = HashTable(rangeList[9])
-        self.__durationHT = HashTable(rangeList[10])
-        self.__locationHT = HashTable(rangeList[11])
-        self.__sizeHT = HashTable(rangeList[12])
-        self.__lecturerHT = HashTable(rangeList[13])
-        self.__zoneHT = HashTable(rangeList[14])
-
-        # Initialize filters
-        if self.__sortedSchedules is not None:
-            for schedule in self.__sortedSchedules:
-                self.__moduleHT.add(schedule.data.get("module"), schedule.data)
-                self.__moduleCodeHT.add(schedule.data.get("moduleCode"), schedule.data)
-                self.__cohortHT.add(schedule.data.get("cohort"), schedule.data)
-                self.__courseHT.add(schedule.data.get("course"), schedule.data)
-                self.__fullPartHT.add(schedule.data.get("fullPart"), schedule.data)
-                self.__sessionHT.add(schedule.data.get("session"), schedule.data)
-                self.__activityDateHT.add(schedule.data.get("activityDate"), schedule.data)
-                self.__scheduledDayHT.add(schedule.data.get("scheduledDay"), schedule.data)
-                self.__startTimeHT.add(schedule.data.get("startTime"), schedule.data)
-                self.__endTimeHT.add(schedule.data.get("endTime"), schedule.data)
-                self.__durationHT.add(schedule.data.get("duration"), schedule.data)
-                self.__locationHT.add(schedule.data.get("location"), schedule.data)
-                self.__sizeHT.add(schedule.data.get("size"), schedule.data)
-                self.__lecturerHT.add(schedule.data.get("lecturer"), schedule.data)
-                self.__zoneHT.add(schedule.data.get("zone"), schedule.data)
-    
-    def getFilteredSchedule(self, category:str, specificValue:str) -> Node:
-        filteredLL = None
-
-        if category == "module":
-            filteredLL = self.__moduleHT.get(specificValue)
-        elif category == "moduleCode":
-            filteredLL = self.__moduleCodeHT.get(specificValue)
-        elif category == "cohort":
-            filteredLL = self.__cohortHT.get(specificValue)
-        elif category == "course":
-            filteredLL = self.__cohortHT.get(specificValue)
-        elif category == "fullPart":
-            filteredLL = self.__fullPartHT.get(specificValue)
-        elif category == "session":
-            filteredLL = self.__sessionHT.get(specificValue)
-        elif category == "activityDate":
-            filteredLL = self.__activityDateHT.get(specificValue)
-        elif category == "scheduledDay":
-            filteredLL = self.__scheduledDayHT.get(specificValue)
-        elif category == "startTime":
-            filteredLL = self.__startTimeHT.get(specificValue)
-        elif category == "endTime":
-            filteredLL = self.__endTimeHT.get(specificValue)
-        elif category == "duration":
-            filteredLL = self.__durationHT.get(specificValue)
-        elif category == "location":
-            filteredLL = self.__locationHT.get(specificValue)
-        elif category == "size":
-            filteredLL = self.__sizeHT.get(specificValue)
-        elif category == "lecturer":
-            filteredLL = self.__lecturerHT.get(specificValue)
-        elif category == "zone":
-            filteredLL = self.__zoneHT.get(specificValue)
-
-        if filteredLL is not None:
-            return filteredLL.head
-
-    def rangeSearch(self,start, end, category:str):
-        # Finds the schedules between two values and store them
-        if category == "time": # For Time - O(n)
-            self.sort("startTime")
-            head = None
-            endExit = False
-            for i in self.__sortedSchedules:
-                if i.data.get("startTime") >= start: # First schedule found
-                    if i.data.get("startTime") > end:
-                        endExit = True
-                        break
-                    head = i
-                    break
-
-            if endExit == False:
-                self.setCommonSchedules(head)
-                self.sort("endTime")
-                try:
-                    tail = self.__sortedSchedules
-                    for i in self.__sortedSchedules:
-                        if i.data.get("endTime") > end: # Last schedule found
-                            if tail is not None:
-                                tail.next = None
-                                if tail == self.__sortedSchedules: self.__sortedSchedules = None
-                            break
-                        tail = i
-                except:
-                    pass
-
-        else: # For Date - O(n)
-            self.sort(category)
-            head = None
-            endNode = None
-            startFound = False
-            for i in self.__sortedSchedules:
-                if i.data.get(category) >= start and startFound== False:
-                    head = i
-                    startFound = True
-                if i.data.get(category) > end:  
-                    if endNode is not None:
-                        endNode.next = None
-                    break
-                endNode = i
-            
-            self.__sortedSchedules = head
-
-    def getResult(self) -> Node:
-        return self.__sortedSchedules
-    
-    def sort(self, category:str, isAscending=True):
-        head = self.__sortedSchedules
-
-        self.__sortedSchedules = self.__mergeSort(head, category)
-
-        # For Descending Order
-        if self.__sortedSchedules is not None:
-            if isAscending == False:
-                stack = Stack()
-
-                for i in self.__sortedSchedules:
-                    stack.push(i)
-
-                newHead = currentNode = stack.pop()
-
-                while not stack.isEmpty():
-                    currentNode.next = stack.pop()
-                    currentNode = currentNode.next
-
-                currentNode.next = None
-
-                self.__sortedSchedules = newHead
-
-    def setCommonSchedules(self, filteredSchedules:Node) -> Node:
-        # Used for multiple filtering and range sort features
-        node1 = self.__sortedSchedules
-        node2 = filteredSchedules
-        resultLinkedList = LinkedList()
-        availabilityCheck = set()
-        while node2 is not None:
-            availabilityCheck.add(node2.data)
-            node2 = node2.next
-
-        while node1 is not None:
-            if node1.data in availabilityCheck:
-                resultLinkedList.append(node1.data)
-            node1 = node1.next
-
-        self.__sortedSchedules = resultLinkedList.head
-
-    def exportResult(self):
-        # Result specifically for export as it requires "sort by date"
-        newLinkedList = LinkedList()
-        for i in self.__sortedSchedules:
-            newLinkedList.append(i.data)
-        return self.__mergeSort(newLinkedList.head,"activityDate")
-
-    def __mergeSort(self, head:Node, category:str) -> Node:
-        if head is None or head.next is None:
-            return head
-
-        mid = self.__split(head)
-        left = head
-        right = mid.next
-        mid.next = None 
-
-        left = self.__mergeSort(left, category)
-        right = self.__mergeSort(right, category)
-
-        sortedHead = self.__merge(left, right, category)
-
-        return sortedHead
-
-    def __split(self, head:Node):
-        half = head
-        end = head
-
-        while end.next is not None and end.next.next is not None:
-            half = half.next
-            end = end.next.next
-
-        return half
-
-    def __merge(self, left:Node, right:Node, category:str) -> Node: 
-        startNode = Node(None)
-        currentNode = startNode
-
-        # Loop through to sort between two linked lists
-        while left is not None and right is not None:
-            if left.data.get(category) < right.data.get(category):
-                currentNode.next = left
-                left = left.next
-            else:
-                currentNode.next = right
-                right = right.next
-
-            currentNode = currentNode.next
-
-        # After One side is done sorting, add the rest values
-        if left is not None:
-            currentNode.next = left
-        elif right is not None:
-            currentNode.next = right
-
-        return startNode.next  # Because first Node was used to create rest of the nodes
-
-
-
-class ExportHandler:
-    def __init__(self):
-        self.__result = LinkedList()
-        self.__path = ""
-        self.__groupedModules = {}
-
-    def setResult(self, result:LinkedList, path:str):
-        self.__result = result
-        self.__path = path
-
-    def exportExcel(self):
-        # Reset values for repeated process
-        self.__startingRow = 12
-        self.__weekCnt = 1
-        self.__minDate = datetime.date(3000,1,1)
-        self.__maxDate = datetime.date(1000,1,1)
-        self.__groupedModules = {}
-
-        # Border width predefine
-        self.__thick = Side(border_style="medium")
-        self.__thin = Side(border_style="thin",color="808080")
-        self.__getHeaderData()
-
-        wb = Workbook()
-        ws = wb.active
-
-        # First Row with small width
-        ws.column_dimensions['A'].width = 5
-
-        # Default Row width
-        col = 2
-        while col < 10:
-            i = get_column_letter(col)
-            ws.column_dimensions[i].width = 30
-            col += 1
-
-        # PSB logo
-        ws.merge_cells('B4:B7')
-        ws['B4'].font = Font(size=76,color="902108",name='Times New Roman', bold=True)
-        ws['B4'].alignment = Alignment(horizontal="center",vertical="center")
-        ws['B4'] = "PSB"
-
-        # ACADEMY logo
-        ws.row_dimensions[8].height = 20
-        ws.row_dimensions[9].height = 20
-        ws.merge_cells('B8:B9')
-        ws['B8'].font = Font(size=36,color="7F7F7F",name='Calibri', bold=True)
-        ws['B8'].alignment = Alignment(horizontal="center",vertical="center")
-        ws['B8'] = "Academy"
-
-        # Grouped Module list header
-        ws.merge_cells('D4:E4')
-        ws['D4'].alignment = Alignment(horizontal="left",vertical="center")
-        ws['D4'] = "Module"
-        ws['F4'] = "Cohort"
-        ws['G4'] = "Lecturer"
-        ws['H4'] = "Full-time / Part-time"
-        ws['I4'] = "Date Start - Date End"
-
-        ws['D4'].border = Border(left=self.__thick,top=self.__thick,bottom=self.__thick)
-        ws['E4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thin)
-        ws['F4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thin)
-        ws['G4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thin)
-        ws['H4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thin)
-        ws['I4'].border = Border(top=self.__thick,bottom=self.__thick,right=self.__thick)
-
-        ws['D4'].fill = PatternFill("solid", start_color="AACDFF")
-        ws['F4'].fill = PatternFill("solid", start_color="AACDFF")
-        ws['G4'].fill = PatternFill("solid", start_color="AACDFF")
-        ws['H4'].fill = PatternFill("solid", start_color="AACDFF")
-        ws['I4'].fill = PatternFill("solid", start_color="AACDFF")
-
-        # Grouped Module Data Insert
-        i = 5
-        for _, value in self.__groupedModules.items():
-            module, cohort, lecturer, fullPart = value[0], value[1], value[2], value[3]
-            ws.merge_cells('D'+str(i)+':'+"E"+str(i))
-            ws["D" + str(i)] = module
-            ws["F" + str(i)] = cohort
-            ws["G" + str(i)] = lecturer
-            ws["H" + str(i)] = fullPart
-            ws["I" + str(i)] = str(value[5]) + " - " + str(value[6])
-            ws["D" + str(i)].fill = PatternFill("solid", start_color=value[4])
-
-            ws["D" + str(i)].border = Border(left=self.__thick,bottom=self.__thin)
-            ws["E" + str(i)].border = Border(bottom=self.__thin,right=self.__thin)
-            ws["F" + str(i)].border = Border(bottom=self.__thin,right=self.__thin)
-            ws["G" + str(i)].border = Border(bottom=self.__thin,right=self.__thin)
-            ws["H" + str(i)].border = Border(bottom=self.__thin,right=self.__thin)
-            ws["I" + str(i)].border = Border(bottom=self.__thin,right=self.__thick)
-            if len(self.__groupedModules.items())-1 == i-5:
-                ws["D" + str(i)].border = Border(left=self.__thick,bottom=self.__thick)
-                ws["E" + str(i)].border = Border(bottom=self.__thick,right=self.__thin)
-                ws["F" + str(i)].border = Border(bottom=self.__thick,right=self.__thin)
-                ws["G" + str(i)].border = Border(bottom=self.__thick,right=self.__thin)
-                ws["H" + str(i)].border = Border(bottom=self.__thick,right=self.__thin)
-                ws["I" + str(i)].border = Border(bottom=self.__thick,right=self.__thick)
-            ws.row_dimensions[i].height = 20
-            i+=1
-
-        # Define the Starting row
-        self.__startingRow = 12
-        if len(self.__groupedModules.items()) > 5:
-            self.__startingRow += len(self.__groupedModules.items())-4
-
-        # Build Main Schedule table
-        self.currentDate = self.__minDate
-        self.weekStartMarked = False
-        self.__createExcelHeading(ws)
-        self.__createExcelRow(ws)
-        moduleRow = self.__startingRow
-        createdRow = 1
-        stream = 1
-        prevDate = self.__minDate - datetime.timedelta(days=1)
-
-        # Insert schedules
-        for schedule in self.__result:
-            date = schedule.data.get("activityDate")
-            # if new heading has to be created
-            while date >= self.currentDate:
-                date = schedule.data.get("activityDate")
-                self.__createExcelHeading(ws)
-                self.__createExcelRow(ws)
-                moduleRow = self.__startingRow
-                createdRow = 1
-                stream = 1
-
-            # if the schedule is the first to go in the date
-            if date != prevDate:
-                stream = 1
-                insertingCell = get_column_letter(date.isoweekday()+2) + str(moduleRow - 6)
-                ws[insertingCell] = schedule.data.get("moduleCode") + " (" + schedule.data.get("fullPart")+")"
-                ws[insertingCell].fill = PatternFill("solid", start_color=self.__groupedModules[f"{schedule.data.get('module')}{schedule.data.get('cohort')}{schedule.data.get('lecturer')}{schedule.data.get('fullPart')}"][4])
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 5)] = str(schedule.data.get("startTime"))[:-3] + " ~ " + str(schedule.data.get("endTime"))[:-3]
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 4)] = self.__characterLimit(schedule.data.get("lecturer"))
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 3)] = schedule.data.get("location")
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 2)] = schedule.data.get("size")
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 1)] = schedule.data.get("zone")
-            
-            # If the schedule has to go to second ~ # rows
-            else:
-                stream += 1
-                # If I need to create a new row for new data
-                if createdRow < stream:
-                    self.__createExcelRow(ws)
-                    createdRow += 1
-                # Insert schedule
-                insertingCell = get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6))
-                ws[insertingCell] = schedule.data.get("moduleCode") + " (" + schedule.data.get("fullPart")+")"
-                ws[insertingCell].fill = PatternFill("solid", start_color=self.__groupedModules[f"{schedule.data.get('module')}{schedule.data.get('cohort')}{schedule.data.get('lecturer')}{schedule.data.get('fullPart')}"][4])
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+1)] = str(schedule.data.get("startTime"))[:-3] + " ~ " + str(schedule.data.get("endTime"))[:-3]
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+2)] = self.__characterLimit(schedule.data.get("lecturer"))
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+3)] = schedule.data.get("location")
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+4)] = schedule.data.get("size")
-                ws[get_column_letter(date.isoweekday()+2) + str(moduleRow - 12 + (stream*6)+5)] = schedule.data.get("zone")
-            prevDate = date
-
-
-        # Remove the frid lines and headers in Excel for clean view
-        ws.sheet_view.showGridLines = False
-        ws.sheet_view.showRowColHeaders = False
-
-        wb.save(self.__path+"/Excel_Timetable.xlsx")
-
-    def exportPDF(self):
-        self.__weekStartMarked = False
-        self.__weekCnt = 1
-        self.__minDate = datetime.date(3000,1,1)
-        self.__maxDate = datetime.date(1000,1,1)
-        self.__groupedModules = {}
-
-        pdf =  FPDF('L','mm',(500,300))
-        pdf.add_page()
-
-        # PSB Logo
-        pdf.set_font("times","B",30)
-        pdf.set_text_color(158,36,36)
-        pdf.cell(33,8,"PSB",ln=True,border=0,align="C")
-
-        # Academy Logo
-        pdf.set_font("helvetica","B",12)
-        pdf.set_text_color(156,156,156)
-        pdf.cell(33,5,"Academy",border=0,ln=True,align="C")
-        pdf.cell(33,5,"",ln=True)
-
-        # Table header for grouped modules
-        pdf.set_font("helvetica", "B", 7)
-        pdf.set_text_color(0,0,0)
-        pdf.set_fill_color(170, 205, 255)
-        pdf.cell(60,5,"Module", border=True, fill=True)
-        pdf.cell(20,5,"Cohort", border=True, fill=True)
-        pdf.cell(50,5,"Lecturer", border=True, fill=True)
-        pdf.cell(30,5,"Full-time/Part-time", border=True, fill=True)
-        pdf.cell(30,5,"Date Start - Date End", border=True, fill=True, ln=True)
-
-        # Table for grouped modules
-        self.__getHeaderData(False)
-        self.__currentDate = self.__minDate
-        pdf.set_font("helvetica", "", 7)
-        pdf.set_text_color(0,0,0)
-        for i, value in self.__groupedModules.items():
-            pdf.set_fill_color(value[4][0],value[4][1],value[4][2])
-            pdf.cell(60,5,f"{value[0]}",border=True, fill=True)
-            pdf.cell(20,5,f"{value[1]}",border=True, fill=True)
-            pdf.cell(50,5,f"{value[2]}",border=True, fill=True)
-            pdf.cell(30,5,f"{value[3]}",border=True, fill=True)
-            pdf.cell(30,5,f"{value[5]} - {value[6]}",border=True, fill=True, ln=True)
-
-        pdf.cell(30,5,"", ln=True)
-
-        # Header for Schedules table
-        while self.__currentDate < self.__maxDate:
-            self.__createPDFHeading(pdf)
-            self.__createPDFRow(pdf)
-
-        pdf.output(self.__path+"/PDF_Timetable.pdf")
-
-    def __getHeaderData(self, isExcel = True): # Used for finding the grouped schedules
-        if isExcel == True: colorVar = "hex"
-        else: colorVar = "rgb"
-
-        groupingSchedule = {}
-        for i in self.__result:
-            strVal = f"{i.data.get('module')}{i.data.get('cohort')}{i.data.get('lecturer')}{i.data.get('fullPart')}"
-            # If the schedule is first time recording
-            if strVal not in groupingSchedule:
-                minDate, maxDate = i.data.get("activityDate"), i.data.get("activityDate")
-                groupingSchedule[strVal] = [i.data.get('module')+' '+i.data.get('moduleCode'),i.data.get('cohort'),i.data.get('lecturer'),i.data.get('fullPart'),self.__generateRandomColor(colorVar), minDate, maxDate]
-
-            # If it has been recorded
-            else:
-                minDate = groupingSchedule[strVal][5]
-                maxDate = groupingSchedule[strVal][6]
-                # Finding the starting and ending date of each group
-                if minDate > i.data.get("activityDate"):
-                    minDate = i.data.get("activityDate")
-                if maxDate < i.data.get("activityDate"):
-                    maxDate = i.data.get("activityDate")
-
-                groupingSchedule.update({strVal:[i.data.get('module')+' '+i.data.get('moduleCode'),i.data.get('cohort'),i.data.get('lecturer'),i.data.get('fullPart'),self.__generateRandomColor(colorVar), minDate, maxDate]})
-
-            if i.data.get("activityDate") < self.__minDate: self.__minDate = i.data.get("activityDate")
-            if i.data.get("activityDate") > self.__maxDate: self.__maxDate = i.data.get("activityDate")
-
-        self.__groupedModules = groupingSchedule
-    
-    def __createExcelHeading(self, ws): # Used for creating heading with days and dates
-        # 
-        headingFont = Font(size=14, bold=True, underline="single")
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        for i in range(8):
-            currentColumnLetter = get_column_letter(i+2)
-            currentCell = currentColumnLetter + str(self.__startingRow)
-            bottomCell = currentColumnLetter + str(self.__startingRow+1)
-            
-            # For the Week columns
-            if currentColumnLetter == "B":
-                ws.merge_cells('B' + str(self.__startingRow)+':'+'B'+ str(self.__startingRow+1))
-                ws[currentCell] = "Week" + str(self.__weekCnt)
-                ws[currentCell].border = Border(left=self.__thick, top=self.__thick,right=self.__thick)
-                ws[bottomCell].border = Border(left=self.__thick, bottom=self.__thick, right=self.__thick)
-
-            # For the Days and date columns
-            else:
-                currentCell = currentColumnLetter + str(self.__startingRow)
-                ws[currentCell] = days[i-1]
-                ws[currentCell].border = Border(top=self.__thick,right=self.__thin)
-                ws[bottomCell].border = Border(bottom=self.__thick, right=self.__thin)
-                if currentColumnLetter == "I":
-                    ws[currentCell].border = Border(top=self.__thick,right=self.__thick)
-                    ws[bottomCell].border = Border(bottom=self.__thick,right=self.__thick)
-                
-
-            # Font and color on all cells
-            ws[currentCell].font = headingFont
-            ws[currentCell].fill = PatternFill("solid", start_color="AACDFF")
-            ws[bottomCell].fill = PatternFill("solid", start_color="AACDFF")
-            ws[currentCell].alignment = Alignment(horizontal="center",vertical="center")
-            ws[bottomCell].alignment = Alignment(horizontal="center",vertical="center")
-        
-        # Entering Date
-        
-        for i in range(7):
-            currentColumnLetter = get_column_letter(i+3)
-            currentCell = currentColumnLetter + str(self.__startingRow+1)
-            if self.__weekCnt == 1 and not self.weekStartMarked:
-                if self.currentDate.isoweekday() == i+1:
-                    ws[currentCell] = self.currentDate
-                    self.weekStartMarked = True
-                
-            # If start has marked
-            else:
-                ws[currentCell] = self.currentDate
-
-            if self.weekStartMarked == True:
-                self.currentDate += datetime.timedelta(days=1)
-
-        self.__weekCnt += 1
-        self.__startingRow += 2
-
-    def __createExcelRow(self,ws): # Used for creating empty schedules row frame
-        detailList = ["Module", "Time", "Lecturer", "Location", "Size", "Zone"]
-        ws.row_dimensions[self.__startingRow].height = 70
-        # Left Column border and data setting
-        for i in range(6):
-            currentCell = "B" + str(i + self.__startingRow)
-            ws[currentCell] = detailList[i]
-            ws[currentCell].fill = PatternFill("solid", start_color="AACDFF")
-            ws[currentCell].font = Font(bold = True, size=14)
-            ws[currentCell].alignment = Alignment(horizontal="center",vertical="center")
-            ws[currentCell].border = Border(bottom=self.__thin,right=self.__thick,left=self.__thick)
-
-        ws["B" + str(5 + self.__startingRow)].border = Border(bottom=self.__thick,right=self.__thick,left=self.__thick)
-
-        # Setting the font and border for the actual values
-        for i in range(7):
-            for j in range(6):
-                currentColumnLetter = get_column_letter(i+3)
-                currentCell = currentColumnLetter + str(j+self.__startingRow)
-                ws[currentCell].font = Font(size=14)
-                ws[currentCell].border = Border(bottom=self.__thin,right=self.__thin)
-                ws[currentCell].alignment = Alignment(horizontal="center",vertical="center")
-                if j == 5:
-                    ws[currentCell].border = Border(bottom=self.__thick,right=self.__thin)
-                if i == 6:
-                    ws[currentCell].border = Border(bottom=self.__thin,right=self.__thick)
-                if j == 5 and i == 6:
-                    ws[currentCell].border = Border(bottom=self.__thick,right=self.__thick)
-
-        self.__startingRow += 6
-
-    def __createPDFHeading(self, pdf):
-        pdf.set_font("helvetica", "B", 7)
-        pdf.set_fill_color(170, 205, 255)
-        pdf.cell(30,10, f"Week{self.__weekCnt}", border=True, fill=True, align="C")
-        pdf.cell(35,5, "Monday", border=True, fill=True, align="C")
-        pdf.cell(35,5, "Tuesday", border=True, fill=True, align="C")
-        pdf.cell(35,5, "Wednesday", border=True, fill=True, align="C")
-        pdf.cell(35,5, "Thursday", border=True, fill=True, align="C")
-        pdf.cell(35,5, "Friday", border=True, fill=True, align="C")
-        pdf.cell(35,5, "Saturday", border=True, fill=True, align="C")
-        pdf.cell(35,5, "Sunday", border=True, fill=True, align="C", ln=True)
-        pdf.cell(30,5, "", border=False,fill=False)
-        
-        # Adding date in the cell
-        for i in range(7):
-            pdf.set_font("helvetica", "", 7)
-            if self.__weekCnt == 1 and not self.__weekStartMarked:
-                if self.__currentDate.isoweekday() == i+1 and i == 6:
-                    pdf.cell(35,5,f"{self.__currentDate}",fill=True, border=True, ln=True, align="C")
-                    self.__weekStartMarked = True
-                elif self.__currentDate.isoweekday() == i+1:
-                    pdf.cell(35,5,f"{self.__currentDate}",fill=True,border=True, align="C")
-                    self.__weekStartMarked = True
-                else:
-                    pdf.cell(35,5,"",fill=True,border=True)
-            else:
-                if i == 6:
-                    pdf.cell(35,5,f"{self.__currentDate}",fill=True,border=True, align="C", ln=True)
-                else:    
-                    pdf.cell(35,5,f"{self.__currentDate}",fill=True,border=True, align="C")
-
-            if self.__weekStartMarked == True:
-                self.__currentDate += datetime.timedelta(days=1)
-        
-        self.__weekCnt += 1
-        
-    def __createPDFRow(self, pdf, commonSchedules = LinkedList(), common = False):
-        pdf.set_font("helvetica", "B", 7)
-        # Module row schedule input
-        pdf.set_fill_color(222, 235, 255)
-        pdf.cell(30,25,"Module", fill=True, border = True, align = "C")
-        currentWeekSchedules = LinkedList()
-
-
-        # Adding the current schedule
-
-        if common == False:
-            for schedule in self.__result:
-                if schedule.data.get("activityDate") < self.__currentDate:
-                    currentWeekSchedules.append(schedule.data)
-                else:
-                    break
-        else:
-            currentWeekSchedules = commonSchedules
-            commonSchedules= LinkedList()
-
-        otherData = LinkedList()
-
-        prev = self.__currentDate
-        if currentWeekSchedules.head == None:
-            for i in range(7):
-                pdf.set_fill_color(255, 255, 255)
-                if i == 6:
-                    pdf.cell(35,25,f"", fill=True, border = True, align = "C", ln=True)
-                else:
-                    pdf.cell(35,25,f"", fill=True, border = True, align = "C")
-        else:
-            for i in range(7):
-                # For Module
-                if currentWeekSchedules.head != None:
-                    if prev != currentWeekSchedules.head.data.get("activityDate"):
-                        if currentWeekSchedules.head.data.get("activityDate").isoweekday() == i+1:
-                            prev = currentWeekSchedules.head.data.get("activityDate")
-                            r,g,b = self.__groupedModules[f"{currentWeekSchedules.head.data.get('module')}{currentWeekSchedules.head.data.get('cohort')}{currentWeekSchedules.head.data.get('lecturer')}{currentWeekSchedules.head.data.get('fullPart')}"][4]
-                            pdf.set_fill_color(r,g,b)
-                            otherData.append(currentWeekSchedules.head.data)
-                            if i == 6:
-                                pdf.cell(35,25,f"{currentWeekSchedules.pop().get('moduleCode')}", fill=True, border=True, align="C", ln=True)
-                            else:
-                                pdf.cell(35,25,f"{currentWeekSchedules.pop().get('moduleCode')}", fill=True, border=True, align="C")
-
-                            while currentWeekSchedules.head != None and prev == currentWeekSchedules.head.data.get("activityDate"):
-                                commonSchedules.append(currentWeekSchedules.head.data)
-                                currentWeekSchedules.pop()
-                        else:
-                            pdf.cell(35,25,f"", border = True, align = "C")
-
-                elif currentWeekSchedules.head == None:
-                    pdf.set_fill_color(255, 255, 255)
-                    if i == 6: pdf.cell(35,25,"", border = True, align = "C", ln=True)
-                    else: pdf.cell(35,25,"", border = True, align = "C")
-
-
-        pdf.set_fill_color(222, 235, 255)
-        pdf.cell(30,5,"Time", fill=True, border = True, align = "C")
-        self.__createOtherPDFData(pdf,otherData,"time")
-        pdf.set_fill_color(222, 235, 255)
-        pdf.cell(30,5,"Lecturer", fill=True, border = True, align = "C")
-        self.__createOtherPDFData(pdf,otherData,"lecturer")
-        pdf.set_fill_color(222, 235, 255)
-        pdf.cell(30,5,"Location", fill=True, border = True, align = "C")
-        self.__createOtherPDFData(pdf,otherData,"location")
-        pdf.set_fill_color(222, 235, 255)
-        pdf.cell(30,5,"Size", fill=True, border = True, align = "C")
-        self.__createOtherPDFData(pdf,otherData,"size")
-        pdf.set_fill_color(222, 235, 255)
-        pdf.cell(30,5,"Zone", fill=True, border = True, align = "C")
-        self.__createOtherPDFData(pdf,otherData,"zone")
-        
-        if commonSchedules.head == None:
-            for i in self.__result:
-                if i.data.get("activityDate") >= self.__currentDate:
-                    self.__result = i
-                    break
-        else:
-            self.__createPDFRow(pdf,commonSchedules,True)
-
-    def __createOtherPDFData(self,pdf,otherData, category):
-        prev = self.__currentDate
-        copiedData = LinkedList()
-        for i in otherData:
-            copiedData.append(i.data)
-
-        if copiedData.head == None:
-            for i in range(7):
-                pdf.set_fill_color(255, 255, 255)
-                if i == 6:
-                    pdf.cell(35,5,f"", fill=True, border = True, align = "C", ln=True)
-                else:    
-                    pdf.cell(35,5,f"", fill=True, border = True, align = "C")
-        else:
-            for i in range(7):
-                # For Module
-                if copiedData.head != None:
-                    if prev != copiedData.head.data.get("activityDate"):
-                        if copiedData.head.data.get("activityDate").isoweekday() == i+1:
-                            prev = copiedData.head.data.get("activityDate")
-
-                            if i == 6:
-                                if category == "time":
-                                    pdf.cell(35,5,f"{copiedData.head.data.get('startTime')} ~ {copiedData.head.data.get('endTime')}", border=True, align="C", ln=True)
-                                    copiedData.pop()
-                                else:
-                                    pdf.cell(35,5,f"{self.__characterLimit(str(copiedData.pop().get(category)))}", border=True, align="C", ln=True)
-                            else:
-                                if category == "time":
-                                    pdf.cell(35,5,f"{copiedData.head.data.get('startTime')} ~ {copiedData.head.data.get('endTime')}", border=True, align="C")
-                                    copiedData.pop()
-                                else:
-                                    pdf.cell(35,5,f"{self.__characterLimit(str(copiedData.pop().get(category)))}", border=True, align="C")
-
-                            while copiedData.head != None and prev == copiedData.head.data.get("activityDate"):
-                                copiedData.pop()
-                        else:
-                            # After End
-                            if i == 6:
-                                pdf.cell(35,5,f"", border = True, align = "C",ln=True)
-                            else:
-                                pdf.cell(35,5,f"", border = True, align = "C")
-
-                elif copiedData.head == None:
-                    if i == 6: pdf.cell(35,5,"", border = True, align = "C", ln=True)
-                    else: pdf.cell(35,5,"", border = True, align = "C")
-
-    def __characterLimit(self, strVal) -> str:
-        # If the character is too big, only display first and last name
-        if len(strVal) > 25:
-            return strVal.split()[0] + " "+ strVal.split()[-1]
-        else:
-            return strVal
-        
-    def __generateRandomColor(self, resultType="hex"):
-        # Generate random color for grouping modules
-        h,s,l = random.random()*360, random.random(), 0.9
-        r,g,b = [int(256*i) for i in colorsys.hls_to_rgb(h,l,s)]
-        
-        if resultType == "hex":
-            result = '{:02x}{:02x}{:02x}'.format(r, g, b)
-        elif resultType == "rgb":
-            result = [int(r),int(g),int(b)]
-            
-        return result
-
-
-
 # ===== GUI Class =====
 class GUI(ttk.Window):
+    pageSize = 500 # Schedules shown on one page of the table
+
     def __init__(self):
         # Initialize Data Handler when program initialize
         self.__dataHandler = DataHandler()
         self.__exportHandler = ExportHandler()
+        self.__query = Query() # Filters chosen on the view page
+        self.__folderPath = "" # Folder is listed again when the files are reloaded
+        self.__deletedFiles = set() # Files deleted by the user are not listed again when reloading
+        self.__archivePath = "" # SQLite archive the files are added to. Schedules are kept in memory without one
+        self.__pageStart = 0 # Position in the result of the first schedule shown in the table
+        self.__displayHandler = None # Handler of the loaded schedules. None before the first load
 
         # Make a window setting
         self.__initProgram() # Set all GUI components and features
@@ -1185,6 +118,7 @@ class GUI(ttk.Window):
         self.__scrollbar = ttk.Scrollbar(self.__loadPage, orient="vertical",command=self.__fileTree.yview)
         self.__deleteBtn = ttk.Button(self.__loadPage, text="Delete", style="s.danger.Outline.TButton", command=lambda:[self.__deleteFile()])
         self.__clearBtn = ttk.Button(self.__loadPage, text="Clear", style="s.warning.Outline.TButton", command=lambda:[self.__clearAllFiles()])
+        self.__archiveButton = ttk.Button(self.__loadPage, text="Archive: None", bootstyle="secondary-outline", command=lambda:[self.__queryArchivePath()])
         self.__backHomeButton = ttk.Button(self.__loadPage, text="Back", style="mid.TButton", command=lambda:[self.__showPage(self.__mainPage)])
         self.__nextButton = ttk.Button(self.__loadPage, text="Next", style="mid.TButton", command=lambda:[self.__showPage(self.__viewPage)])
 
@@ -1196,6 +130,7 @@ class GUI(ttk.Window):
         self.__fileTree.configure(yscrollcommand=self.__scrollbar.set)
         self.__deleteBtn.grid(row=2, column=1, sticky="n", pady=(5,0), padx=(100,0))
         self.__clearBtn.grid(row=2, column=1, sticky="n", pady=(5,0), padx=(0,100))
+        self.__archiveButton.grid(row=2, column=1, sticky="n", pady=(45,0))
         self.__backHomeButton.grid(row=2,column=0, sticky="s", pady=(0,20), padx=(0,0), ipadx=20, ipady=5)
         self.__nextButton.grid(row=2,column=2, sticky="s", pady=(0,20), padx=(0,0), ipadx=20, ipady=5)
 
@@ -1236,11 +171,13 @@ class GUI(ttk.Window):
         self.__filterFrame.rowconfigure(7,weight=1)
         self.__filterFrame.rowconfigure(8,weight=1)
         self.__filterFrame.rowconfigure(9,weight=1)
+        self.__filterFrame.rowconfigure(10,weight=1)
 
         # Setting for the table frame
         self.__tableFrame.columnconfigure(0, weight=1)
         self.__tableFrame.rowconfigure(0, weight=1)
         self.__tableFrame.rowconfigure(1, weight=5)
+        self.__tableFrame.rowconfigure(2, weight=0)
         
 
         # Predefining font and button styles
@@ -1312,6 +249,39 @@ class GUI(ttk.Window):
         self.__backLoadButton = ttk.Button(self.__filterFrame, text="Back", bootstyle="primary",command=lambda:[self.__showPage(self.__loadPage)])
         self.__scheduleLabel = ttk.Label(self.__tableFrame, text="Schedules", font=titleFont)
         self.__resetSchedulesButton = ttk.Button(self.__filterFrame, text="Reset", style="reset.danger.Outline.TButton",command=lambda:[self.__showPage(self.__viewPage)])
+        self.__reloadButton = ttk.Button(self.__tableFrame, text="Reload Files", bootstyle="primary-outline", command=lambda:[self.__reloadFiles()])
+        self.__undoButton = ttk.Button(self.__tableFrame, text="Undo", bootstyle="secondary-outline", command=lambda:[self.__undoFilter()])
+        self.__redoButton = ttk.Button(self.__tableFrame, text="Redo", bootstyle="secondary-outline", command=lambda:[self.__redoFilter()])
+
+        # Applied Filters Menu button, for removing one of the chosen filters
+        self.__appliedFiltersMenu = ttk.Menubutton(self.__tableFrame, style="primary.Outline.TMenubutton", text="Filters (0)")
+        self.__cacheLabel = ttk.Label(self.__tableFrame, text="") # Hits and misses of the query cache
+
+        # Paging of the table, so only one page of the result is put in the table at a time
+        self.__previousPageButton = ttk.Button(self.__tableFrame, text="Previous", bootstyle="secondary-outline", command=lambda:[self.__displaySchedules(self.__pageStart - self.pageSize)])
+        self.__nextPageButton = ttk.Button(self.__tableFrame, text="Next", bootstyle="secondary-outline", command=lambda:[self.__displaySchedules(self.__pageStart + self.pageSize)])
+        self.__pageLabel = ttk.Label(self.__tableFrame, text="")
+        self.__clashesButton = ttk.Button(self.__tableFrame, text="Find Clashes", bootstyle="warning-outline", command=lambda:[self.__showClashes()])
+        self.__heatmapButton = ttk.Button(self.__tableFrame, text="Room Heatmap", bootstyle="info-outline", command=lambda:[self.__showHeatmap()])
+        self.__reportButton = ttk.Button(self.__tableFrame, text="Workload Report", bootstyle="success-outline", command=lambda:[self.__showReport()])
+
+        # Interval Menu button, using the start and end date with the start and end time
+        self.__intervalMenu = ttk.Menubutton(self.__filterFrame, style="primary.Outline.TMenubutton", text="Sessions")
+        intervalOptions = ttk.Menu(self.__intervalMenu)
+        intervalOptions.add_command(label="Overlapping start to end", command=lambda:[self.__queryInterval("overlap")])
+        intervalOptions.add_command(label="Running at start", command=lambda:[self.__queryInterval("contains")])
+        intervalOptions.add_command(label="Within start to end", command=lambda:[self.__queryInterval("enclosed")])
+        intervalOptions.add_separator()
+        intervalOptions.add_command(label="Free rooms on start date", command=lambda:[self.__showFreeRooms()])
+        intervalOptions.add_command(label="Common free time from start to end date", command=lambda:[self.__showFreeSlots()])
+        self.__intervalMenu['menu'] = intervalOptions
+
+        # Search box over the module, lecturer and location values. Picking a result applies it as a filter
+        self.__searchResults = {} # Shown text of each search result, with its category and value
+        self.__searchLabel = ttk.Label(self.__filterFrame, text="Search", font=("Arial",13, "bold"), bootstyle="inverse-light")
+        self.__searchBox = ttk.Combobox(self.__filterFrame, bootstyle="primary")
+        self.__searchBox.bind("<KeyRelease>", lambda event:[self.__searchValues()])
+        self.__searchBox.bind("<<ComboboxSelected>>", lambda event:[self.__selectSearchResult()])
 
         # Export Menu button
         self.__exportMenu = ttk.Menubutton(self.__filterFrame, style="primary.Outline.TMenubutton", text="Export")
@@ -1351,19 +321,51 @@ class GUI(ttk.Window):
             sortByOptions.add_radiobutton(label=x, variable=self.__sortByVar, command=lambda x=x:self.__selectedValue("sortBy",x,self.__sortIn.get()))
         self.__sortByMenu['menu'] = sortByOptions
 
+        # Then By menu button. Each pick sorts schedules with equal values by one more category
+        self.__thenBySelection = [] # Names of the categories after the sort by category
+        self.__thenByMenu = ttk.Menubutton(self.__tableFrame, style="new.primary.Outline.TMenubutton", text="Then By")
+        thenByOptions = ttk.Menu(self.__thenByMenu)
+        thenByOptions.add_command(label="None", command=lambda:[self.__setThenBy(None)])
+        for x in ["Module","Module Code","Cohort","Course","Full/Part","Session","Date","Day","Start Time","End Time","Duration","Location","Size","Lecturer","Zone"]:
+            thenByOptions.add_command(label=x, command=lambda x=x:self.__setThenBy(x))
+        self.__thenByMenu['menu'] = thenByOptions
+
+        # Match mode of the filters: And keeps the common schedules, Or adds schedules and Not removes them
+        self.__matchMode = tk.StringVar(value="And")
+        self.__matchModeMenu = ttk.Menubutton(self.__filterFrame, style="primary.Outline.TMenubutton", text="Match: And")
+        matchModeOptions = ttk.Menu(self.__matchModeMenu)
+        for x in ["And","Or","Not"]:
+            matchModeOptions.add_radiobutton(label=x, variable=self.__matchMode, command=lambda x=x:self.__setMatchMode(x))
+        self.__matchModeMenu['menu'] = matchModeOptions
+
         # Show on frame
         self.__filterLabel.grid(row=0, column=0,columnspan=3, sticky="w", padx=(10,0))
+        self.__matchModeMenu.grid(row=0, column=2, sticky="e", padx=10)
         self.__RangeLabel.grid(row=6,column=0,columnspan=3,sticky="w",padx=(10,0))
+        self.__intervalMenu.grid(row=6, column=2, sticky="e", padx=10)
         self.__scheduleLabel.grid(row=0, column=0, sticky="w",padx=(10,0))
+        self.__reloadButton.grid(row=0, column=0, sticky="w", padx=(150,0))
+        self.__undoButton.grid(row=0, column=0, sticky="w", padx=(270,0))
+        self.__redoButton.grid(row=0, column=0, sticky="w", padx=(335,0))
+        self.__appliedFiltersMenu.grid(row=0, column=0, sticky="w", padx=(400,0))
+        self.__cacheLabel.grid(row=0, column=0, sticky="w", padx=(510,0))
+        self.__previousPageButton.grid(row=2, column=0, sticky="w", padx=(10,0), pady=(0,10))
+        self.__pageLabel.grid(row=2, column=0, sticky="w", padx=(100,0), pady=(0,10))
+        self.__nextPageButton.grid(row=2, column=0, sticky="e", padx=(0,21), pady=(0,10))
+        self.__clashesButton.grid(row=2, column=0, pady=(0,10), padx=(0,260))
+        self.__heatmapButton.grid(row=2, column=0, pady=(0,10))
+        self.__reportButton.grid(row=2, column=0, pady=(0,10), padx=(270,0))
         self.__startDate.grid(row=7,column=0, ipadx=10)
         self.__endDate.grid(row=7,column=1, ipadx=10)
         self.__applyDateButton.grid(row=7,column=2)
         self.__startTimeEntry.grid(row=8,column=0)
         self.__endTimeEntry.grid(row=8,column=1)
         self.__applyTimeButton.grid(row=8,column=2)
-        self.__backLoadButton.grid(row=9, column=0, sticky="s", pady=(0,10), padx=(0,0), ipadx=20, ipady=5)
-        self.__resetSchedulesButton.grid(row=9, column=1, sticky="s", pady=(0,15), padx=40, ipadx=20, ipady=1)
-        self.__exportMenu.grid(row=9,column=2,stick="wes", pady=(0,10), padx=30, ipadx=10, ipady=5)
+        self.__searchLabel.grid(row=9, column=0, sticky="w", padx=(10,0))
+        self.__searchBox.grid(row=9, column=1, columnspan=2, sticky="we", padx=10)
+        self.__backLoadButton.grid(row=10, column=0, sticky="s", pady=(0,10), padx=(0,0), ipadx=20, ipady=5)
+        self.__resetSchedulesButton.grid(row=10, column=1, sticky="s", pady=(0,15), padx=40, ipadx=20, ipady=1)
+        self.__exportMenu.grid(row=10,column=2,stick="wes", pady=(0,10), padx=30, ipadx=10, ipady=5)
         self.__moduleMenu.grid(row=1,column=0,sticky="we",padx=10)
         self.__moduleCodeMenu.grid(row=1,column=1,sticky="we",padx=10)
         self.__cohortMenu.grid(row=1,column=2,sticky="we",padx=10)
@@ -1382,38 +384,112 @@ class GUI(ttk.Window):
         self.__sortByMenu.grid(row=0,column=0,sticky="e",padx=(0,21),pady=(0,0))
         self.__ascButton.grid(row=0,column=0,padx=(0,250), sticky="e")
         self.__desButton.grid(row=0,column=0,padx=(0,150), sticky="e")
+        self.__thenByMenu.grid(row=0,column=0,sticky="e",padx=(0,350))
 
     def __selectedValue(self, category:str, value, isASC = True):
         # Receive what filter user selected and sends it to the display handler for data processing
         if category == "sortBy":
-            newCategory = {
-                "Module" : "module",
-                "Module Code" : "moduleCode",
-                "Cohort" : "cohort",
-                "Course" : "course",
-                "Full/Part" : "fullPart",
-                "Session" : "session",
-                "Date" : "activityDate",
-                "Day" : "scheduledDay",
-                "Start Time" : "startTime",
-                "End Time" : "endTime",
-                "Duration" : "duration",
-                "Location" : "location",
-                "Size" : "size",
-                "Lecturer" : "lecturer",
-                "Zone" : "zone",
-            }[value]
+            newCategory = self.__toCategory(value)
             self.__sortBySelection = value
-            self.__displayHandler.sort(newCategory, isASC)
+            self.__displayHandler.sort(newCategory, isASC, [self.__toCategory(x) for x in self.__thenBySelection])
         else:
-            self.__displayHandler.setCommonSchedules(self.__displayHandler.getFilteredSchedule(category,value))
-            self.__dataHandler.setRange(self.__displayHandler.getResult())
+            self.__query.addFilter(category, value, self.__matchMode.get().lower())
+            self.__displayHandler.applyQuery(self.__query)
         
 
         # Post Filtering or Sorting
         self.__displaySchedules()
         self.__updateOptions()
 
+    def __setMatchMode(self, mode:str):
+        # Or offers the options of every schedule, And and Not only the options of the result
+        self.__matchMode.set(mode)
+        self.__matchModeMenu.configure(text=f"Match: {mode}")
+        self.__updateOptions()
+
+    def __searchValues(self):
+        # Results are found again as the text changes, and shown in the list of the search box
+        text = self.__searchBox.get()
+        if text in self.__searchResults:
+            return
+        names = {"module": "Module", "lecturer": "Lecturer", "location": "Location"}
+        self.__searchResults = {}
+        for category, value, count in self.__displayHandler.searchValues(text):
+            self.__searchResults[f"{names[category]}: {value} ({count})"] = (category, value)
+        self.__searchBox.configure(values=list(self.__searchResults))
+
+    def __selectSearchResult(self):
+        category, value = self.__searchResults[self.__searchBox.get()]
+        self.__searchBox.set("")
+        self.__searchResults = {}
+        self.__searchBox.configure(values=[])
+        self.__selectedValue(category, value)
+
+    def __undoFilter(self):
+        # Earlier results are kept by the display handler, so nothing is filtered again
+        if self.__displayHandler.undo(self.__query):
+            self.__displaySchedules()
+            self.__updateOptions()
+
+    def __redoFilter(self):
+        if self.__displayHandler.redo(self.__query):
+            self.__displaySchedules()
+            self.__updateOptions()
+
+    def __removeFilter(self, index:int):
+        # Only the filters after the removed one are run again, from the kept result of the filters before it
+        self.__query.removeClause(index)
+        self.__displayHandler.applyQuery(self.__query)
+        self.__displaySchedules()
+        self.__updateOptions()
+
+    def __describeClause(self, clause:tuple) -> str:
+        # Name of a filter in the applied filters menu
+        if clause[0] == "value":
+            names = {self.__toCategory(name): name for name in ["Module","Module Code","Cohort","Course","Full/Part","Session","Date","Day","Start Time","End Time","Duration","Location","Size","Lecturer","Zone"]}
+            day = ["", "Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
+            value = day[clause[2]] if clause[1] == "scheduledDay" else clause[2]
+            return f"{clause[3].capitalize()} {names[clause[1]]}: {value}"
+        elif clause[0] == "range" and clause[1] == "activityDate":
+            return f"Date {clause[2]:%d-%m-%Y} to {clause[3]:%d-%m-%Y}"
+        elif clause[0] == "range":
+            return f"Time {clause[2]:%H:%M} to {clause[3]:%H:%M}"
+        elif clause[1] == "contains":
+            return f"Sessions running at {clause[2]:%d-%m-%Y %H:%M}"
+        else:
+            return f"Sessions {'overlapping' if clause[1] == 'overlap' else 'within'} {clause[2]:%d-%m-%Y %H:%M} to {clause[3]:%d-%m-%Y %H:%M}"
+
+    def __setThenBy(self, value):
+        # None clears the categories after the sort by category
+        if value is None:
+            self.__thenBySelection = []
+        elif value not in self.__thenBySelection and value != self.__sortBySelection:
+            self.__thenBySelection.append(value)
+        self.__thenByMenu.configure(text="Then By: " + ", ".join(self.__thenBySelection) if self.__thenBySelection else "Then By")
+        self.__selectedValue("sortBy", self.__sortBySelection, self.__sortIn.get())
+
+    def __toCategory(self, value:str) -> str:
+        # Changes the name shown in the sort by menu into the category of the schedule
+        newCategory = {
+            "Module" : "module",
+            "Module Code" : "moduleCode",
+            "Cohort" : "cohort",
+            "Course" : "course",
+            "Full/Part" : "fullPart",
+            "Session" : "session",
+            "Date" : "activityDate",
+            "Day" : "scheduledDay",
+            "Start Time" : "startTime",
+            "End Time" : "endTime",
+            "Duration" : "duration",
+            "Location" : "location",
+            "Size" : "size",
+            "Lecturer" : "lecturer",
+            "Zone" : "zone",
+        }[value]
+
+        return newCategory
+
     def __updateOptions(self):
         # Style settings
         disabledButtonStyle = ttk.Style()
@@ -1421,14 +497,18 @@ class GUI(ttk.Window):
         disabledButtonStyle.configure("dis.dark.TMenubutton", font=("Arial",13, "bold"))
         enabledButtonStyle.configure("en.primary.Outline.TMenubutton", font=("Arial",13, "bold"))
 
+        # Each option shows how many schedules would be left after choosing it in the current match mode
+        matchMode = self.__matchMode.get().lower()
+
         # Module options renewal
         moduleOptions = ttk.Menu(self.__moduleMenu)
         moduleVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("module")):
-            moduleOptions.add_radiobutton(label=x, variable=moduleVar, command=lambda x=x:self.__selectedValue("module",x))
+        moduleCounts = self.__displayHandler.getOptionCounts("module", matchMode)
+        for x in self.__insertionSort(moduleCounts):
+            moduleOptions.add_radiobutton(label=f"{x} ({moduleCounts[x]})", variable=moduleVar, command=lambda x=x:self.__selectedValue("module",x))
         self.__moduleMenu['menu'] = moduleOptions
 
-        if len(self.__dataHandler.getRange("module")) <= 1:
+        if len(moduleCounts) <= 1:
             self.__moduleMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__moduleMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1436,11 +516,12 @@ class GUI(ttk.Window):
         # Module Code options renewal
         moduleCodeOptions = ttk.Menu(self.__moduleCodeMenu)
         moduleCodeVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("moduleCode")):
-            moduleCodeOptions.add_radiobutton(label=x, variable=moduleCodeVar, command=lambda x=x:self.__selectedValue("moduleCode",x))
+        moduleCodeCounts = self.__displayHandler.getOptionCounts("moduleCode", matchMode)
+        for x in self.__insertionSort(moduleCodeCounts):
+            moduleCodeOptions.add_radiobutton(label=f"{x} ({moduleCodeCounts[x]})", variable=moduleCodeVar, command=lambda x=x:self.__selectedValue("moduleCode",x))
         self.__moduleCodeMenu['menu'] = moduleCodeOptions
 
-        if len(self.__dataHandler.getRange("moduleCode")) <= 1:
+        if len(moduleCodeCounts) <= 1:
             self.__moduleCodeMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__moduleCodeMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1448,11 +529,12 @@ class GUI(ttk.Window):
         # Cohort options renewal
         cohortOptions = ttk.Menu(self.__cohortMenu)
         cohortVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("cohort")):
-            cohortOptions.add_radiobutton(label=x, variable=cohortVar, command=lambda x=x:self.__selectedValue("cohort",x))
+        cohortCounts = self.__displayHandler.getOptionCounts("cohort", matchMode)
+        for x in self.__insertionSort(cohortCounts):
+            cohortOptions.add_radiobutton(label=f"{x} ({cohortCounts[x]})", variable=cohortVar, command=lambda x=x:self.__selectedValue("cohort",x))
         self.__cohortMenu['menu'] = cohortOptions
 
-        if len(self.__dataHandler.getRange("cohort")) <= 1:
+        if len(cohortCounts) <= 1:
             self.__cohortMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__cohortMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1460,11 +542,12 @@ class GUI(ttk.Window):
         # Course options renewal
         courseOptions = ttk.Menu(self.__courseMenu)
         courseVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("course")):
-            courseOptions.add_radiobutton(label=x, variable=courseVar, command=lambda x=x:self.__selectedValue("course",x))
+        courseCounts = self.__displayHandler.getOptionCounts("course", matchMode)
+        for x in self.__insertionSort(courseCounts):
+            courseOptions.add_radiobutton(label=f"{x} ({courseCounts[x]})", variable=courseVar, command=lambda x=x:self.__selectedValue("course",x))
         self.__courseMenu['menu'] = courseOptions
 
-        if len(self.__dataHandler.getRange("course")) <= 1:
+        if len(courseCounts) <= 1:
             self.__courseMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__courseMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1472,11 +555,12 @@ class GUI(ttk.Window):
         # Full/Part options renewal
         fullPartOptions = ttk.Menu(self.__fullPartMenu)
         fullPartVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("fullPart")):
-            fullPartOptions.add_radiobutton(label=x, variable=fullPartVar, command=lambda x=x:self.__selectedValue("fullPart",x))
+        fullPartCounts = self.__displayHandler.getOptionCounts("fullPart", matchMode)
+        for x in self.__insertionSort(fullPartCounts):
+            fullPartOptions.add_radiobutton(label=f"{x} ({fullPartCounts[x]})", variable=fullPartVar, command=lambda x=x:self.__selectedValue("fullPart",x))
         self.__fullPartMenu['menu'] = fullPartOptions
 
-        if len(self.__dataHandler.getRange("fullPart")) <= 1:
+        if len(fullPartCounts) <= 1:
             self.__fullPartMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__fullPartMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1484,11 +568,12 @@ class GUI(ttk.Window):
         # Session options renewal
         sessionOptions = ttk.Menu(self.__sessionMenu)
         sessionVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("session")):
-            sessionOptions.add_radiobutton(label=x, variable=sessionVar, command=lambda x=x:self.__selectedValue("session",x))
+        sessionCounts = self.__displayHandler.getOptionCounts("session", matchMode)
+        for x in self.__insertionSort(sessionCounts):
+            sessionOptions.add_radiobutton(label=f"{x} ({sessionCounts[x]})", variable=sessionVar, command=lambda x=x:self.__selectedValue("session",x))
         self.__sessionMenu['menu'] = sessionOptions
 
-        if len(self.__dataHandler.getRange("session")) <= 1:
+        if len(sessionCounts) <= 1:
             self.__sessionMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__sessionMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1496,11 +581,12 @@ class GUI(ttk.Window):
         # Activity Date options renewal
         activityDateOptions = ttk.Menu(self.__activityDateMenu)
         activityDateVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("activityDate")):
-            activityDateOptions.add_radiobutton(label=x, variable=activityDateVar, command=lambda x=x:self.__selectedValue("activityDate",x))
+        activityDateCounts = self.__displayHandler.getOptionCounts("activityDate", matchMode)
+        for x in self.__insertionSort(activityDateCounts):
+            activityDateOptions.add_radiobutton(label=f"{x} ({activityDateCounts[x]})", variable=activityDateVar, command=lambda x=x:self.__selectedValue("activityDate",x))
         self.__activityDateMenu['menu'] = activityDateOptions
 
-        if len(self.__dataHandler.getRange("activityDate")) <= 1:
+        if len(activityDateCounts) <= 1:
             self.__activityDateMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__activityDateMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1509,11 +595,12 @@ class GUI(ttk.Window):
         day = ["", "Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
         scheduledDayOptions = ttk.Menu(self.__scheduledDayMenu)
         scheduledDayVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("scheduledDay")):
-            scheduledDayOptions.add_radiobutton(label=day[x], variable=scheduledDayVar, command=lambda x=x:self.__selectedValue("scheduledDay",x))
+        scheduledDayCounts = self.__displayHandler.getOptionCounts("scheduledDay", matchMode)
+        for x in self.__insertionSort(scheduledDayCounts):
+            scheduledDayOptions.add_radiobutton(label=f"{day[x]} ({scheduledDayCounts[x]})", variable=scheduledDayVar, command=lambda x=x:self.__selectedValue("scheduledDay",x))
         self.__scheduledDayMenu['menu'] = scheduledDayOptions
 
-        if len(self.__dataHandler.getRange("scheduledDay")) <= 1:
+        if len(scheduledDayCounts) <= 1:
             self.__scheduledDayMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__scheduledDayMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1521,11 +608,12 @@ class GUI(ttk.Window):
         # Start Time options renewal
         startTimeOptions = ttk.Menu(self.__startTimeMenu)
         startTimeVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("startTime")):
-            startTimeOptions.add_radiobutton(label=x, variable=startTimeVar, command=lambda x=x:self.__selectedValue("startTime",x))
+        startTimeCounts = self.__displayHandler.getOptionCounts("startTime", matchMode)
+        for x in self.__insertionSort(startTimeCounts):
+            startTimeOptions.add_radiobutton(label=f"{x} ({startTimeCounts[x]})", variable=startTimeVar, command=lambda x=x:self.__selectedValue("startTime",x))
         self.__startTimeMenu['menu'] = startTimeOptions
 
-        if len(self.__dataHandler.getRange("startTime")) <= 1:
+        if len(startTimeCounts) <= 1:
             self.__startTimeMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__startTimeMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1533,11 +621,12 @@ class GUI(ttk.Window):
         # End Time options renewal
         endTimeOptions = ttk.Menu(self.__endTimeMenu)
         endTimeVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("endTime")):
-            endTimeOptions.add_radiobutton(label=x, variable=endTimeVar, command=lambda x=x:self.__selectedValue("endTime",x))
+        endTimeCounts = self.__displayHandler.getOptionCounts("endTime", matchMode)
+        for x in self.__insertionSort(endTimeCounts):
+            endTimeOptions.add_radiobutton(label=f"{x} ({endTimeCounts[x]})", variable=endTimeVar, command=lambda x=x:self.__selectedValue("endTime",x))
         self.__endTimeMenu['menu'] = endTimeOptions
 
-        if len(self.__dataHandler.getRange("endTime")) <= 1:
+        if len(endTimeCounts) <= 1:
             self.__endTimeMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__endTimeMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1545,11 +634,12 @@ class GUI(ttk.Window):
         # Duration options renewal
         durationOptions = ttk.Menu(self.__durationMenu)
         durationVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("duration")):
-            durationOptions.add_radiobutton(label=x, variable=durationVar, command=lambda x=x:self.__selectedValue("duration",x))
+        durationCounts = self.__displayHandler.getOptionCounts("duration", matchMode)
+        for x in self.__insertionSort(durationCounts):
+            durationOptions.add_radiobutton(label=f"{x} ({durationCounts[x]})", variable=durationVar, command=lambda x=x:self.__selectedValue("duration",x))
         self.__durationMenu['menu'] = durationOptions
         
-        if len(self.__dataHandler.getRange("duration")) <= 1:
+        if len(durationCounts) <= 1:
             self.__durationMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__durationMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1557,11 +647,12 @@ class GUI(ttk.Window):
         # Location options renewal
         locationOptions = ttk.Menu(self.__locationMenu)
         locationVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("location")):
-            locationOptions.add_radiobutton(label=x, variable=locationVar, command=lambda x=x:self.__selectedValue("location",x))
+        locationCounts = self.__displayHandler.getOptionCounts("location", matchMode)
+        for x in self.__insertionSort(locationCounts):
+            locationOptions.add_radiobutton(label=f"{x} ({locationCounts[x]})", variable=locationVar, command=lambda x=x:self.__selectedValue("location",x))
         self.__locationMenu['menu'] = locationOptions
 
-        if len(self.__dataHandler.getRange("location")) <= 1:
+        if len(locationCounts) <= 1:
             self.__locationMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__locationMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1569,11 +660,12 @@ class GUI(ttk.Window):
         # Size options renewal
         sizeOptions = ttk.Menu(self.__sizeMenu)
         sizeVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("size")):
-            sizeOptions.add_radiobutton(label=x, variable=sizeVar, command=lambda x=x:self.__selectedValue("size",x))
+        sizeCounts = self.__displayHandler.getOptionCounts("size", matchMode)
+        for x in self.__insertionSort(sizeCounts):
+            sizeOptions.add_radiobutton(label=f"{x} ({sizeCounts[x]})", variable=sizeVar, command=lambda x=x:self.__selectedValue("size",x))
         self.__sizeMenu['menu'] = sizeOptions
 
-        if len(self.__dataHandler.getRange("size")) <= 1:
+        if len(sizeCounts) <= 1:
             self.__sizeMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__sizeMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1581,11 +673,12 @@ class GUI(ttk.Window):
         # Lecturer options renewal
         lecturerOptions = ttk.Menu(self.__lecturerMenu)
         lecturerVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("lecturer")):
-            lecturerOptions.add_radiobutton(label=x, variable=lecturerVar, command=lambda x=x:self.__selectedValue("lecturer",x))
+        lecturerCounts = self.__displayHandler.getOptionCounts("lecturer", matchMode)
+        for x in self.__insertionSort(lecturerCounts):
+            lecturerOptions.add_radiobutton(label=f"{x} ({lecturerCounts[x]})", variable=lecturerVar, command=lambda x=x:self.__selectedValue("lecturer",x))
         self.__lecturerMenu['menu'] = lecturerOptions
 
-        if len(self.__dataHandler.getRange("lecturer")) <= 1:
+        if len(lecturerCounts) <= 1:
             self.__lecturerMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__lecturerMenu.configure(style="en.primary.Outline.TMenubutton")
@@ -1593,15 +686,27 @@ class GUI(ttk.Window):
         # Zone options renewal
         zoneOptions = ttk.Menu(self.__zoneMenu)
         zoneVar = tk.StringVar()
-        for x in self.__insertionSort(self.__dataHandler.getRange("zone")):
-            zoneOptions.add_radiobutton(label=x, variable=zoneVar, command=lambda x=x:self.__selectedValue("zone",x))
+        zoneCounts = self.__displayHandler.getOptionCounts("zone", matchMode)
+        for x in self.__insertionSort(zoneCounts):
+            zoneOptions.add_radiobutton(label=f"{x} ({zoneCounts[x]})", variable=zoneVar, command=lambda x=x:self.__selectedValue("zone",x))
         self.__zoneMenu['menu'] = zoneOptions
 
-        if len(self.__dataHandler.getRange("zone")) <= 1:
+        if len(zoneCounts) <= 1:
             self.__zoneMenu.configure(style="dis.dark.TMenubutton")
         else:
             self.__zoneMenu.configure(style="en.primary.Outline.TMenubutton")
 
+        # Applied filters and history renewal
+        appliedFiltersOptions = ttk.Menu(self.__appliedFiltersMenu)
+        for index, clause in enumerate(self.__query.clauses):
+            appliedFiltersOptions.add_command(label=f"Remove {self.__describeClause(clause)}", command=lambda index=index:self.__removeFilter(index))
+        self.__appliedFiltersMenu['menu'] = appliedFiltersOptions
+        self.__appliedFiltersMenu.configure(text=f"Filters ({len(self.__query.clauses)})")
+        self.__undoButton.configure(state="normal" if self.__displayHandler.canUndo() else "disabled")
+        self.__redoButton.configure(state="normal" if self.__displayHandler.canRedo() else "disabled")
+        hits, misses, _ = self.__displayHandler.getCacheStats()
+        self.__cacheLabel.configure(text=f"Cache: {hits} hits / {misses} misses")
+
     def __queryFilterDateTime(self, category:str, start, end):
         # Filter schedules between start and end values.
         try:
@@ -1610,24 +715,43 @@ class GUI(ttk.Window):
                 start = datetime.datetime.strptime(f"{start}",dateformat).date()
                 end = datetime.datetime.strptime(f"{end}",dateformat).date()
                 if start > end: mb.show_warning("Starting date cannot exceed ending date.", "Wrong date input")
-                self.__displayHandler.rangeSearch(start,end,"activityDate")
+                self.__query.addRange("activityDate", start, end)
+                self.__displayHandler.applyQuery(self.__query)
             elif category == "time":
                 dateformat = "%H:%M"
                 start = datetime.datetime.strptime(f"{start}",dateformat).time()
                 end = datetime.datetime.strptime(f"{end}",dateformat).time()
                 if start > end: mb.show_warning("Starting time cannot exceed ending time.", "Wrong time input")
-                self.__displayHandler.rangeSearch(start,end,"time")
-            self.__dataHandler.setRange(self.__displayHandler.getResult())
+                self.__query.addRange("time", start, end)
+                self.__displayHandler.applyQuery(self.__query)
             self.__displaySchedules()
             self.__updateOptions()
         except:
             mb.show_error("You entered wrong value\nPlease try again", "Wrong input error")
  
+    def __queryInterval(self, mode:str):
+        # Filter schedules by their date and times against the moment or the window set in the range panel
+        try:
+            dateformat = "%d-%m-%Y %H:%M"
+            start = datetime.datetime.strptime(f"{self.__startDate.entry.get()} {self.__startTimeEntry.get()}",dateformat)
+            end = datetime.datetime.strptime(f"{self.__endDate.entry.get()} {self.__endTimeEntry.get()}",dateformat)
+            if mode != "contains" and start > end:
+                mb.show_warning("Start cannot exceed end.", "Wrong date input")
+                return
+            self.__query.addInterval(mode, start, end)
+            self.__displayHandler.applyQuery(self.__query)
+            self.__displaySchedules()
+            self.__updateOptions()
+        except:
+            mb.show_error("You entered wrong value\nPlease try again", "Wrong input error")
+
     def __queryFolderPath(self):
         # Receives the filder path and extracts file path. Then send it to the data handler for extracting raw data
         folderPath = fd.askdirectory()
         filesList = []
         if folderPath != "":
+            self.__folderPath = folderPath
+            self.__deletedFiles = set()
             for file in os.listdir(folderPath):
                 if file.endswith(".csv"):
                     filesList.append(os.path.join(folderPath, file))
@@ -1637,6 +761,12 @@ class GUI(ttk.Window):
             if len(filesList) == 0:
                 mb.show_error("You chose a folder with no CSV files\nPlease choose a folder with CSV files", "No Files Error")
 
+    def __queryArchivePath(self):
+        # The archive keeps the schedules of every file added to it, and an existing archive opens without reading its files again
+        archivePath = fd.asksaveasfilename(defaultextension=".sqlite", filetypes=[("Schedule Archive", "*.sqlite")], confirmoverwrite=False)
+        self.__archivePath = archivePath if archivePath else ""
+        self.__archiveButton.configure(text=f"Archive: {os.path.basename(self.__archivePath) if self.__archivePath else 'None'}")
+
     def __displayFiles(self):
         for i in self.__fileTree.get_children():
             self.__fileTree.delete(i)
@@ -1652,11 +782,13 @@ class GUI(ttk.Window):
             self.__fileTree.delete(i)
 
         self.__dataHandler.setFilesPathList([])
+        self.__folderPath = ""
 
     def __deleteFile(self):
         # Delete user selected files
         selections = self.__fileTree.selection()        
         for item in selections:
+            self.__deletedFiles.add(self.__fileTree.item(item)["values"][1])
             self.__fileTree.delete(item)
 
         newList = []
@@ -1673,61 +805,536 @@ class GUI(ttk.Window):
     def __showPage(self, frame):
         # Used to change pages
         if frame == self.__viewPage:
-            self.geometry("1500x500+100+250")
-            self.__dataHandler.setSchedules()
-            self.__displayHandler = DisplayHandler(self.__dataHandler.getSchedules(), self.__dataHandler.getRangeList())
-            self.__ascButton.invoke()
-            self.__updateOptions()
-            self.__displaySchedules()
-        else:
-            self.geometry("750x500+500+250")
+            self.__startLoading() # View page is shown after the schedules are loaded in the background
+            return
+
+        self.geometry("750x500+500+250")
 
         self.__currentFrame = frame
         frame.tkraise()
 
-    def __displaySchedules(self):
-        # Display sorted schedules in the table
+    def __reloadFiles(self):
+        # Lists the folder again and loads only the files added, deleted or changed
+        if self.__folderPath != "" and os.path.isdir(self.__folderPath):
+            filesList = []
+            for file in os.listdir(self.__folderPath):
+                filePath = os.path.join(self.__folderPath, file)
+                if file.endswith(".csv") and filePath not in self.__deletedFiles:
+                    filesList.append(filePath)
+            self.__dataHandler.setFilesPathList(filesList)
+            self.__displayFiles()
+
+        self.__startLoading(True)
+
+    def __startLoading(self, isReload=False):
+        # Loads the schedules on a separate thread and shows the progress until it finishes
+        self.__loadQueue = queue.Queue()
+        self.__cancelEvent = threading.Event()
+        loadingThread = threading.Thread(target=self.__loadSchedules, args=(self.__loadQueue, self.__cancelEvent, self.__toCategory(self.__sortBySelection), isReload), daemon=True)
+
+        self.__showLoadingWindow()
+        loadingThread.start()
+        self.after(100, self.__pollLoading)
+
+    def __loadSchedules(self, loadQueue, cancelEvent, sortCategory:str, isReload:bool):
+        # Runs on the loading thread, so no GUI component is changed here
+        archive = None # Archive opened by this load, closed again when the load does not finish
+        try:
+            if isReload and isinstance(self.__displayHandler, ArchiveDisplayHandler):
+                # Only new and changed files are written to the archive
+                displayHandler = self.__displayHandler
+                displayHandler.getSchedules().addFiles(self.__dataHandler.getFilesPathList(), loadQueue, cancelEvent)
+                displayHandler.updateSchedules()
+            elif isReload:
+                # Filters of the current schedules are updated with the changed files only
+                addedRows, removedRows = self.__dataHandler.reloadSchedules(True, loadQueue, cancelEvent)
+                displayHandler = self.__displayHandler
+                displayHandler.updateSchedules(addedRows, removedRows)
+            elif self.__archivePath != "":
+                archive = ScheduleArchive(self.__archivePath)
+                archive.addFiles(self.__dataHandler.getFilesPathList(), loadQueue, cancelEvent)
+                displayHandler = ArchiveDisplayHandler(archive)
+            else:
+                # Not lazy: the option counts of the filter menus read all 15 columns as soon as the view page shows,
+                # so lazy mode would decode every column anyway while skipping the disk cache. It is kept for the CLI
+                self.__dataHandler.setSchedules(True, loadQueue, cancelEvent)
+                displayHandler = DisplayHandler(self.__dataHandler.getSchedules())
+            displayHandler.sort(sortCategory, True, [self.__toCategory(x) for x in self.__thenBySelection])
+            displayHandler.buildSearchIndex()
+            loadQueue.put(("done", displayHandler))
+        except LoadCancelled:
+            if archive is not None: archive.close()
+            loadQueue.put(("cancelled",))
+        except Exception:
+            if archive is not None: archive.close()
+            loadQueue.put(("error",))
+
+    def __pollLoading(self):
+        # Reads the progress sent from the loading thread
+        try:
+            while True:
+                message = self.__loadQueue.get_nowait()
+                if message[0] == "file":
+                    _, fileName, rowCnt, fileCnt, totalFileCnt = message
+                    self.__loadingLabel.configure(text=f"Read {fileName} ({rowCnt} rows)\n{fileCnt} / {totalFileCnt} files")
+                    self.__loadingBar.configure(value=fileCnt / totalFileCnt * 100)
+                elif message[0] == "done":
+                    self.__closeLoadingWindow()
+                    self.__finishLoading(message[1])
+                    return
+                elif message[0] == "cancelled":
+                    self.__closeLoadingWindow()
+                    return
+                elif message[0] == "error":
+                    self.__closeLoadingWindow()
+                    mb.show_error("Loading failed!\nPlease check the CSV files.", "Loading Failure")
+                    return
+        except queue.Empty:
+            pass
+
+        self.after(100, self.__pollLoading)
+
+    def __finishLoading(self, displayHandler):
+        # Show the loaded schedules on the view page
+        self.geometry("1500x500+100+250")
+        if isinstance(self.__displayHandler, ArchiveDisplayHandler) and self.__displayHandler is not displayHandler:
+            self.__displayHandler.getSchedules().close() # Archive of the replaced schedules is not read again
+        self.__displayHandler = displayHandler
+        self.__query.clear()
+        self.__sortIn.set(True)
+        self.__matchMode.set("And")
+        self.__matchModeMenu.configure(text="Match: And")
+        self.__updateOptions()
+        self.__displaySchedules()
+
+        self.__currentFrame = self.__viewPage
+        self.__viewPage.tkraise()
+
+    def __showLoadingWindow(self):
+        # Window blocks the other pages while loading
+        self.__loadingWindow = ttk.Toplevel(self)
+        self.__loadingWindow.title("Loading")
+        self.__loadingWindow.geometry("400x150+675+425")
+        self.__loadingWindow.resizable(False,False)
+        self.__loadingWindow.transient(self)
+        self.__loadingWindow.protocol("WM_DELETE_WINDOW", self.__cancelLoading)
+        self.__loadingWindow.columnconfigure(0, weight=1)
+
+        self.__loadingLabel = ttk.Label(self.__loadingWindow, text="Reading CSV files", anchor="center", justify="center")
+        self.__loadingBar = ttk.Progressbar(self.__loadingWindow, maximum=100, bootstyle="primary")
+        self.__cancelLoadingButton = ttk.Button(self.__loadingWindow, text="Cancel", style="s.danger.Outline.TButton", command=lambda:[self.__cancelLoading()])
+
+        self.__loadingLabel.grid(row=0, column=0, sticky="we", padx=20, pady=(15,5))
+        self.__loadingBar.grid(row=1, column=0, sticky="we", padx=20, pady=5)
+        self.__cancelLoadingButton.grid(row=2, column=0, pady=(5,15))
+        self.__loadingWindow.wait_visibility() # Grab fails on windows that are not shown yet
+        self.__loadingWindow.grab_set()
+
+    def __cancelLoading(self):
+        # Loading thread stops at its next check
+        self.__cancelEvent.set()
+        self.__loadingLabel.configure(text="Cancelling...")
+        self.__cancelLoadingButton.configure(state="disabled")
+
+    def __closeLoadingWindow(self):
+        self.__loadingWindow.grab_release()
+        self.__loadingWindow.destroy()
+
+    def __displaySchedules(self, pageStart=0):
+        # Display one page of the sorted schedules in the table. A new result starts at the first page
         for i in self.__scheduleViewer.get_children():
                 self.__scheduleViewer.delete(i)
         dayString = ["","Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
-        try:
-            for index, schedule in enumerate(self.__displayHandler.getResult()):
-                li = schedule.data.getAll()
-                li[7] = dayString[li[7]]
-                li.insert(0,index+1)
-                self.__scheduleViewer.insert("", tk.END, value=li)
-        except TypeError:
+        resultCnt = self.__displayHandler.getResultCount()
+        self.__pageStart = max(0, min(pageStart, (resultCnt - 1) // self.pageSize * self.pageSize))
+        self.__previousPageButton.configure(state="normal" if self.__pageStart > 0 else "disabled")
+        self.__nextPageButton.configure(state="normal" if self.__pageStart + self.pageSize < resultCnt else "disabled")
+        self.__pageLabel.configure(text=f"{self.__pageStart + 1 if resultCnt else 0} - {min(self.__pageStart + self.pageSize, resultCnt)} of {resultCnt}")
+        if resultCnt == 0:
             if self.__currentFrame is not self.__loadPage:
                 mb.show_warning("No schedules to disply.", "No Files Warning")
-            for i in self.__scheduleViewer.get_children():
-                self.__scheduleViewer.delete(i)
+            return
+
+        for index, li in enumerate(self.__displayHandler.getPage(self.__pageStart, self.pageSize), self.__pageStart):
+            li[7] = dayString[li[7]]
+            li.insert(0,index+1)
+            self.__scheduleViewer.insert("", tk.END, value=li)
 
     def __exportExcel(self):
-        if self.__displayHandler.getResult() == None:
+        if self.__displayHandler.getResultCount() == 0:
             mb.show_error("No schedules to export.\nPlease try again", "No schedule warning")
         else:
             try:
                 path = fd.askdirectory()
                 if path != "": 
-                    self.__exportHandler.setResult(self.__displayHandler.exportResult(),path)
+                    self.__exportHandler.setResult(self.__displayHandler.getSchedules(), self.__displayHandler.exportResult(), path)
                     self.__exportHandler.exportExcel()
                     mb.show_info("Export successfully done.", "Export Success")
             except:
                 mb.show_error("Export failed!\nPlease try again.", "Export Failure")
 
     def __exportPDF(self):
-        if self.__displayHandler.getResult() == None:
+        if self.__displayHandler.getResultCount() == 0:
             mb.show_error("No schedules to export.\nPlease try again", "No schedule warning")
         else:
             try:
                 path = fd.askdirectory()
                 if path != "":
-                    self.__exportHandler.setResult(self.__displayHandler.exportResult(),path)
+                    self.__exportHandler.setResult(self.__displayHandler.getSchedules(), self.__displayHandler.exportResult(), path)
                     self.__exportHandler.exportPDF()
                     mb.show_info("Export successfully done.", "Export Success")
             except:
                 mb.show_error("Export failed!\nPlease try again.", "Export Failure")
 
+    def __showClashes(self):
+        # Rooms, lecturers and cohorts of the result booked for two sessions at once, shown in a window of their own
+        if self.__displayHandler.getResultCount() == 0:
+            mb.show_error("No schedules to check.\nPlease try again", "No schedule warning")
+            return
+        self.__clashes = self.__displayHandler.findClashes()
+        if len(self.__clashes) == 0:
+            mb.show_info("No clashes found in the schedules.", "No Clashes")
+            return
+
+        self.__clashWindow = ttk.Toplevel(self)
+        self.__clashWindow.title("Clashes")
+        self.__clashWindow.geometry("1300x450+100+275")
+        self.__clashWindow.transient(self)
+        self.__clashWindow.columnconfigure(0, weight=1)
+        self.__clashWindow.rowconfigure(0, weight=1)
+
+        column = ["index", "category", "booked", "activityDate", "module", "session", "time", "otherModule", "otherSession", "otherTime"]
+        headings = ["#", "Category", "Booked", "Date", "Module", "Session", "Time", "Clashes With", "Session", "Time"]
+        self.__clashViewer = ttk.Treeview(self.__clashWindow, columns=column, show="headings", bootstyle="warning")
+        for col, heading in zip(column, headings):
+            self.__clashViewer.heading(col, text=heading, anchor="w")
+            self.__clashViewer.column(col, anchor="w", minwidth=50, width=250 if col in ("module", "otherModule") else 90)
+        self.__clashScrollBar = ttk.Scrollbar(self.__clashWindow, orient="vertical", command=self.__clashViewer.yview)
+        self.__clashViewer.configure(yscrollcommand=self.__clashScrollBar.set)
+        self.__previousClashButton = ttk.Button(self.__clashWindow, text="Previous", bootstyle="secondary-outline", command=lambda:[self.__displayClashes(self.__clashStart - self.pageSize)])
+        self.__nextClashButton = ttk.Button(self.__clashWindow, text="Next", bootstyle="secondary-outline", command=lambda:[self.__displayClashes(self.__clashStart + self.pageSize)])
+        self.__clashPageLabel = ttk.Label(self.__clashWindow, text="")
+        self.__exportClashesButton = ttk.Button(self.__clashWindow, text="Export Excel", bootstyle="primary", command=lambda:[self.__exportClashes()])
+
+        self.__clashViewer.grid(row=0, column=0, sticky="nswe", padx=(10,21), pady=10)
+        self.__clashScrollBar.grid(row=0, column=0, sticky="ens", padx=(0,10), pady=10)
+        self.__previousClashButton.grid(row=1, column=0, sticky="w", padx=(10,0), pady=(0,10))
+        self.__clashPageLabel.grid(row=1, column=0, sticky="w", padx=(100,0), pady=(0,10))
+        self.__nextClashButton.grid(row=1, column=0, sticky="e", padx=(0,21), pady=(0,10))
+        self.__exportClashesButton.grid(row=1, column=0, pady=(0,10))
+        self.__displayClashes(0)
+
+    def __displayClashes(self, clashStart:int):
+        # One page of the clashes. Only the schedules of the page are read
+        for i in self.__clashViewer.get_children():
+            self.__clashViewer.delete(i)
+        names = {"location": "Location", "lecturer": "Lecturer", "cohort": "Cohort"}
+        schedules = self.__displayHandler.getSchedules()
+        self.__clashStart = max(0, min(clashStart, (len(self.__clashes) - 1) // self.pageSize * self.pageSize))
+        page = self.__clashes[self.__clashStart:self.__clashStart + self.pageSize]
+        self.__previousClashButton.configure(state="normal" if self.__clashStart > 0 else "disabled")
+        self.__nextClashButton.configure(state="normal" if self.__clashStart + self.pageSize < len(self.__clashes) else "disabled")
+        self.__clashPageLabel.configure(text=f"{self.__clashStart + 1} - {self.__clashStart + len(page)} of {len(self.__clashes)} clashes")
+
+        for index, (category, rowId, otherRowId) in enumerate(page, self.__clashStart):
+            schedule, otherSchedule = schedules.getSchedule(rowId), schedules.getSchedule(otherRowId)
+            li = [index+1, names[category], schedule.get(category), schedule.get("activityDate"),
+                  schedule.get("module") + " " + schedule.get("moduleCode"), schedule.get("session"),
+                  str(schedule.get("startTime"))[:-3] + " ~ " + str(schedule.get("endTime"))[:-3],
+                  otherSchedule.get("module") + " " + otherSchedule.get("moduleCode"), otherSchedule.get("session"),
+                  str(otherSchedule.get("startTime"))[:-3] + " ~ " + str(otherSchedule.get("endTime"))[:-3]]
+            self.__clashViewer.insert("", tk.END, value=li)
+
+    def __exportClashes(self):
+        try:
+            path = fd.askdirectory(parent=self.__clashWindow)
+            if path != "":
+                self.__exportHandler.exportClashes(self.__displayHandler.getSchedules(), self.__clashes, path)
+                mb.show_info("Export successfully done.", "Export Success")
+        except:
+            mb.show_error("Export failed!\nPlease try again.", "Export Failure")
+
+    def __showHeatmap(self):
+        # Percent of the time each room or zone of the result is booked, by weekday and hour
+        if self.__displayHandler.getResultCount() == 0:
+            mb.show_error("No schedules to show.\nPlease try again", "No schedule warning")
+            return
+        self.__occupancyCube = self.__displayHandler.getOccupancyCube()
+        self.__heatmapCategory = "location"
+        self.__heatmapDay = 0
+
+        self.__heatmapWindow = ttk.Toplevel(self)
+        self.__heatmapWindow.title("Room Heatmap")
+        self.__heatmapWindow.geometry("1000x600+200+200")
+        self.__heatmapWindow.transient(self)
+        self.__heatmapWindow.columnconfigure(0, weight=1)
+        self.__heatmapWindow.rowconfigure(1, weight=1)
+
+        self.__heatmapCategoryMenu = ttk.Menubutton(self.__heatmapWindow, style="primary.Outline.TMenubutton", text="Rooms")
+        categoryOptions = ttk.Menu(self.__heatmapCategoryMenu)
+        categoryOptions.add_command(label="Rooms", command=lambda:[self.__displayHeatmap("location", self.__heatmapDay)])
+        categoryOptions.add_command(label="Zones", command=lambda:[self.__displayHeatmap("zone", self.__heatmapDay)])
+        self.__heatmapCategoryMenu['menu'] = categoryOptions
+        self.__heatmapDayMenu = ttk.Menubutton(self.__heatmapWindow, style="primary.Outline.TMenubutton", text="Mon")
+        dayOptions = ttk.Menu(self.__heatmapDayMenu)
+        for day, weekday in enumerate(self.__occupancyCube.weekdays):
+            dayOptions.add_command(label=weekday, command=lambda day=day:[self.__displayHeatmap(self.__heatmapCategory, day)])
+        self.__heatmapDayMenu['menu'] = dayOptions
+        self.__exportHeatmapButton = ttk.Button(self.__heatmapWindow, text="Export Excel", bootstyle="primary", command=lambda:[self.__exportHeatmap()])
+        self.__heatmapCanvas = tk.Canvas(self.__heatmapWindow, background="white")
+        self.__heatmapScrollVerBar = ttk.Scrollbar(self.__heatmapWindow, orient="vertical", command=self.__heatmapCanvas.yview)
+        self.__heatmapScrollHorBar = ttk.Scrollbar(self.__heatmapWindow, orient="horizontal", command=self.__heatmapCanvas.xview)
+        self.__heatmapCanvas.configure(yscrollcommand=self.__heatmapScrollVerBar.set, xscrollcommand=self.__heatmapScrollHorBar.set)
+
+        self.__heatmapCategoryMenu.grid(row=0, column=0, sticky="w", padx=(10,0), pady=10)
+        self.__heatmapDayMenu.grid(row=0, column=0, sticky="w", padx=(110,0), pady=10)
+        self.__exportHeatmapButton.grid(row=0, column=0, sticky="e", padx=(0,21), pady=10)
+        self.__heatmapCanvas.grid(row=1, column=0, sticky="nswe", padx=(10,21), pady=(0,21))
+        self.__heatmapScrollVerBar.grid(row=1, column=0, sticky="ens", padx=(0,10), pady=(0,21))
+        self.__heatmapScrollHorBar.grid(row=1, column=0, sticky="wes", padx=(10,10), pady=(0,10))
+        self.__displayHeatmap("location", 0)
+
+    def __displayHeatmap(self, category:str, day:int):
+        # One row of cells for each room or zone, from white when free to red when always booked
+        self.__heatmapCategory, self.__heatmapDay = category, day
+        self.__heatmapCategoryMenu.configure(text="Zones" if category == "zone" else "Rooms")
+        self.__heatmapDayMenu.configure(text=self.__occupancyCube.weekdays[day])
+        self.__heatmapCanvas.delete("all")
+        names, percentages = self.__occupancyCube.getPercentages(category)
+        slots = self.__occupancyCube.getSlots()
+        bookedSlots = self.__occupancyCube.getBookedSlots()
+        nameWidth, cellWidth, cellHeight = 120, 50, 22
+
+        for col, slot in enumerate(bookedSlots):
+            self.__heatmapCanvas.create_text(nameWidth + col * cellWidth + cellWidth // 2, cellHeight // 2, text=slots[slot].strftime("%H:%M"), font=("Arial",9,"bold"))
+        for row, name in enumerate(names, 1):
+            self.__heatmapCanvas.create_text(5, row * cellHeight + cellHeight // 2, text=name, anchor="w", font=("Arial",9))
+            for col, slot in enumerate(bookedSlots):
+                percent = float(percentages[row - 1, day, slot])
+                shade = int(255 - 155 * percent / 100)
+                x, y = nameWidth + col * cellWidth, row * cellHeight
+                self.__heatmapCanvas.create_rectangle(x, y, x + cellWidth, y + cellHeight, fill=f"#ff{shade:02x}{shade:02x}", outline="#d0d0d0")
+                self.__heatmapCanvas.create_text(x + cellWidth // 2, y + cellHeight // 2, text=f"{percent:.0f}%", font=("Arial",8))
+        self.__heatmapCanvas.configure(scrollregion=(0, 0, nameWidth + len(bookedSlots) * cellWidth, (len(names) + 1) * cellHeight))
+
+    def __exportHeatmap(self):
+        try:
+            path = fd.askdirectory(parent=self.__heatmapWindow)
+            if path != "":
+                self.__exportHandler.exportOccupancy(self.__occupancyCube, self.__heatmapCategory, path)
+                mb.show_info("Export successfully done.", "Export Success")
+        except:
+            mb.show_error("Export failed!\nPlease try again.", "Export Failure")
+
+    def __showReport(self):
+        # Sessions, hours and sizes of the result for each value of one or two categories, such as the hours of each lecturer
+        if self.__displayHandler.getResultCount() == 0:
+            mb.show_error("No schedules to report.\nPlease try again", "No schedule warning")
+            return
+        names = ["Module","Module Code","Cohort","Course","Full/Part","Session","Date","Day","Start Time","End Time","Duration","Location","Size","Lecturer","Zone"]
+
+        self.__reportWindow = ttk.Toplevel(self)
+        self.__reportWindow.title("Workload Report")
+        self.__reportWindow.geometry("1100x500+150+250")
+        self.__reportWindow.transient(self)
+        self.__reportWindow.columnconfigure(0, weight=1)
+        self.__reportWindow.rowconfigure(1, weight=1)
+
+        self.__groupByMenu = ttk.Menubutton(self.__reportWindow, style="primary.Outline.TMenubutton", text="Group by: Lecturer")
+        groupByOptions = ttk.Menu(self.__groupByMenu)
+        for name in names:
+            groupByOptions.add_command(label=name, command=lambda name=name:[self.__displayReport(name, self.__reportThenBy)])
+        self.__groupByMenu['menu'] = groupByOptions
+        self.__reportThenByMenu = ttk.Menubutton(self.__reportWindow, style="primary.Outline.TMenubutton", text="Then by: None")
+        thenByOptions = ttk.Menu(self.__reportThenByMenu)
+        thenByOptions.add_command(label="None", command=lambda:[self.__displayReport(self.__reportGroupBy, None)])
+        for name in names:
+            thenByOptions.add_command(label=name, command=lambda name=name:[self.__displayReport(self.__reportGroupBy, name)])
+        self.__reportThenByMenu['menu'] = thenByOptions
+        self.__exportReportButton = ttk.Button(self.__reportWindow, text="Export Excel", bootstyle="primary", command=lambda:[self.__exportReport()])
+
+        column = ["key", "thenBy", "count", "hours", "weeklyHours", "size", "firstDate", "lastDate"]
+        self.__reportViewer = ttk.Treeview(self.__reportWindow, columns=column, show="headings", bootstyle="success")
+        for col in column:
+            self.__reportViewer.column(col, anchor="w", minwidth=50, width=250 if col in ("key", "thenBy") else 100)
+        self.__reportScrollBar = ttk.Scrollbar(self.__reportWindow, orient="vertical", command=self.__reportViewer.yview)
+        self.__reportViewer.configure(yscrollcommand=self.__reportScrollBar.set)
+
+        self.__groupByMenu.grid(row=0, column=0, sticky="w", padx=(10,0), pady=10)
+        self.__reportThenByMenu.grid(row=0, column=0, sticky="w", padx=(220,0), pady=10)
+        self.__exportReportButton.grid(row=0, column=0, sticky="e", padx=(0,21), pady=10)
+        self.__reportViewer.grid(row=1, column=0, sticky="nswe", padx=(10,21), pady=(0,10))
+        self.__reportScrollBar.grid(row=1, column=0, sticky="ens", padx=(0,10), pady=(0,10))
+        self.__displayReport("Lecturer", None)
+
+    def __displayReport(self, groupBy:str, thenBy):
+        self.__reportGroupBy, self.__reportThenBy = groupBy, thenBy
+        self.__groupByMenu.configure(text=f"Group by: {groupBy}")
+        self.__reportThenByMenu.configure(text=f"Then by: {thenBy or 'None'}")
+        self.__reportCategories = [self.__toCategory(name) for name in dict.fromkeys([groupBy, thenBy or groupBy])]
+        self.__reportGroups = self.__displayHandler.aggregate(self.__reportCategories)
+
+        headings = [groupBy, thenBy if len(self.__reportCategories) > 1 else "", "Sessions", "Hours", "Hours per Week", "Total Size", "First Date", "Last Date"]
+        for col, heading in zip(self.__reportViewer["columns"], headings):
+            self.__reportViewer.heading(col, text=heading, anchor="w")
+        for i in self.__reportViewer.get_children():
+            self.__reportViewer.delete(i)
+        day = ["", "Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
+        for values, count, minutes, size, firstDate, lastDate in self.__reportGroups:
+            values = [day[value] if category == "scheduledDay" else value for category, value in zip(self.__reportCategories, values)]
+            li = [values[0], values[1] if len(values) > 1 else "", count, f"{minutes / 60:.1f}", f"{weeklyHours(minutes, firstDate, lastDate):.1f}",
+                  size, firstDate.strftime("%d-%m-%Y"), lastDate.strftime("%d-%m-%Y")]
+            self.__reportViewer.insert("", tk.END, value=li)
+
+    def __exportReport(self):
+        try:
+            path = fd.askdirectory(parent=self.__reportWindow)
+            if path != "":
+                self.__exportHandler.exportReport(self.__reportCategories, self.__reportGroups, path)
+                mb.show_info("Export successfully done.", "Export Success")
+        except:
+            mb.show_error("Export failed!\nPlease try again.", "Export Failure")
+
+    def __showFreeSlots(self):
+        # Times when every chosen cohort and lecturer is free, between the start and end date of the range panel
+        # and within its start and end time of each day
+        self.__participants = [] # (category, value) of each chosen cohort and lecturer
+        self.__freeSlotWindow = ttk.Toplevel(self)
+        self.__freeSlotWindow.title("Common Free Time")
+        self.__freeSlotWindow.geometry("900x500+250+250")
+        self.__freeSlotWindow.transient(self)
+        self.__freeSlotWindow.columnconfigure(1, weight=1)
+        self.__freeSlotWindow.rowconfigure(2, weight=1)
+
+        self.__participantCategory = ttk.Combobox(self.__freeSlotWindow, values=["Cohort", "Lecturer"], state="readonly", width=10)
+        self.__participantCategory.set("Cohort")
+        self.__participantCategory.bind("<<ComboboxSelected>>", lambda event:[self.__setParticipantValues()])
+        self.__participantValue = ttk.Combobox(self.__freeSlotWindow, width=25)
+        self.__addParticipantButton = ttk.Button(self.__freeSlotWindow, text="Add", bootstyle="primary-outline", command=lambda:[self.__addParticipant()])
+        self.__removeParticipantButton = ttk.Button(self.__freeSlotWindow, text="Remove", bootstyle="danger-outline", command=lambda:[self.__removeParticipant()])
+        self.__participantList = tk.Listbox(self.__freeSlotWindow, width=40)
+        self.__minLengthLabel = ttk.Label(self.__freeSlotWindow, text="Minimum minutes")
+        self.__minLengthEntry = ttk.Entry(self.__freeSlotWindow, width=8)
+        self.__minLengthEntry.insert(0, "60")
+        self.__findSlotsButton = ttk.Button(self.__freeSlotWindow, text="Find", bootstyle="primary", command=lambda:[self.__displayFreeSlots()])
+        self.__freeSlotLabel = ttk.Label(self.__freeSlotWindow, text="")
+        column = ["date", "day", "freeFrom", "freeUntil", "length"]
+        headings = ["Date", "Day", "Free From", "Free Until", "Length"]
+        self.__freeSlotViewer = ttk.Treeview(self.__freeSlotWindow, columns=column, show="headings", bootstyle="info")
+        for col, heading in zip(column, headings):
+            self.__freeSlotViewer.heading(col, text=heading, anchor="w")
+            self.__freeSlotViewer.column(col, anchor="w", minwidth=50, width=90)
+        self.__freeSlotScrollBar = ttk.Scrollbar(self.__freeSlotWindow, orient="vertical", command=self.__freeSlotViewer.yview)
+        self.__freeSlotViewer.configure(yscrollcommand=self.__freeSlotScrollBar.set)
+
+        self.__participantCategory.grid(row=0, column=0, sticky="w", padx=(10,0), pady=10)
+        self.__participantValue.grid(row=0, column=0, sticky="w", padx=(120,0), pady=10)
+        self.__addParticipantButton.grid(row=0, column=0, sticky="w", padx=(330,10), pady=10)
+        self.__minLengthLabel.grid(row=0, column=1, sticky="w", padx=(10,0), pady=10)
+        self.__minLengthEntry.grid(row=0, column=1, sticky="w", padx=(130,0), pady=10)
+        self.__findSlotsButton.grid(row=0, column=1, sticky="w", padx=(220,0), pady=10)
+        self.__freeSlotLabel.grid(row=1, column=1, sticky="w", padx=(10,0))
+        self.__participantList.grid(row=1, column=0, rowspan=2, sticky="nswe", padx=(10,10))
+        self.__removeParticipantButton.grid(row=3, column=0, sticky="w", padx=(10,0), pady=10)
+        self.__freeSlotViewer.grid(row=2, column=1, sticky="nswe", padx=(10,21), pady=(0,10))
+        self.__freeSlotScrollBar.grid(row=2, column=1, sticky="ens", padx=(0,10), pady=(0,10))
+        self.__setParticipantValues()
+
+    def __setParticipantValues(self):
+        # Every loaded value of the category is offered, whatever the filters
+        category = self.__toCategory(self.__participantCategory.get())
+        self.__participantValue.configure(values=sorted(self.__displayHandler.getOptionCounts(category, "or")))
+        self.__participantValue.set("")
+
+    def __addParticipant(self):
+        participant = (self.__toCategory(self.__participantCategory.get()), self.__participantValue.get())
+        if participant[1] != "" and participant not in self.__participants:
+            self.__participants.append(participant)
+            self.__participantList.insert(tk.END, f"{self.__participantCategory.get()}: {participant[1]}")
+
+    def __removeParticipant(self):
+        for index in reversed(self.__participantList.curselection()):
+            self.__participantList.delete(index)
+            del self.__participants[index]
+
+    def __displayFreeSlots(self):
+        if len(self.__participants) == 0:
+            mb.show_warning("Add a cohort or lecturer first.", "No participant", parent=self.__freeSlotWindow)
+            return
+        try:
+            startDate = datetime.datetime.strptime(self.__startDate.entry.get(), "%d-%m-%Y").date()
+            endDate = datetime.datetime.strptime(self.__endDate.entry.get(), "%d-%m-%Y").date()
+            openTime = datetime.datetime.strptime(self.__startTimeEntry.get(), "%H:%M").time()
+            closeTime = datetime.datetime.strptime(self.__endTimeEntry.get(), "%H:%M").time()
+            minMinutes = int(self.__minLengthEntry.get())
+            if startDate > endDate or openTime >= closeTime:
+                mb.show_warning("Start cannot exceed end.", "Wrong date input", parent=self.__freeSlotWindow)
+                return
+        except:
+            mb.show_error("You entered wrong value\nPlease try again", "Wrong input error", parent=self.__freeSlotWindow)
+            return
+
+        for i in self.__freeSlotViewer.get_children():
+            self.__freeSlotViewer.delete(i)
+        slots = self.__displayHandler.findFreeSlots(self.__participants, startDate, endDate, openTime, closeTime, minMinutes)
+        self.__freeSlotLabel.configure(text=f"{len(slots)} free times from {startDate.strftime('%d-%m-%Y')} to {endDate.strftime('%d-%m-%Y')}")
+        for date, freeFrom, freeUntil in slots:
+            minutes = (freeUntil.hour * 60 + freeUntil.minute) - (freeFrom.hour * 60 + freeFrom.minute)
+            li = [date.strftime("%d-%m-%Y"), date.strftime("%A"), freeFrom.strftime("%H:%M"), freeUntil.strftime("%H:%M"), f"{minutes // 60}:{minutes % 60:02d}"]
+            self.__freeSlotViewer.insert("", tk.END, value=li)
+
+    def __showFreeRooms(self):
+        # Rooms with nothing booked from the start to the end time on the start date, best fit first
+        self.__freeRoomWindow = ttk.Toplevel(self)
+        self.__freeRoomWindow.title("Free Rooms")
+        self.__freeRoomWindow.geometry("800x450+300+275")
+        self.__freeRoomWindow.transient(self)
+        self.__freeRoomWindow.columnconfigure(0, weight=1)
+        self.__freeRoomWindow.rowconfigure(1, weight=1)
+
+        self.__minSizeLabel = ttk.Label(self.__freeRoomWindow, text="Minimum size")
+        self.__minSizeEntry = ttk.Entry(self.__freeRoomWindow, width=8)
+        self.__findRoomsButton = ttk.Button(self.__freeRoomWindow, text="Find", bootstyle="primary", command=lambda:[self.__displayFreeRooms()])
+        self.__freeRoomLabel = ttk.Label(self.__freeRoomWindow, text="")
+        column = ["location", "zone", "size", "freeFrom", "freeUntil"]
+        headings = ["Location", "Zone", "Largest Class", "Free From", "Free Until"]
+        self.__freeRoomViewer = ttk.Treeview(self.__freeRoomWindow, columns=column, show="headings", bootstyle="info")
+        for col, heading in zip(column, headings):
+            self.__freeRoomViewer.heading(col, text=heading, anchor="w")
+            self.__freeRoomViewer.column(col, anchor="w", minwidth=50, width=140)
+        self.__freeRoomScrollBar = ttk.Scrollbar(self.__freeRoomWindow, orient="vertical", command=self.__freeRoomViewer.yview)
+        self.__freeRoomViewer.configure(yscrollcommand=self.__freeRoomScrollBar.set)
+
+        self.__minSizeLabel.grid(row=0, column=0, sticky="w", padx=(10,0), pady=10)
+        self.__minSizeEntry.grid(row=0, column=0, sticky="w", padx=(110,0), pady=10)
+        self.__findRoomsButton.grid(row=0, column=0, sticky="w", padx=(200,0), pady=10)
+        self.__freeRoomLabel.grid(row=0, column=0, sticky="w", padx=(270,0), pady=10)
+        self.__freeRoomViewer.grid(row=1, column=0, sticky="nswe", padx=(10,21), pady=(0,10))
+        self.__freeRoomScrollBar.grid(row=1, column=0, sticky="ens", padx=(0,10), pady=(0,10))
+        self.__displayFreeRooms()
+
+    def __displayFreeRooms(self):
+        try:
+            date = datetime.datetime.strptime(self.__startDate.entry.get(), "%d-%m-%Y").date()
+            startTime = datetime.datetime.strptime(self.__startTimeEntry.get(), "%H:%M").time()
+            endTime = datetime.datetime.strptime(self.__endTimeEntry.get(), "%H:%M").time()
+            minSize = int(self.__minSizeEntry.get()) if self.__minSizeEntry.get().strip() != "" else None
+            if startTime >= endTime:
+                mb.show_warning("Start time must be before end time.", "Wrong time input", parent=self.__freeRoomWindow)
+                return
+        except:
+            mb.show_error("You entered wrong value\nPlease try again", "Wrong input error", parent=self.__freeRoomWindow)
+            return
+
+        for i in self.__freeRoomViewer.get_children():
+            self.__freeRoomViewer.delete(i)
+        rooms = self.__displayHandler.findFreeRooms(date, startTime, endTime, minSize)
+        self.__freeRoomLabel.configure(text=f"{len(rooms)} rooms free on {date.strftime('%d-%m-%Y')} from {startTime.strftime('%H:%M')} to {endTime.strftime('%H:%M')}")
+        for location, zone, size, freeFrom, freeUntil in rooms:
+            li = [location, zone, size, "Start of day" if freeFrom is None else freeFrom.strftime("%H:%M"),
+                  "End of day" if freeUntil is None else freeUntil.strftime("%H:%M")]
+            self.__freeRoomViewer.insert("", tk.END, value=li)
+
     def __insertionSort(self,array) -> list:
         newList = []
         for i in array: newList.append(i)